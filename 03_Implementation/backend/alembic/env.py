@@ -0,0 +1,52 @@
+"""Alembic environment.
+
+接続先は `DATABASE_URL`（app.config）を使う。`app.bootstrap` から呼ぶ場合は
+`config.attributes["connection"]` に渡された接続をそのまま使う。
+SQLite でも列の削除・変更ができるよう batch モードで生成する。
+"""
+
+from __future__ import annotations
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401 - メタデータへテーブルを登録する
+from app.config import get_settings
+from app.db.base import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(get_settings().database_url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    engine = create_engine(str(get_settings().database_url), poolclass=NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
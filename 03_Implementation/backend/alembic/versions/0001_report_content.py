@@ -0,0 +1,137 @@
+"""Move report JSON into report_content (one row per content hash).
+
+既存の `report_meta.report_structured_json` を内容ハッシュ（`json_digest`）ごとに
+`report_content` へ移し、`content_digest` で参照させてから元の列を削除する。
+PDF 取込の状態列（`staging_json` / `ingest_status` / `ingest_error`）もここで追加する。
+セクションストア・ベクトル索引のファイルは次回の取込時、または検索時にワーカーで作り直される。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.utils.hashing import json_digest
+from app.utils.rag import build_section_index
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+report_meta = sa.table(
+    "report_meta",
+    sa.column("report_meta_id", sa.String),
+    sa.column("report_structured_json", sa.JSON),
+    sa.column("content_digest", sa.String),
+)
+report_content = sa.table(
+    "report_content",
+    sa.column("content_digest", sa.String),
+    sa.column("report_structured_json", sa.JSON),
+    sa.column("section_index", sa.JSON),
+    sa.column("section_count", sa.Integer),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_content",
+        sa.Column("content_digest", sa.String(64), primary_key=True),
+        sa.Column("source_digest", sa.String(64), nullable=True),
+        sa.Column("report_structured_json", sa.JSON, nullable=False),
+        sa.Column("section_index", sa.JSON, nullable=True),
+        sa.Column("section_count", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_report_content_source_digest", "report_content", ["source_digest"])
+    with op.batch_alter_table("report_meta") as batch:
+        batch.add_column(sa.Column("content_digest", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("staging_json", sa.JSON, nullable=True))
+        batch.add_column(
+            sa.Column("ingest_status", sa.String(20), nullable=False, server_default="ready")
+        )
+        batch.add_column(sa.Column("ingest_error", sa.Text, nullable=True))
+        batch.create_index("ix_report_meta_content_digest", ["content_digest"])
+        batch.create_foreign_key(
+            "fk_report_meta_content_digest_report_content",
+            "report_content",
+            ["content_digest"],
+            ["content_digest"],
+        )
+
+    _move_content(op.get_bind())
+
+    with op.batch_alter_table("report_meta") as batch:
+        batch.drop_column("report_structured_json")
+
+
+def _move_content(conn: sa.Connection) -> None:
+    """Hash each report's JSON into report_content; 同一内容は 1 行にまとめる。"""
+    ids = conn.execute(sa.select(report_meta.c.report_meta_id)).scalars().all()
+    stored: set[str] = set()
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = conn.execute(
+            sa.select(report_meta.c.report_meta_id, report_meta.c.report_structured_json).where(
+                report_meta.c.report_meta_id.in_(ids[start : start + BATCH_SIZE])
+            )
+        ).all()
+        for report_meta_id, structured in rows:
+            structured = structured or {"sections": []}
+            digest = json_digest(structured)
+            if digest not in stored:
+                conn.execute(
+                    report_content.insert().values(
+                        content_digest=digest,
+                        report_structured_json=structured,
+                        section_index=build_section_index(structured),
+                        section_count=len(structured.get("sections", [])),
+                        created_at=datetime.utcnow(),
+                    )
+                )
+                stored.add(digest)
+            conn.execute(
+                report_meta.update()
+                .where(report_meta.c.report_meta_id == report_meta_id)
+                .values(content_digest=digest)
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("report_meta") as batch:
+        batch.add_column(sa.Column("report_structured_json", sa.JSON, nullable=True))
+
+    conn = op.get_bind()
+    conn.execute(
+        report_meta.update().values(
+            report_structured_json=sa.select(report_content.c.report_structured_json)
+            .where(report_content.c.content_digest == report_meta.c.content_digest)
+            .scalar_subquery()
+        )
+    )
+    # 解析中・失敗の PDF は内容がないため空のセクションとする
+    conn.execute(
+        report_meta.update()
+        .where(report_meta.c.report_structured_json.is_(None))
+        .values(report_structured_json={"sections": []})
+    )
+
+    with op.batch_alter_table("report_meta") as batch:
+        batch.alter_column("report_structured_json", existing_type=sa.JSON, nullable=False)
+        batch.drop_constraint("fk_report_meta_content_digest_report_content", type_="foreignkey")
+        batch.drop_index("ix_report_meta_content_digest")
+        batch.drop_column("ingest_error")
+        batch.drop_column("ingest_status")
+        batch.drop_column("staging_json")
+        batch.drop_column("content_digest")
+    op.drop_index("ix_report_content_source_digest", table_name="report_content")
+    op.drop_table("report_content")
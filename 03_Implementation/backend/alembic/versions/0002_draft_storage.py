@@ -0,0 +1,184 @@
+"""Store AI drafts as a prompt reference plus body, with deltas between versions.
+
+既存の `ai_response.ai_answer_draft` を「ベースプロンプト」と「顧客向け回答案」見出し以降の
+本文に分け、プロンプトは `prompt_version` に内容ハッシュで 1 行だけ、本文は `draft_body`
+（キーフレーム）へ移してから元の列を削除する。見出しのない下書きは全文を本文とする。
+判定用の列（`edit_distance` / `danger_hit_count` / `operator_confidence`）と一覧用の
+インデックスもここで追加する。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.utils.hashing import text_digest
+from app.utils.text_delta import apply_delta
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+# 移行時点の下書き形式: f"{prompt}\n\n{DRAFT_HEADING}\n{body}"
+DRAFT_SEPARATOR = "\n\n# 顧客向け回答案\n"
+
+ai_response = sa.table(
+    "ai_response",
+    sa.column("ai_response_id", sa.String),
+    sa.column("inquiry_id", sa.String),
+    sa.column("ai_answer_draft", sa.Text),
+    sa.column("prompt_digest", sa.String),
+    sa.column("draft_body", sa.Text),
+    sa.column("draft_delta", sa.LargeBinary),
+    sa.column("delta_base_id", sa.String),
+)
+prompt_version = sa.table(
+    "prompt_version",
+    sa.column("prompt_digest", sa.String),
+    sa.column("prompt_text", sa.Text),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prompt_version",
+        sa.Column("prompt_digest", sa.String(64), primary_key=True),
+        sa.Column("prompt_text", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    with op.batch_alter_table("ai_response") as batch:
+        batch.add_column(sa.Column("prompt_digest", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("draft_body", sa.Text, nullable=True))
+        batch.add_column(sa.Column("draft_delta", sa.LargeBinary, nullable=True))
+        batch.add_column(sa.Column("delta_base_id", sa.String(36), nullable=True))
+        batch.add_column(sa.Column("edit_distance", sa.Float, nullable=True))
+        batch.add_column(sa.Column("danger_hit_count", sa.Integer, nullable=True))
+        batch.add_column(sa.Column("operator_confidence", sa.Float, nullable=True))
+        batch.create_foreign_key(
+            "fk_ai_response_prompt_digest_prompt_version",
+            "prompt_version",
+            ["prompt_digest"],
+            ["prompt_digest"],
+        )
+        batch.create_foreign_key(
+            "fk_ai_response_delta_base_id_ai_response",
+            "ai_response",
+            ["delta_base_id"],
+            ["ai_response_id"],
+        )
+        batch.create_index("ix_ai_response_created_at_id", ["created_at", "ai_response_id"])
+        batch.create_index(
+            "ix_ai_response_inquiry_created_at", ["inquiry_id", "created_at", "ai_response_id"]
+        )
+
+    _split_drafts(op.get_bind())
+
+    with op.batch_alter_table("ai_response") as batch:
+        batch.drop_column("ai_answer_draft")
+
+
+def _split_drafts(conn: sa.Connection) -> None:
+    """Move each draft into prompt_version + draft_body; 既存行はすべてキーフレームになる。"""
+    ids = conn.execute(sa.select(ai_response.c.ai_response_id)).scalars().all()
+    prompts: set[str] = set()
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = conn.execute(
+            sa.select(ai_response.c.ai_response_id, ai_response.c.ai_answer_draft).where(
+                ai_response.c.ai_response_id.in_(ids[start : start + BATCH_SIZE])
+            )
+        ).all()
+        for ai_response_id, draft in rows:
+            prompt_text, separator, body = (draft or "").partition(DRAFT_SEPARATOR)
+            digest = None
+            if separator:
+                digest = text_digest(prompt_text)
+                if digest not in prompts:
+                    conn.execute(
+                        prompt_version.insert().values(
+                            prompt_digest=digest,
+                            prompt_text=prompt_text,
+                            created_at=datetime.utcnow(),
+                        )
+                    )
+                    prompts.add(digest)
+            else:
+                body = draft or ""
+            conn.execute(
+                ai_response.update()
+                .where(ai_response.c.ai_response_id == ai_response_id)
+                .values(prompt_digest=digest, draft_body=body)
+            )
+
+
+def _rebuild_drafts(conn: sa.Connection) -> None:
+    """Rebuild full drafts (prompt + body, deltas applied) inquiry by inquiry."""
+    prompts = {
+        digest: text
+        for digest, text in conn.execute(
+            sa.select(prompt_version.c.prompt_digest, prompt_version.c.prompt_text)
+        ).all()
+    }
+    inquiry_ids = conn.execute(sa.select(ai_response.c.inquiry_id).distinct()).scalars().all()
+    for inquiry_id in inquiry_ids:
+        rows = {
+            row.ai_response_id: row
+            for row in conn.execute(
+                sa.select(ai_response).where(ai_response.c.inquiry_id == inquiry_id)
+            )
+        }
+        bodies: dict[str, str] = {}
+        dependents: dict[str, list[str]] = defaultdict(list)
+        pending = []
+        for row in rows.values():
+            if row.draft_delta is None:
+                bodies[row.ai_response_id] = row.draft_body or ""
+                pending.append(row.ai_response_id)
+            else:
+                dependents[row.delta_base_id].append(row.ai_response_id)
+        # キーフレームから差分の連鎖を順にたどる
+        while pending:
+            base_id = pending.pop()
+            for ai_response_id in dependents.pop(base_id, []):
+                delta = rows[ai_response_id].draft_delta
+                bodies[ai_response_id] = apply_delta(bodies[base_id], delta)
+                pending.append(ai_response_id)
+        for ai_response_id, body in bodies.items():
+            digest = rows[ai_response_id].prompt_digest
+            draft = body if digest is None else f"{prompts[digest]}{DRAFT_SEPARATOR}{body}"
+            conn.execute(
+                ai_response.update()
+                .where(ai_response.c.ai_response_id == ai_response_id)
+                .values(ai_answer_draft=draft)
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ai_response") as batch:
+        batch.add_column(sa.Column("ai_answer_draft", sa.Text, nullable=True))
+
+    _rebuild_drafts(op.get_bind())
+
+    with op.batch_alter_table("ai_response") as batch:
+        batch.alter_column("ai_answer_draft", existing_type=sa.Text, nullable=False)
+        batch.drop_index("ix_ai_response_inquiry_created_at")
+        batch.drop_index("ix_ai_response_created_at_id")
+        batch.drop_constraint("fk_ai_response_delta_base_id_ai_response", type_="foreignkey")
+        batch.drop_constraint("fk_ai_response_prompt_digest_prompt_version", type_="foreignkey")
+        batch.drop_column("operator_confidence")
+        batch.drop_column("danger_hit_count")
+        batch.drop_column("edit_distance")
+        batch.drop_column("delta_base_id")
+        batch.drop_column("draft_delta")
+        batch.drop_column("draft_body")
+        batch.drop_column("prompt_digest")
+    op.drop_table("prompt_version")
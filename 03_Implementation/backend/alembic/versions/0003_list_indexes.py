@@ -0,0 +1,37 @@
+"""Add the keyset pagination indexes for the inquiry and audit log lists.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_inquiry_created_at_id", "inquiry", ["created_at", "inquiry_id"])
+    op.create_index(
+        "ix_inquiry_category_created_at",
+        "inquiry",
+        ["inquiry_category", "created_at", "inquiry_id"],
+    )
+    op.create_index(
+        "ix_inquiry_customer_created_at", "inquiry", ["customer_id", "created_at", "inquiry_id"]
+    )
+    op.create_index(
+        "ix_final_response_log_sent_at_id", "final_response_log", ["sent_at", "audit_log_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_final_response_log_sent_at_id", table_name="final_response_log")
+    op.drop_index("ix_inquiry_customer_created_at", table_name="inquiry")
+    op.drop_index("ix_inquiry_category_created_at", table_name="inquiry")
+    op.drop_index("ix_inquiry_created_at_id", table_name="inquiry")
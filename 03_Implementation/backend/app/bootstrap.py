@@ -0,0 +1,95 @@
+"""Schema bootstrap command (デプロイ時に 1 回だけ実行する)。
+
+API / ワーカーはインポート時にスキーマを作成しない。新しい環境やテスト DB では先に::
+
+    python -m app.bootstrap
+
+を実行する。空の DB にはテーブル・インデックスを作成して Alembic の head を記録し、
+既存の DB には先に `alembic upgrade head` 相当のマイグレーションを適用する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, Engine, inspect
+from sqlalchemy.exc import OperationalError
+
+from . import models  # noqa: F401 - メタデータへテーブルを登録する
+from .db.base import Base
+from .db.session import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def wait_for_database(bind: Engine, timeout: float) -> None:
+    """Retry connecting until ``timeout`` seconds have passed (DB コンテナ起動待ち)。"""
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        try:
+            with bind.connect():
+                return
+        except OperationalError as exc:
+            if time.monotonic() + delay > deadline:
+                raise
+            logger.info("database not reachable yet (%s); retrying in %.1fs", exc, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+
+def create_schema(bind: Engine | None = None) -> list[str]:
+    """Create missing tables; returns the names that were created."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        existing = set(inspect(conn).get_table_names())
+        Base.metadata.create_all(bind=conn)
+    return [table.name for table in Base.metadata.sorted_tables if table.name not in existing]
+
+
+def alembic_config(connection: Connection | None = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    return config
+
+
+def migrate_schema(bind: Engine | None = None) -> list[str]:
+    """Upgrade an existing database to head, or create a new one and stamp it as head."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        existing = set(inspect(conn).get_table_names()) - {"alembic_version"}
+        if existing:
+            command.upgrade(alembic_config(conn), "head")
+    created = create_schema(bind)
+    if not existing:
+        with bind.begin() as conn:
+            command.stamp(alembic_config(conn), "head")
+    return created
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Create the database schema.")
+    parser.add_argument(
+        "--wait",
+        type=float,
+        default=60.0,
+        help="seconds to wait for the database to accept connections",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    wait_for_database(engine, args.wait)
+    created = migrate_schema(engine)
+    logger.info("schema ready (created: %s)", ", ".join(created) or "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,50 @@ class WorkerSettings(BaseModel):
     enabled: bool = True
     default_queue: str = "reporting_qa"
     pdf_queue: str = "reporting_qa_pdf"
+    # PDF 取込: 1 バッチのページ数（= DB への途中保存単位）と解析プロセス数
+    pdf_batch_pages: int = 20
+    pdf_process_workers: int = 2
+    # metrics_enabled 時、ワーカーのメトリクスを公開するポート（prefork は子プロセス番号を加算）
+    metrics_port: int | None = None
+    # ブローカー・ワーカーなしでタスクを呼び出し元で実行する（負荷試験・ローカル検証用）
+    eager: bool = False
+
+
+class DatabaseSettings(BaseModel):
+    async_enabled: bool = False
+    async_url: str | None = None
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = False
+    # PgBouncer (transaction pooling) 配下: アプリ側プールなし・prepared statement 無効
+    pgbouncer_mode: bool = False
+
+
+class DraftCacheSettings(BaseModel):
+    enabled: bool = True
+    redis_enabled: bool = True
+    ttl_seconds: int = 86400
+    local_max_entries: int = 1024
+
+
+class VectorSettings(BaseModel):
+    embedder: str = "hashing"  # hashing（オフライン・決定的） / openai
+    openai_model: str = "text-embedding-3-small"
+    dim: int = 256
+    batch_size: int = 256
+    # このセクション数以上の帳票は IVF で保存し、nprobe 個のクラスタのみ走査する
+    ivf_min_sections: int = 50000
+    nprobe: int = 8
+    # ハイブリッド検索でのベクトル類似度の重み（残りは BM25）
+    weight: float = 0.5
 
 
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", env_nested_delimiter="__", extra="ignore"
+    )
 
     app_name: str = "Reporting QA Agent"
     api_prefix: str = "/api"
@@ -24,12 +64,19 @@ class Settings(BaseSettings):
     redis_url: AnyUrl | str = "redis://redis:6379/0"
     vector_store_path: str = "/data/vectorstore"
     enable_vector_store: bool = True
+    section_store_path: str = "/data/sections"
 
+    db: DatabaseSettings = DatabaseSettings()
     ai_provider: AiProviderSettings = AiProviderSettings()
     worker: WorkerSettings = WorkerSettings()
+    draft_cache: DraftCacheSettings = DraftCacheSettings()
+    vector: VectorSettings = VectorSettings()
 
     danger_words_path: str = "prompts/danger_words.txt"
     base_prompt_path: str = "prompts/base_prompt.md"
+    resource_check_interval: float = 5.0
+    # /metrics とステージ計測（無効時の span はほぼ無コスト）
+    metrics_enabled: bool = False
 
 
 @lru_cache
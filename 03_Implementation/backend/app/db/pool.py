@@ -0,0 +1,72 @@
+"""Connection pool classes that record checkout wait time.
+
+チェックアウト待ち（プール枯渇時の待機＋新規接続の確立）を計測し、
+`/api/admin/db/pool` やメトリクスから参照できるようにする。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@dataclass
+class CheckoutStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * len(CHECKOUT_BUCKETS))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_buckets": dict(
+                    zip([str(bound) for bound in CHECKOUT_BUCKETS], self.bucket_counts, strict=True)
+                ),
+            }
+
+
+checkout_stats = CheckoutStats()
+
+
+class _CheckoutTimingMixin:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            checkout_stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        checkout_stats.observe(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
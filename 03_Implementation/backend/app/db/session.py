@@ -1,9 +1,114 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from ..config import get_settings
+from ..utils import metrics
+from .pool import (
+    CHECKOUT_BUCKETS,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    checkout_stats,
+)
 
 settings = get_settings()
 
-engine = create_engine(str(settings.database_url), pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+def _engine_options(url: str, *, is_async: bool = False) -> dict[str, Any]:
+    db = settings.db
+    if url.startswith("sqlite"):
+        return {}
+    if db.pgbouncer_mode:
+        # psycopg3: prepare_threshold=None で server-side prepared statement を使わない
+        return {"poolclass": NullPool, "connect_args": {"prepare_threshold": None}}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": db.pool_size,
+        "max_overflow": db.max_overflow,
+        "pool_timeout": db.pool_timeout,
+        "pool_recycle": db.pool_recycle,
+        "pool_pre_ping": db.pool_pre_ping,
+    }
+
+
+engine = create_engine(str(settings.database_url), **_engine_options(str(settings.database_url)))
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+metrics.instrument_engine(engine)
+
+
+def _async_database_url() -> str:
+    # psycopg (v3) は同期・非同期の両方に対応するため URL はそのまま使える
+    url = settings.db.async_url or str(settings.database_url)
+    if url.startswith("sqlite://"):
+        url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker | None = None
+if settings.db.async_enabled:
+    async_engine = create_async_engine(
+        _async_database_url(), **_engine_options(_async_database_url(), is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+    metrics.instrument_engine(async_engine.sync_engine)
+
+
+def dispose_engine() -> None:
+    """Drop pooled connections inherited from a parent process (Celery prefork の子で呼ぶ)。"""
+    engine.dispose(close=False)
+
+
+def pool_status() -> dict[str, Any]:
+    pool = engine.pool
+    status: dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if hasattr(pool, "checkedout"):
+        status.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    status.update(checkout_stats.snapshot())
+    return status
+
+
+def pool_metrics() -> Iterable[str]:
+    """Pool gauges and checkout-wait histogram for ``/metrics``."""
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        for name, value in (
+            ("size", pool.size()),
+            ("checked_out", pool.checkedout()),
+            ("overflow", pool.overflow()),
+        ):
+            yield f"# TYPE reporting_qa_db_pool_{name} gauge"
+            yield f"reporting_qa_db_pool_{name} {value}"
+    stats = checkout_stats.snapshot()
+    name = "reporting_qa_db_pool_checkout_wait_seconds"
+    yield f"# HELP {name} Time spent waiting for a pooled connection."
+    yield f"# TYPE {name} histogram"
+    cumulative = 0
+    for bound, count in zip(CHECKOUT_BUCKETS, stats["wait_seconds_buckets"].values(), strict=True):
+        cumulative += count
+        yield f'{name}_bucket{{le="{bound}"}} {cumulative}'
+    yield f'{name}_bucket{{le="+Inf"}} {stats["checkouts"]}'
+    yield f"{name}_sum {stats['wait_seconds_total']}"
+    yield f"{name}_count {stats['checkouts']}"
+    yield "# TYPE reporting_qa_db_pool_checkout_timeouts_total counter"
+    yield f"reporting_qa_db_pool_checkout_timeouts_total {stats['timeouts']}"
+
+
+metrics.register_collector(pool_metrics)
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Session for work that outlives the request dependency (streaming responses など)。"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
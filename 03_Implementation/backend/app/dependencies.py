@@ -1,9 +1,10 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .config import get_settings
-from .db.session import SessionLocal
+from .db.session import AsyncSessionLocal, SessionLocal
 
 
 settings = get_settings()
@@ -15,3 +16,10 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled (DB__ASYNC_ENABLED)")
+    async with AsyncSessionLocal() as db:
+        yield db
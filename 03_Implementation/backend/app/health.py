@@ -0,0 +1,80 @@
+"""Readiness checks for `/ready`（`/health` はプロセス生存のみを返す）。
+
+各チェックは短いタイムアウトで失敗を返し、プローブ自体が詰まらないようにする。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from sqlalchemy import inspect
+
+from . import models  # noqa: F401 - 期待するテーブル一覧をメタデータから得る
+from .config import get_settings
+from .db.base import Base
+from .db.session import engine
+
+_REDIS_TIMEOUT = 0.5
+_redis = None
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def check_database() -> dict[str, Any]:
+    """Ping the pool and confirm the schema has been bootstrapped."""
+    started = time.perf_counter()
+    pool = engine.pool
+    db = get_settings().db
+    # プールが枯渇している間は pool_timeout まで待たずに未準備とする
+    if hasattr(pool, "checkedout") and pool.checkedout() >= db.pool_size + db.max_overflow:
+        return {"ok": False, "error": "connection pool exhausted"}
+    try:
+        with engine.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+    except Exception as exc:
+        return {"ok": False, "error": str(exc).splitlines()[0], "ms": _elapsed_ms(started)}
+    missing = sorted(set(Base.metadata.tables) - tables)
+    if missing:
+        return {
+            "ok": False,
+            "error": "schema not bootstrapped (python -m app.bootstrap)",
+            "missing_tables": missing,
+            "ms": _elapsed_ms(started),
+        }
+    return {"ok": True, "ms": _elapsed_ms(started)}
+
+
+def _redis_required() -> bool:
+    settings = get_settings()
+    return settings.worker.enabled or (
+        settings.draft_cache.enabled and settings.draft_cache.redis_enabled
+    )
+
+
+def check_redis() -> dict[str, Any]:
+    global _redis
+    if not _redis_required():
+        return {"ok": True, "skipped": True}
+    started = time.perf_counter()
+    try:
+        if _redis is None:
+            import redis
+
+            _redis = redis.Redis.from_url(
+                str(get_settings().redis_url),
+                socket_timeout=_REDIS_TIMEOUT,
+                socket_connect_timeout=_REDIS_TIMEOUT,
+            )
+        _redis.ping()
+    except Exception as exc:
+        return {"ok": False, "error": str(exc), "ms": _elapsed_ms(started)}
+    return {"ok": True, "ms": _elapsed_ms(started)}
+
+
+def readiness() -> tuple[bool, dict[str, Any]]:
+    checks = {"database": check_database(), "redis": check_redis()}
+    ready = all(check["ok"] for check in checks.values())
+    return ready, {"status": "ready" if ready else "unavailable", "checks": checks}
@@ -1,14 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .config import get_settings
-from .db.base import Base
-from .db.session import engine
+from .health import readiness
 from .routers import api_router
+from .utils import metrics
 
 settings = get_settings()
 
-Base.metadata.create_all(bind=engine)
+# スキーマ作成は `python -m app.bootstrap` で行う。インポート時に DB へ接続しない
 
 app = FastAPI(title=settings.app_name)
 app.add_middleware(
@@ -17,7 +18,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 
 @app.get("/health")
@@ -25,4 +29,17 @@ def healthcheck():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readycheck():
+    ready, body = readiness()
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 app.include_router(api_router, prefix=settings.api_prefix)
@@ -2,11 +2,15 @@ from .ai_response import AiResponse
 from .escalation import Escalation
 from .final_response import FinalResponseLog
 from .inquiry import Inquiry
+from .prompt_version import PromptVersion
+from .report_content import ReportContent
 from .report_meta import ReportMeta
 
 __all__ = [
     "Inquiry",
     "ReportMeta",
+    "ReportContent",
+    "PromptVersion",
     "AiResponse",
     "Escalation",
     "FinalResponseLog",
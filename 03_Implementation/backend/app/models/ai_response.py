@@ -3,7 +3,18 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, Numeric, String, Text
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
@@ -11,16 +22,53 @@ from ..db.base import Base
 
 class AiResponse(Base):
     __tablename__ = "ai_response"
+    __table_args__ = (
+        Index("ix_ai_response_created_at_id", "created_at", "ai_response_id"),
+        Index("ix_ai_response_inquiry_created_at", "inquiry_id", "created_at", "ai_response_id"),
+    )
 
     ai_response_id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
     inquiry_id: Mapped[str] = mapped_column(ForeignKey("inquiry.inquiry_id", ondelete="CASCADE"))
-    ai_answer_draft: Mapped[str] = mapped_column(Text, nullable=False)
+    # 下書きはベースプロンプト（prompt_version 参照）を除いた顧客向け本文のみを保存する。
+    # キーフレームは draft_body に平文、それ以外は直前バージョン (delta_base_id) との差分を
+    # 圧縮して draft_delta に持つ。prompt_digest が NULL の行は本文が全文そのもの
+    prompt_digest: Mapped[str | None] = mapped_column(
+        ForeignKey("prompt_version.prompt_digest"), nullable=True
+    )
+    draft_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    draft_delta: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    delta_base_id: Mapped[str | None] = mapped_column(
+        ForeignKey("ai_response.ai_response_id"), nullable=True
+    )
     evidence_refs: Mapped[dict] = mapped_column(JSON, nullable=False)
     operator_edits: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     confidence_score: Mapped[float] = mapped_column(Numeric(3, 2), default=0.0, nullable=False)
     version_no: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    # オペレーター修正前後の正規化編集距離（判定 F-007 で使用。未修正なら NULL）
+    edit_distance: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # 生成時の危険語ヒット数と、直近の判定で入力されたオペレーター自信度（what-if 再判定用）
+    danger_hit_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    operator_confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     inquiry: Mapped["Inquiry"] = relationship("Inquiry", back_populates="ai_responses")
+
+    # 再構成した下書き全文（DB 列ではなくインスタンス属性）。DB から読んだ行は
+    # ai_service.load_drafts / aload_drafts を通してから参照する（生成・修正時は ai_service が設定）
+    @property
+    def ai_answer_draft(self) -> str:
+        draft = self.__dict__.get("_ai_answer_draft")
+        if draft is None:
+            # AttributeError だと pydantic の from_attributes が「必須項目なし」と
+            # 扱ってしまうため、別の例外にする
+            raise RuntimeError(
+                f"ai_answer_draft of {self.ai_response_id} is not loaded; "
+                "call ai_service.load_drafts() first"
+            )
+        return draft
+
+    @ai_answer_draft.setter
+    def ai_answer_draft(self, draft: str) -> None:
+        self.__dict__["_ai_answer_draft"] = draft
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, JSON, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
@@ -11,6 +11,7 @@ from ..db.base import Base
 
 class FinalResponseLog(Base):
     __tablename__ = "final_response_log"
+    __table_args__ = (Index("ix_final_response_log_sent_at_id", "sent_at", "audit_log_id"),)
 
     audit_log_id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, JSON, String, Text
+from sqlalchemy import Boolean, DateTime, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
@@ -11,6 +11,11 @@ from ..db.base import Base
 
 class Inquiry(Base):
     __tablename__ = "inquiry"
+    __table_args__ = (
+        Index("ix_inquiry_created_at_id", "created_at", "inquiry_id"),
+        Index("ix_inquiry_category_created_at", "inquiry_category", "created_at", "inquiry_id"),
+        Index("ix_inquiry_customer_created_at", "customer_id", "created_at", "inquiry_id"),
+    )
 
     inquiry_id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -29,10 +34,10 @@ class Inquiry(Base):
     ai_responses: Mapped[list["AiResponse"]] = relationship(
         "AiResponse", back_populates="inquiry", cascade="all, delete-orphan"
     )
-    escalation: Mapped["Escalation" | None] = relationship(
+    escalation: Mapped[Escalation | None] = relationship(
         "Escalation", back_populates="inquiry", uselist=False, cascade="all, delete-orphan"
     )
-    final_response: Mapped["FinalResponseLog" | None] = relationship(
+    final_response: Mapped[FinalResponseLog | None] = relationship(
         "FinalResponseLog", back_populates="inquiry", uselist=False, cascade="all, delete-orphan"
     )
 
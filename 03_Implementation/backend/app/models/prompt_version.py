@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+
+class PromptVersion(Base):
+    """回答案の生成に使ったベースプロンプト。内容ハッシュ単位で 1 行のみ保持する。"""
+
+    __tablename__ = "prompt_version"
+
+    prompt_digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    prompt_text: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+
+class ReportContent(Base):
+    """帳票の解析結果本体。内容ハッシュ単位で 1 行のみ保持し、ReportMeta から参照する。"""
+
+    __tablename__ = "report_content"
+
+    content_digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # 元ファイル（PDF）の sha256。同一ファイルの再アップロードを解析前に検出する
+    source_digest: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    report_structured_json: Mapped[dict] = mapped_column(JSON, nullable=False, deferred=True)
+    section_index: Mapped[dict | None] = mapped_column(JSON, nullable=True, deferred=True)
+    section_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -3,10 +3,11 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, JSON, String
+from sqlalchemy import DateTime, ForeignKey, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
+from .report_content import ReportContent
 
 
 class ReportMeta(Base):
@@ -18,7 +19,27 @@ class ReportMeta(Base):
     inquiry_id: Mapped[str] = mapped_column(ForeignKey("inquiry.inquiry_id", ondelete="CASCADE"))
     report_type: Mapped[str] = mapped_column(String(50), nullable=False)
     report_file_uri: Mapped[str] = mapped_column(String(255), nullable=False)
-    report_structured_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # 解析結果は ReportContent に内容ハッシュ単位で 1 件だけ保存し、ここでは参照のみ持つ
+    content_digest: Mapped[str | None] = mapped_column(
+        ForeignKey("report_content.content_digest"), nullable=True, index=True
+    )
+    # PDF 解析の進捗（parsed_pages / section_count）。セクション本体はスプールファイルに
+    # 追記し、完了時に ReportContent へ移して破棄する
+    staging_json: Mapped[dict | None] = mapped_column(JSON, nullable=True, deferred=True)
+    # pending → parsing → ready / failed（PDF 取込のみ。JSON 直接取込は即 ready）
+    ingest_status: Mapped[str] = mapped_column(String(20), default="ready", nullable=False)
+    ingest_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     inquiry: Mapped["Inquiry"] = relationship("Inquiry", back_populates="reports")
+    content: Mapped[ReportContent | None] = relationship("ReportContent")
+
+    @property
+    def report_structured_json(self) -> dict:
+        if self.content is not None:
+            return self.content.report_structured_json
+        return {"sections": [], **(self.staging_json or {})}
+
+    @property
+    def section_index(self) -> dict | None:
+        return self.content.section_index if self.content is not None else None
@@ -1,8 +1,22 @@
 from fastapi import APIRouter
 
-from . import ai, audits, documents, escalations, inquiries, responses, workflows
+from ..config import get_settings
+from . import (
+    admin,
+    ai,
+    async_reads,
+    audits,
+    documents,
+    escalations,
+    inquiries,
+    responses,
+    workflows,
+)
 
 api_router = APIRouter()
+if get_settings().db.async_enabled:
+    # 同一パス・メソッドは先に登録したルートが優先されるため、同期版より前に載せる
+    api_router.include_router(async_reads.router)
 api_router.include_router(inquiries.router, prefix="/inquiries", tags=["inquiries"])
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
@@ -10,3 +24,4 @@ api_router.include_router(responses.router, prefix="/responses", tags=["response
 api_router.include_router(workflows.router, prefix="/workflows", tags=["workflows"])
 api_router.include_router(escalations.router, prefix="/escalations", tags=["escalations"])
 api_router.include_router(audits.router, prefix="/audits", tags=["audits"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from ..db.session import pool_status
+from ..utils.draft_cache import draft_cache
+from ..utils.resource_cache import reload_all
+
+router = APIRouter()
+
+
+@router.post("/reload")
+def reload_resources():
+    return {"reloaded": reload_all()}
+
+
+@router.get("/db/pool")
+def db_pool_status():
+    return pool_status()
+
+
+@router.delete("/draft-cache")
+def clear_draft_cache():
+    draft_cache.clear()
+    return {"cleared": True}
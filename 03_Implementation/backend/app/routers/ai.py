@@ -1,16 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..config import get_settings
+from ..db.session import session_scope
 from ..dependencies import get_db
-from ..schemas import AiResponseCreate, AiResponseRead, AiResponseReview, AiResponseSummary
-from ..services import ai_service
+from ..schemas import (
+    AiBatchCreate,
+    AiBatchJob,
+    AiGenerationJob,
+    AiResponseCreate,
+    AiResponseRead,
+    AiResponseReview,
+    AiResponseSummary,
+)
+from ..services import ai_service, inquiry_service, job_service
 
 router = APIRouter()
 
 
 @router.get("/responses", response_model=list[AiResponseSummary])
-def list_responses(db: Session = Depends(get_db)):
-    return ai_service.list_ai_responses(db)
+def list_responses(
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=200),
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        records, next_cursor = ai_service.list_ai_responses(
+            db, limit, cursor, inquiry_id, created_from, created_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
 
 
 @router.get("/responses/{ai_response_id}", response_model=AiResponseRead)
@@ -21,14 +53,73 @@ def fetch_response(ai_response_id: str, db: Session = Depends(get_db)):
     return record
 
 
-@router.post("/responses", response_model=AiResponseRead)
-def generate_response(payload: AiResponseCreate, db: Session = Depends(get_db)):
+@router.post(
+    "/responses",
+    response_model=AiResponseRead | AiGenerationJob,
+    responses={status.HTTP_202_ACCEPTED: {"model": AiGenerationJob}},
+)
+def generate_response(
+    payload: AiResponseCreate,
+    response: Response,
+    mode: Literal["sync", "async"] = "sync",
+    db: Session = Depends(get_db),
+):
+    if mode == "async" and not get_settings().worker.enabled:
+        raise HTTPException(status_code=503, detail="Worker is disabled")
     try:
+        if mode == "async":
+            response.status_code = status.HTTP_202_ACCEPTED
+            return job_service.dispatch_ai_generation(db, payload)
         return ai_service.enqueue_ai_generation(db, payload)
     except ValueError as exc:  # pragma: no cover - input validation branch
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_events(inquiry_id: str) -> Iterator[str]:
+    with session_scope() as db:
+        for event, data in ai_service.stream_ai_generation(db, inquiry_id):
+            if event == "done":
+                data = AiResponseRead.model_validate(data).model_dump(mode="json")
+            yield _sse(event, data)
+
+
+@router.get("/responses/{inquiry_id}/stream")
+def stream_response(inquiry_id: str, db: Session = Depends(get_db)):
+    if inquiry_service.get_inquiry(db, inquiry_id) is None:
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    return StreamingResponse(
+        _stream_events(inquiry_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/responses:batch", response_model=AiBatchJob, status_code=status.HTTP_202_ACCEPTED
+)
+def generate_batch(payload: AiBatchCreate):
+    if not get_settings().worker.enabled:
+        raise HTTPException(status_code=503, detail="Worker is disabled")
+    return job_service.dispatch_batch_generation(payload)
+
+
+@router.get("/batches/{batch_id}", response_model=AiBatchJob)
+def fetch_batch(batch_id: str):
+    job = job_service.get_batch_job(batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=AiGenerationJob)
+def fetch_job(job_id: str):
+    return job_service.get_generation_job(job_id)
+
+
 @router.patch("/responses/{ai_response_id}", response_model=AiResponseRead)
 def review_response(
     ai_response_id: str, payload: AiResponseReview, db: Session = Depends(get_db)
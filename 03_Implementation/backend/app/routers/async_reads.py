@@ -0,0 +1,111 @@
+"""AsyncSession 版の読み取り系エンドポイント（DB__ASYNC_ENABLED=true のときのみ登録）。
+
+スレッドプールを経由せずイベントループ上で処理するため、大量の同時 GET を少数スレッドで捌ける。
+パス・レスポンスは同期版（inquiries / ai / escalations / audits）と同一。
+"""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..dependencies import get_async_db
+from ..schemas import (
+    AiResponseRead,
+    AiResponseSummary,
+    EscalationRead,
+    FinalResponseRead,
+    InquiryRead,
+    InquirySummary,
+)
+from ..services import ai_service, audit_service, escalation_service, inquiry_service
+
+router = APIRouter()
+
+
+@router.get("/inquiries", response_model=list[InquirySummary], tags=["inquiries"])
+async def list_inquiries_async(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    category: str | None = None,
+    customer_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        records, next_cursor = await inquiry_service.alist_inquiries(
+            db, limit, cursor, category, customer_id, created_from, created_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
+
+
+@router.get("/inquiries/{inquiry_id}", response_model=InquiryRead, tags=["inquiries"])
+async def get_inquiry_async(inquiry_id: str, db: AsyncSession = Depends(get_async_db)):
+    record = await inquiry_service.aget_inquiry(db, inquiry_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    return record
+
+
+@router.get("/ai/responses", response_model=list[AiResponseSummary], tags=["ai"])
+async def list_responses_async(
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=200),
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        records, next_cursor = await ai_service.alist_ai_responses(
+            db, limit, cursor, inquiry_id, created_from, created_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
+
+
+@router.get("/ai/responses/{ai_response_id}", response_model=AiResponseRead, tags=["ai"])
+async def fetch_response_async(ai_response_id: str, db: AsyncSession = Depends(get_async_db)):
+    record = await ai_service.aget_ai_response(db, ai_response_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="AI response not found")
+    return record
+
+
+@router.get("/escalations/{inquiry_id}", response_model=EscalationRead, tags=["escalations"])
+async def get_escalation_async(inquiry_id: str, db: AsyncSession = Depends(get_async_db)):
+    record = await escalation_service.aget_escalation_for_inquiry(db, inquiry_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Escalation not found")
+    return record
+
+
+@router.get("/audits/logs", response_model=list[FinalResponseRead], tags=["audits"])
+async def list_logs_async(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        records, next_cursor = await audit_service.alist_final_logs(
+            db, limit, cursor, inquiry_id, sent_from, sent_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
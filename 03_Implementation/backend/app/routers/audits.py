@@ -1,13 +1,72 @@
-from fastapi import APIRouter, Depends
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..db.session import session_scope
 from ..dependencies import get_db
 from ..schemas import FinalResponseRead
 from ..services import audit_service
+from ..utils.export import MEDIA_TYPES, iter_csv, iter_parquet, parquet_available
 
 router = APIRouter()
 
 
 @router.get("/logs", response_model=list[FinalResponseRead])
-def list_logs(db: Session = Depends(get_db)):
-    return audit_service.list_final_logs(db)
+def list_logs(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        records, next_cursor = audit_service.list_final_logs(
+            db, limit, cursor, inquiry_id, sent_from, sent_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
+
+
+def _export_chunks(
+    inquiry_id: str | None, sent_from: datetime | None, sent_to: datetime | None
+) -> Iterator:
+    # StreamingResponse はリクエストの依存セッション終了後に消費されるため専用セッションで読む
+    with session_scope() as db:
+        yield from audit_service.iter_final_log_chunks(db, inquiry_id, sent_from, sent_to)
+
+
+@router.get("/logs/export")
+def export_logs(
+    format: Literal["csv", "parquet"] = "csv",  # noqa: A002 - クエリパラメータ名
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+):
+    try:
+        audit_service.validate_period(sent_from, sent_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    chunks = _export_chunks(inquiry_id, sent_from, sent_to)
+    if format == "parquet":
+        body = iter_parquet(audit_service.EXPORT_COLUMNS, audit_service.EXPORT_TYPES, chunks)
+    else:
+        body = iter_csv(audit_service.EXPORT_COLUMNS, chunks)
+    period = "_".join(value.strftime("%Y%m%d") for value in (sent_from, sent_to) if value)
+    filename = f"final_response_log{'_' + period if period else ''}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from ..config import get_settings
 from ..dependencies import get_db
-from ..schemas import DocumentIngestRequest, ReportMetaRead
-from ..services import document_service
+from ..schemas import DocumentIngestRequest, PdfIngestRequest, ReportMetaRead
+from ..services import document_service, job_service
 
 router = APIRouter()
 
@@ -11,3 +12,24 @@ router = APIRouter()
 @router.post("", response_model=ReportMetaRead, status_code=status.HTTP_201_CREATED)
 def ingest_document(payload: DocumentIngestRequest, db: Session = Depends(get_db)):
     return document_service.ingest_report(db, payload)
+
+
+@router.post("/pdf", response_model=ReportMetaRead, status_code=status.HTTP_202_ACCEPTED)
+def ingest_pdf(payload: PdfIngestRequest, db: Session = Depends(get_db)):
+    if not get_settings().worker.enabled:
+        raise HTTPException(status_code=503, detail="Worker is disabled")
+    try:
+        report = document_service.register_pdf_report(db, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if report.ingest_status == "pending":
+        job_service.dispatch_pdf_ingest(report.report_meta_id)
+    return report
+
+
+@router.get("/{report_meta_id}", response_model=ReportMetaRead)
+def fetch_document(report_meta_id: str, db: Session = Depends(get_db)):
+    report = document_service.get_report(db, report_meta_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from ..dependencies import get_db
-from ..models import Escalation
 from ..schemas import EscalationCreate, EscalationRead, EscalationUpdate
 from ..services import escalation_service
 
@@ -24,7 +23,7 @@ def update_escalation(escalation_id: str, payload: EscalationUpdate, db: Session
 
 @router.get("/{inquiry_id}", response_model=EscalationRead)
 def get_escalation(inquiry_id: str, db: Session = Depends(get_db)):
-    record = db.query(Escalation).filter_by(inquiry_id=inquiry_id).first()
+    record = escalation_service.get_escalation_for_inquiry(db, inquiry_id)
     if record is None:
         raise HTTPException(status_code=404, detail="Escalation not found")
     return record
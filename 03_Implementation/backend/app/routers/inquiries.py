@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from ..dependencies import get_db
-from ..schemas import InquiryCreate, InquiryRead, InquirySummary
+from ..schemas import (
+    InquiryBulkCreate,
+    InquiryBulkResult,
+    InquiryCreate,
+    InquiryRead,
+    InquirySummary,
+)
 from ..services import inquiry_service
 
 router = APIRouter()
@@ -13,9 +21,32 @@ def create_inquiry(payload: InquiryCreate, db: Session = Depends(get_db)):
     return inquiry_service.create_inquiry(db, payload)
 
 
+@router.post(":bulk", response_model=InquiryBulkResult, status_code=status.HTTP_201_CREATED)
+def create_inquiries_bulk(payload: InquiryBulkCreate, db: Session = Depends(get_db)):
+    inquiry_ids = inquiry_service.create_inquiries_bulk(db, payload.items)
+    return InquiryBulkResult(created=len(inquiry_ids), inquiry_ids=inquiry_ids)
+
+
 @router.get("", response_model=list[InquirySummary])
-def list_inquiries(db: Session = Depends(get_db)):
-    return inquiry_service.list_inquiries(db)
+def list_inquiries(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    category: str | None = None,
+    customer_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        records, next_cursor = inquiry_service.list_inquiries(
+            db, limit, cursor, category, customer_id, created_from, created_to
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
 
 
 @router.get("/{inquiry_id}", response_model=InquiryRead)
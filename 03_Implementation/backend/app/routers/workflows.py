@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from ..config import get_settings
 from ..dependencies import get_db
 from ..models import AiResponse, Inquiry
-from ..schemas import TriageRequest, TriageResult
-from ..utils.danger_words import detect_danger_words, load_danger_words
+from ..schemas import (
+    TriageBatchRequest,
+    TriageBatchResult,
+    TriageRequest,
+    TriageResult,
+    TriageSimulationRequest,
+    TriageSimulationResult,
+)
+from ..services import triage_service
 from ..workflows.triage import evaluate
 
 router = APIRouter()
@@ -21,15 +27,30 @@ def triage(payload: TriageRequest, db: Session = Depends(get_db)):
     if inquiry is None:
         raise HTTPException(status_code=404, detail="Inquiry not found")
 
-    settings = get_settings()
-    dictionary = load_danger_words(settings.danger_words_path)
-    hits = detect_danger_words(inquiry.question_text, dictionary)
+    hits = triage_service.danger_hit_count(inquiry.question_text)
+    edit_distance = payload.edit_distance
+    if edit_distance is None:
+        edit_distance = ai_record.edit_distance or 0.0
     should_escalate, score, rationale = evaluate(
-        ai_record, payload.edit_distance, payload.operator_confidence, len(hits)
+        ai_record, edit_distance, payload.operator_confidence, hits
     )
+    # 判定入力を記録し、閾値シミュレーション (triage:simulate) で再現できるようにする
+    ai_record.operator_confidence = payload.operator_confidence
+    ai_record.danger_hit_count = hits
+    db.commit()
     return TriageResult(
         should_escalate=should_escalate,
         rationale=rationale,
         recommended_channel="backoffice" if should_escalate else "operator",
         confidence=score,
     )
+
+
+@router.post("/triage:batch", response_model=TriageBatchResult)
+def triage_batch(payload: TriageBatchRequest, db: Session = Depends(get_db)):
+    return triage_service.triage_batch(db, payload)
+
+
+@router.post("/triage:simulate", response_model=TriageSimulationResult)
+def triage_simulate(payload: TriageSimulationRequest, db: Session = Depends(get_db)):
+    return triage_service.simulate_thresholds(db, payload)
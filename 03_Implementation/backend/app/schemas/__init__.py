@@ -1,20 +1,53 @@
-from .ai import AiResponseCreate, AiResponseRead, AiResponseReview, AiResponseSummary
-from .document import DocumentIngestRequest, ReportMetaRead
+from .ai import (
+    AiBatchCreate,
+    AiBatchItem,
+    AiBatchJob,
+    AiGenerationJob,
+    AiResponseCreate,
+    AiResponseRead,
+    AiResponseReview,
+    AiResponseSummary,
+)
+from .document import DocumentIngestRequest, PdfIngestRequest, ReportMetaRead
 from .escalation import EscalationCreate, EscalationRead, EscalationUpdate
 from .final_response import FinalResponseCreate, FinalResponseRead
-from .inquiry import InquiryCreate, InquiryRead, InquirySummary
-from .workflow import TriageRequest, TriageResult
+from .inquiry import (
+    InquiryBulkCreate,
+    InquiryBulkResult,
+    InquiryCreate,
+    InquiryRead,
+    InquirySummary,
+)
+from .workflow import (
+    TriageBatchItem,
+    TriageBatchRequest,
+    TriageBatchResult,
+    TriageBatchResultItem,
+    TriageRequest,
+    TriageResult,
+    TriageRuleSettings,
+    TriageSimulationConfigResult,
+    TriageSimulationRequest,
+    TriageSimulationResult,
+)
 
 __all__ = [
     "InquiryCreate",
     "InquiryRead",
     "InquirySummary",
+    "InquiryBulkCreate",
+    "InquiryBulkResult",
     "DocumentIngestRequest",
+    "PdfIngestRequest",
     "ReportMetaRead",
     "AiResponseCreate",
     "AiResponseRead",
     "AiResponseSummary",
     "AiResponseReview",
+    "AiGenerationJob",
+    "AiBatchCreate",
+    "AiBatchItem",
+    "AiBatchJob",
     "EscalationCreate",
     "EscalationRead",
     "EscalationUpdate",
@@ -22,4 +55,12 @@ __all__ = [
     "FinalResponseRead",
     "TriageRequest",
     "TriageResult",
+    "TriageRuleSettings",
+    "TriageBatchItem",
+    "TriageBatchRequest",
+    "TriageBatchResult",
+    "TriageBatchResultItem",
+    "TriageSimulationRequest",
+    "TriageSimulationConfigResult",
+    "TriageSimulationResult",
 ]
@@ -23,6 +23,7 @@ class AiResponseRead(BaseModel):
     operator_edits: dict[str, Any] | None = None
     confidence_score: float
     version_no: int
+    edit_distance: float | None = None
     created_at: datetime
 
     class Config:
@@ -44,3 +45,30 @@ class AiResponseReview(BaseModel):
     operator_edits: dict[str, Any] | None = None
     ai_answer_draft: str | None = None
     confidence_score: float | None = None
+
+
+class AiGenerationJob(BaseModel):
+    job_id: str
+    status: str
+    ai_response_id: str | None = None
+    error: str | None = None
+
+
+class AiBatchCreate(BaseModel):
+    inquiry_ids: list[str] = Field(..., min_length=1, max_length=10000)
+    chunk_size: int = Field(default=100, ge=1, le=1000)
+
+
+class AiBatchItem(BaseModel):
+    inquiry_id: str
+    status: str
+    ai_response_id: str | None = None
+    error: str | None = None
+
+
+class AiBatchJob(BaseModel):
+    batch_id: str
+    status: str
+    total_chunks: int
+    completed_chunks: int = 0
+    items: list[AiBatchItem] = Field(default_factory=list)
@@ -10,12 +10,20 @@ class DocumentIngestRequest(BaseModel):
     report_structured_json: dict = Field(..., description="解析済みセクション情報")
 
 
+class PdfIngestRequest(BaseModel):
+    inquiry_id: str = Field(..., description="対象問い合わせ ID")
+    report_type: str = Field(..., max_length=50)
+    report_file_uri: str = Field(..., description="PDF の URI（file:// またはローカルパス）")
+
+
 class ReportMetaRead(BaseModel):
     report_meta_id: str
     inquiry_id: str
     report_type: str
     report_file_uri: str
     report_structured_json: dict
+    ingest_status: str
+    ingest_error: str | None = None
     created_at: datetime
 
     class Config:
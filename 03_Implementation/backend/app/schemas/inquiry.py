@@ -13,6 +13,15 @@ class InquiryCreate(BaseModel):
     ai_enabled: bool = Field(default=True)
 
 
+class InquiryBulkCreate(BaseModel):
+    items: list[InquiryCreate] = Field(..., min_length=1, max_length=10000)
+
+
+class InquiryBulkResult(BaseModel):
+    created: int
+    inquiry_ids: list[str]
+
+
 class InquiryRead(BaseModel):
     inquiry_id: str
     customer_id: str
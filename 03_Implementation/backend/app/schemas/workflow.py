@@ -1,10 +1,14 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
 class TriageRequest(BaseModel):
     inquiry_id: str
     ai_response_id: str
-    edit_distance: float = Field(..., ge=0.0)
+    edit_distance: float | None = Field(
+        default=None, ge=0.0, description="省略時はレビュー時にサーバーで算出した値を使用"
+    )
     operator_confidence: float = Field(..., ge=0.0, le=1.0)
 
 
@@ -13,3 +17,63 @@ class TriageResult(BaseModel):
     rationale: str
     recommended_channel: str
     confidence: float
+
+
+class TriageRuleSettings(BaseModel):
+    min_confidence: float = Field(default=0.65, ge=0.0, le=1.0)
+    max_edit_distance: float = Field(default=0.35, ge=0.0)
+    danger_penalty: float = Field(default=0.1, ge=0.0)
+
+
+class TriageBatchItem(BaseModel):
+    ai_response_id: str
+    edit_distance: float | None = Field(default=None, ge=0.0)
+    operator_confidence: float = Field(..., ge=0.0, le=1.0)
+
+
+class TriageBatchRequest(BaseModel):
+    items: list[TriageBatchItem] = Field(..., min_length=1, max_length=5000)
+    rules: TriageRuleSettings | None = Field(
+        default=None, description="閾値を変えて再判定する場合に指定"
+    )
+
+
+class TriageBatchResultItem(TriageResult):
+    ai_response_id: str
+    inquiry_id: str
+    danger_hits: int
+
+
+class TriageBatchResult(BaseModel):
+    results: list[TriageBatchResultItem]
+    missing: list[str] = Field(default_factory=list)
+
+
+class TriageSimulationRequest(BaseModel):
+    min_confidence: list[float] = Field(..., min_length=1, max_length=100)
+    danger_penalty: list[float] = Field(default_factory=lambda: [0.1], min_length=1, max_length=100)
+    default_operator_confidence: float = Field(
+        default=0.8, ge=0.0, le=1.0, description="判定時の operator_confidence が未記録の行に使う値"
+    )
+    latest_only: bool = Field(default=True, description="問い合わせごとの最新版のみを再判定する")
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class TriageSimulationConfigResult(BaseModel):
+    min_confidence: float
+    danger_penalty: float
+    escalated: int
+    escalation_rate: float
+    agreement: float
+    precision: float | None = None
+    recall: float | None = None
+    true_positive: int
+    false_positive: int
+    false_negative: int
+
+
+class TriageSimulationResult(BaseModel):
+    rows: int
+    actual_escalation_rate: float
+    results: list[TriageSimulationConfigResult]
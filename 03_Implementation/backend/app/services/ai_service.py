@@ -1,20 +1,58 @@
 from __future__ import annotations
 
+import copy
+import uuid
+from collections.abc import Iterable, Iterator
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, load_only, selectinload
 
 from ..config import get_settings
-from ..models import AiResponse, Inquiry
+from ..models import AiResponse, Inquiry, PromptVersion
 from ..schemas.ai import AiResponseCreate
 from ..utils.danger_words import detect_danger_words, load_danger_words
+from ..utils.draft_cache import draft_cache, draft_key
+from ..utils.edit_distance import normalized_edit_distance
+from ..utils.hashing import json_digest, text_digest
+from ..utils.metrics import span
+from ..utils.pagination import apaginate, paginate
 from ..utils.prompting import load_prompt
 from ..utils.rag import find_relevant_sections
+from ..utils.section_store import load_section_store
+from ..utils.text_delta import apply_delta, encode_delta
+from ..utils.vector_store import load_vector_index
+from .job_service import dispatch_store_rebuild
+from .triage_service import danger_hit_count
 
 settings = get_settings()
 
+DRAFT_HEADING = "# 顧客向け回答案"
+# このバージョン間隔ごとに本文を平文で持ち、再構成時に適用する差分の数を抑える
+DRAFT_KEYFRAME_INTERVAL = 8
+
+# prompt_digest -> プロンプト本文（内容アドレスのため失効しない）。DB にコミット済みの行のみ
+_prompt_texts: dict[str, str] = {}
+# セッション内で追加し、まだコミットされていない prompt_version（Session.info のキー）
+_PENDING_PROMPTS = "pending_prompt_versions"
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_prompts(session: Session) -> None:
+    # SAVEPOINT の解放でも呼ばれるため、外側のトランザクションのコミット時のみ反映する
+    if not session.in_nested_transaction():
+        _prompt_texts.update(session.info.pop(_PENDING_PROMPTS, {}))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_prompts(session: Session, _previous_transaction) -> None:
+    # ロールバックで INSERT が取り消された可能性があるため、次回は DB を確認し直す
+    session.info.pop(_PENDING_PROMPTS, None)
+
 
 @dataclass
 class GeneratedAnswer:
@@ -29,15 +67,8 @@ class GeneratedAnswer:
         return payload
 
 
-def _compose_answer(inquiry: Inquiry, sections: list[dict[str, Any]], danger_hits: list[str]) -> GeneratedAnswer:
-    base_prompt = load_prompt(settings.base_prompt_path)
-    memo: list[str] = []
-    if not sections:
-        memo.append("帳票の解析結果が不足しています。必要なページをアップロードしてください。")
-    if danger_hits:
-        memo.append(f"危険語検知: {', '.join(danger_hits)}。必ず内容を精査してください。")
-
-    evidence = [
+def _evidence_refs(sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
         {
             "source": section.get("title", "不明セクション"),
             "page": section.get("page"),
@@ -46,74 +77,581 @@ def _compose_answer(inquiry: Inquiry, sections: list[dict[str, Any]], danger_hit
         for section in sections
     ]
 
-    answer_body = "\n".join(
-        [
-            f"お尋ねの件は {inquiry.inquiry_category} に含まれる項目で、",
-            "帳票上の該当箇所を確認したところ、指定の金額は該当期間の累計値です。",
-            "詳細な内訳は根拠欄に記載した明細行をご参照ください。",
-            "最終的な税務判断が必要な場合は専門家への確認をお願いします。",
-        ]
-    )
 
-    answer_text = f"{base_prompt}\n\n# 顧客向け回答案\n{answer_body}"
+def _answer_tokens(
+    inquiry: Inquiry, sections: list[dict[str, Any]], danger_hits: list[str]
+) -> Iterator[str]:
+    """Yield the customer-facing answer incrementally (LLM ストリーミングの差し替え点)。"""
+    lines = [
+        f"お尋ねの件は {inquiry.inquiry_category} に含まれる項目で、",
+        "帳票上の該当箇所を確認したところ、指定の金額は該当期間の累計値です。",
+        "詳細な内訳は根拠欄に記載した明細行をご参照ください。",
+        "最終的な税務判断が必要な場合は専門家への確認をお願いします。",
+    ]
+    for index, line in enumerate(lines):
+        yield line if index == len(lines) - 1 else f"{line}\n"
+
+
+def _draft_text(prompt_text: str | None, body: str) -> str:
+    if prompt_text is None:
+        return body
+    return f"{prompt_text}\n\n{DRAFT_HEADING}\n{body}"
+
+
+def _compose_answer(
+    inquiry: Inquiry,
+    sections: list[dict[str, Any]],
+    danger_hits: list[str],
+    answer_body: str | None = None,
+) -> GeneratedAnswer:
+    base_prompt = load_prompt(settings.base_prompt_path)
+    memo: list[str] = []
+    if not sections:
+        memo.append("帳票の解析結果が不足しています。必要なページをアップロードしてください。")
+    if danger_hits:
+        memo.append(f"危険語検知: {', '.join(danger_hits)}。必ず内容を精査してください。")
+
+    if answer_body is None:
+        answer_body = "".join(_answer_tokens(inquiry, sections, danger_hits))
+
+    answer_text = _draft_text(base_prompt, answer_body)
 
     confidence = min(0.95, 0.55 + 0.1 * len(sections) - 0.1 * len(danger_hits))
     return GeneratedAnswer(
         answer_text=answer_text,
-        evidence=evidence,
+        evidence=_evidence_refs(sections),
         operator_memo=memo,
         confidence=max(confidence, 0.35),
     )
 
 
-def enqueue_ai_generation(db: Session, payload: AiResponseCreate) -> AiResponse:
-    inquiry: Inquiry | None = db.query(Inquiry).filter_by(inquiry_id=payload.inquiry_id).first()
-    if not inquiry:
+def _load_inquiry(db: Session, inquiry_id: str) -> tuple[Inquiry, int, tuple[str, str] | None]:
+    """Load the inquiry with its reports, max version_no and latest draft body (2 round trips).
+
+    最新版から直近キーフレームまでの版（差分の連鎖）の保存列も同じ SELECT で取得する。
+    """
+    max_version = (
+        select(func.max(AiResponse.version_no))
+        .where(AiResponse.inquiry_id == Inquiry.inquiry_id)
+        .correlate(Inquiry)
+        .scalar_subquery()
+    )
+    version = aliased(AiResponse)
+    rows = (
+        db.query(
+            Inquiry,
+            version.ai_response_id,
+            version.inquiry_id,
+            version.draft_body,
+            version.draft_delta,
+            version.delta_base_id,
+            version.version_no,
+            version.created_at,
+        )
+        .outerjoin(
+            version,
+            and_(
+                version.inquiry_id == Inquiry.inquiry_id,
+                version.version_no >= _chain_start(max_version),
+            ),
+        )
+        .options(selectinload(Inquiry.reports))
+        .filter(Inquiry.inquiry_id == inquiry_id)
+        .all()
+    )
+    if not rows:
         raise ValueError("Inquiry not found")
+    chain = [row for row in rows if row.ai_response_id is not None]
+    latest_version = max((row.version_no for row in chain), default=0)
+    previous = None
+    if _needs_previous(latest_version + 1):
+        previous = _latest_bodies(chain).get(inquiry_id)
+    return rows[0][0], latest_version, previous
+
+
+def _relevant_sections(inquiry: Inquiry, report) -> list[dict[str, Any]]:
+    vectors = load_vector_index(report.content_digest)
+    store = load_section_store(report.content_digest)
+    if store is not None:
+        # セクションストアがあれば JSON 列（deferred）は読まず、候補セクションのみ decode する
+        return store.search(
+            inquiry.question_text,
+            vectors=vectors,
+            vector_weight=settings.vector.weight,
+            nprobe=settings.vector.nprobe,
+        )
+    if report.content_digest is not None:
+        # ファイルがない（移行直後など）。今回は JSON で検索し、ストアはワーカーで作り直す
+        dispatch_store_rebuild(report.content_digest)
+    return find_relevant_sections(
+        inquiry.question_text,
+        report.report_structured_json,
+        report.section_index,
+        vectors=vectors,
+        vector_weight=settings.vector.weight,
+        nprobe=settings.vector.nprobe,
+    )
+
 
-    danger_dict = load_danger_words(settings.danger_words_path)
-    hits = detect_danger_words(inquiry.question_text, danger_dict)
+def _gather_context(inquiry: Inquiry) -> tuple[list[str], list[dict[str, Any]]]:
+    with span("danger_words.load"):
+        danger_dict = load_danger_words(settings.danger_words_path)
+    with span("danger_words.detect"):
+        hits = detect_danger_words(inquiry.question_text, danger_dict)
 
     sections: list[dict[str, Any]] = []
     for report in inquiry.reports:
-        sections.extend(find_relevant_sections(inquiry.question_text, report.report_structured_json))
+        with span("retrieval"):
+            sections.extend(_relevant_sections(inquiry, report))
+    return hits, sections
+
+
+def _generate(inquiry: Inquiry, overrides: dict[str, Any] | None = None) -> GeneratedAnswer:
+    """Compose a draft, reusing a cached one when every input that shapes it is identical."""
+    if not settings.draft_cache.enabled:
+        hits, sections = _gather_context(inquiry)
+        with span("compose"):
+            return _compose_answer(inquiry, sections, hits)
+
+    key = draft_key(
+        inquiry.question_text,
+        inquiry.inquiry_category,
+        [
+            report.content_digest or json_digest(report.report_structured_json)
+            for report in inquiry.reports
+        ],
+        load_prompt(settings.base_prompt_path),
+        load_danger_words(settings.danger_words_path).fingerprint,
+        overrides,
+    )
+    with span("draft_cache.get"):
+        cached = draft_cache.get(key)
+    if cached is not None:
+        return GeneratedAnswer(**copy.deepcopy(cached))
+
+    hits, sections = _gather_context(inquiry)
+    with span("compose"):
+        generated = _compose_answer(inquiry, sections, hits)
+    draft_cache.set(key, asdict(generated), [report.report_file_uri for report in inquiry.reports])
+    return generated
+
+
+# --- draft storage (プロンプト参照 + 本文、バージョン間は差分) ----------------------------
+
 
-    generated = _compose_answer(inquiry, sections, hits)
+def _prompt_version(db: Session, prompt_text: str) -> str:
+    """Return the digest of ``prompt_text``, adding its prompt_version row on first use."""
+    digest = text_digest(prompt_text)
+    # 登録済みのプロンプトは参照のみ（生成ごとの確認 SELECT を省く）
+    if digest in _prompt_texts or digest in db.info.get(_PENDING_PROMPTS, {}):
+        return digest
+    if db.get(PromptVersion, digest) is not None:
+        _prompt_texts[digest] = prompt_text
+        return digest
+    try:
+        with db.begin_nested():
+            db.add(PromptVersion(prompt_digest=digest, prompt_text=prompt_text))
+    except IntegrityError:
+        # 並行して他のトランザクションが追加した。コミット済みかは次回の参照で確認する
+        return digest
+    # プロセス共有のキャッシュへはコミット後に反映する（_publish_prompts）
+    db.info.setdefault(_PENDING_PROMPTS, {})[digest] = prompt_text
+    return digest
+
+
+def _split_draft(db: Session, text: str, prompt_text: str | None) -> tuple[str | None, str]:
+    """Split a full draft into ``(prompt_digest, body)``; other text is stored whole."""
+    prefix = _draft_text(prompt_text, "")
+    if prompt_text is not None and text.startswith(prefix):
+        return _prompt_version(db, prompt_text), text[len(prefix) :]
+    return None, text
+
+
+def _store_body(record: AiResponse, body: str, previous: tuple[str, str] | None) -> None:
+    """Store ``body`` as a keyframe, or as a delta against ``previous`` (id, body) if smaller."""
+    record.draft_body, record.draft_delta, record.delta_base_id = body, None, None
+    if previous is None or record.version_no % DRAFT_KEYFRAME_INTERVAL == 1:
+        return
+    base_id, base_body = previous
+    delta = encode_delta(base_body, body)
+    if len(delta) < len(body.encode("utf-8")):
+        record.draft_body, record.draft_delta, record.delta_base_id = None, delta, base_id
+
+
+_StorageRow = tuple[str | None, bytes | None, str | None]
+
+
+def _storage_stmt(inquiry_ids: set[str]) -> Select:
+    return select(
+        AiResponse.ai_response_id,
+        AiResponse.draft_body,
+        AiResponse.draft_delta,
+        AiResponse.delta_base_id,
+    ).where(AiResponse.inquiry_id.in_(inquiry_ids))
+
+
+def _resolve_bodies(rows: dict[str, _StorageRow], ai_response_ids: list[str]) -> dict[str, str]:
+    """Rebuild bodies by applying deltas forward from the nearest keyframe."""
+    bodies: dict[str, str] = {}
+    for target in ai_response_ids:
+        chain: list[tuple[str, bytes]] = []
+        current = target
+        while current not in bodies:
+            body, delta, base_id = rows[current]
+            if delta is None:
+                bodies[current] = body or ""
+                break
+            chain.append((current, delta))
+            current = base_id
+        for ai_response_id, delta in reversed(chain):
+            bodies[ai_response_id] = apply_delta(bodies[current], delta)
+            current = ai_response_id
+    return bodies
+
+
+def _known_prompts(info: dict) -> dict[str, str]:
+    """Committed prompts plus those this session added but has not committed yet."""
+    pending = info.get(_PENDING_PROMPTS)
+    return {**_prompt_texts, **pending} if pending else _prompt_texts
+
+
+def _draft_queries(
+    records: list[AiResponse], prompts: dict[str, str]
+) -> tuple[Select | None, Select | None]:
+    """Statements still needed to rebuild ``records`` (差分の連鎖、未取得のプロンプト)。"""
+    inquiry_ids = {record.inquiry_id for record in records if record.draft_delta is not None}
+    digests = {
+        record.prompt_digest
+        for record in records
+        if record.prompt_digest and record.prompt_digest not in prompts
+    }
+    chain_stmt = _storage_stmt(inquiry_ids) if inquiry_ids else None
+    prompt_stmt = (
+        select(PromptVersion.prompt_digest, PromptVersion.prompt_text).where(
+            PromptVersion.prompt_digest.in_(digests)
+        )
+        if digests
+        else None
+    )
+    return chain_stmt, prompt_stmt
 
-    ai_response = AiResponse(
+
+def _record_bodies(records: list[AiResponse], chain_rows: Iterable[Any]) -> dict[str, str]:
+    rows: dict[str, _StorageRow] = {
+        row.ai_response_id: (row.draft_body, row.draft_delta, row.delta_base_id)
+        for row in chain_rows
+    }
+    for record in records:
+        rows[record.ai_response_id] = (record.draft_body, record.draft_delta, record.delta_base_id)
+    return _resolve_bodies(rows, [record.ai_response_id for record in records])
+
+
+def _fill_drafts(
+    records: list[AiResponse], bodies: dict[str, str], prompts: dict[str, str]
+) -> None:
+    for record in records:
+        prompt_text = prompts[record.prompt_digest] if record.prompt_digest else None
+        record.ai_answer_draft = _draft_text(prompt_text, bodies[record.ai_response_id])
+
+
+def _draft_bodies(db: Session, records: list[AiResponse]) -> dict[str, str]:
+    chain_stmt, prompt_stmt = _draft_queries(records, _known_prompts(db.info))
+    if prompt_stmt is not None:
+        # このセッションで追加したプロンプトは除外済み。読めるのは他でコミットされた行のみ
+        _prompt_texts.update(db.execute(prompt_stmt).all())
+    return _record_bodies(records, db.execute(chain_stmt) if chain_stmt is not None else ())
+
+
+def load_drafts(db: Session, records: list[AiResponse]) -> list[AiResponse]:
+    """Set ``ai_answer_draft``（プロンプト + 本文の全文）on ``records`` from stored rows."""
+    _fill_drafts(records, _draft_bodies(db, records), _known_prompts(db.info))
+    return records
+
+
+async def aload_drafts(db: AsyncSession, records: list[AiResponse]) -> list[AiResponse]:
+    chain_stmt, prompt_stmt = _draft_queries(records, _known_prompts(db.info))
+    if prompt_stmt is not None:
+        _prompt_texts.update((await db.execute(prompt_stmt)).all())
+    chain_rows = (await db.execute(chain_stmt)).all() if chain_stmt is not None else ()
+    _fill_drafts(records, _record_bodies(records, chain_rows), _known_prompts(db.info))
+    return records
+
+
+def _chain_start(max_version: Any) -> Any:
+    """Lowest version_no the latest version's delta chain can reach (直近の定期キーフレーム)。
+
+    差分の基準は常に自分以下の版で、``version_no % 間隔 == 1`` の版は必ずキーフレームのため、
+    連鎖はこの範囲に収まる。
+    """
+    return max_version - (max_version - 1) % DRAFT_KEYFRAME_INTERVAL
+
+
+def _latest_bodies(rows: Iterable[Any]) -> dict[str, tuple[str, str]]:
+    """``inquiry_id -> (ai_response_id, body)`` of the latest version among ``rows``."""
+    latest: dict[str, Any] = {}
+    storage: dict[str, _StorageRow] = {}
+    for row in rows:
+        storage[row.ai_response_id] = (row.draft_body, row.draft_delta, row.delta_base_id)
+        current = latest.get(row.inquiry_id)
+        if current is None or (row.version_no, row.created_at) > (
+            current.version_no,
+            current.created_at,
+        ):
+            latest[row.inquiry_id] = row
+    bodies = _resolve_bodies(storage, [row.ai_response_id for row in latest.values()])
+    return {
+        inquiry_id: (row.ai_response_id, bodies[row.ai_response_id])
+        for inquiry_id, row in latest.items()
+    }
+
+
+def _latest_drafts(db: Session, inquiry_ids: set[str]) -> dict[str, tuple[str, str]]:
+    """Bulk variant of the latest-body lookup in :func:`_load_inquiry` (バッチ生成用)。"""
+    if not inquiry_ids:
+        return {}
+    latest = (
+        select(AiResponse.inquiry_id, func.max(AiResponse.version_no).label("max_version"))
+        .where(AiResponse.inquiry_id.in_(inquiry_ids))
+        .group_by(AiResponse.inquiry_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            AiResponse.ai_response_id,
+            AiResponse.inquiry_id,
+            AiResponse.draft_body,
+            AiResponse.draft_delta,
+            AiResponse.delta_base_id,
+            AiResponse.version_no,
+            AiResponse.created_at,
+        )
+        .join(latest, AiResponse.inquiry_id == latest.c.inquiry_id)
+        .where(AiResponse.version_no >= _chain_start(latest.c.max_version))
+    )
+    return _latest_bodies(db.execute(stmt))
+
+
+def _build_record(
+    db: Session,
+    inquiry: Inquiry,
+    generated: GeneratedAnswer,
+    version_no: int,
+    previous: tuple[str, str] | None,
+) -> tuple[AiResponse, str]:
+    """Build the record for ``generated``; also returns the stored body (次の版の差分基準)。"""
+    prompt_digest, body = _split_draft(
+        db, generated.answer_text, load_prompt(settings.base_prompt_path)
+    )
+    record = AiResponse(
+        ai_response_id=str(uuid.uuid4()),
         inquiry_id=inquiry.inquiry_id,
-        ai_answer_draft=generated.answer_text,
+        prompt_digest=prompt_digest,
         evidence_refs=generated.evidence,
         operator_edits={"memo": generated.operator_memo},
         confidence_score=generated.confidence,
-        version_no=len(inquiry.ai_responses) + 1,
+        version_no=version_no,
+        danger_hit_count=danger_hit_count(inquiry.question_text),
     )
-    db.add(ai_response)
-    db.commit()
-    db.refresh(ai_response)
+    _store_body(record, body, previous)
+    record.ai_answer_draft = generated.answer_text
+    return record, body
+
+
+def _needs_previous(version_no: int) -> bool:
+    return version_no > 1 and version_no % DRAFT_KEYFRAME_INTERVAL != 1
+
+
+def _persist(
+    db: Session,
+    inquiry: Inquiry,
+    generated: GeneratedAnswer,
+    version_no: int,
+    previous: tuple[str, str] | None,
+) -> AiResponse:
+    # SessionLocal は expire_on_commit=False のため、commit 後の refresh 往復は不要
+    with span("persist"):
+        ai_response, _ = _build_record(db, inquiry, generated, version_no, previous)
+        db.add(ai_response)
+        db.commit()
     return ai_response
 
 
-def list_ai_responses(db: Session, limit: int = 20) -> list[AiResponse]:
-    return (
-        db.query(AiResponse)
-        .order_by(AiResponse.created_at.desc())
-        .limit(limit)
+def enqueue_ai_generation(db: Session, payload: AiResponseCreate) -> AiResponse:
+    with span("load_inquiry"):
+        inquiry, latest_version, previous = _load_inquiry(db, payload.inquiry_id)
+    generated = _generate(inquiry, payload.prompt_overrides)
+    return _persist(db, inquiry, generated, latest_version + 1, previous)
+
+
+def stream_ai_generation(db: Session, inquiry_id: str) -> Iterator[tuple[str, Any]]:
+    """Yield ``("evidence", refs)``, then ``("token", text)`` chunks, then ``("done", record)``.
+
+    AiResponse はストリームを最後まで消費した時点でのみ保存する。
+    """
+    inquiry, latest_version, previous = _load_inquiry(db, inquiry_id)
+    hits, sections = _gather_context(inquiry)
+    yield "evidence", _evidence_refs(sections)
+
+    chunks: list[str] = []
+    for token in _answer_tokens(inquiry, sections, hits):
+        chunks.append(token)
+        yield "token", token
+
+    generated = _compose_answer(inquiry, sections, hits, answer_body="".join(chunks))
+    yield "done", _persist(db, inquiry, generated, latest_version + 1, previous)
+
+
+def generate_batch(db: Session, inquiry_ids: list[str]) -> list[dict[str, Any]]:
+    """Generate drafts for a chunk of inquiries and commit them together.
+
+    問い合わせ・帳票・既存バージョンはチャンク単位で一括取得し、結果は件ごとのステータスで返す。
+    """
+    inquiries = {
+        inquiry.inquiry_id: inquiry
+        for inquiry in db.query(Inquiry)
+        .options(selectinload(Inquiry.reports))
+        .filter(Inquiry.inquiry_id.in_(inquiry_ids))
+    }
+    versions: dict[str, int] = dict(
+        db.query(AiResponse.inquiry_id, func.max(AiResponse.version_no))
+        .filter(AiResponse.inquiry_id.in_(inquiry_ids))
+        .group_by(AiResponse.inquiry_id)
         .all()
     )
 
+    previous = _latest_drafts(
+        db,
+        {inquiry_id for inquiry_id, version in versions.items() if _needs_previous(version + 1)},
+    )
+
+    results: list[dict[str, Any]] = []
+    for inquiry_id in inquiry_ids:
+        inquiry = inquiries.get(inquiry_id)
+        if inquiry is None:
+            results.append(
+                {"inquiry_id": inquiry_id, "status": "FAILURE", "error": "Inquiry not found"}
+            )
+            continue
+        try:
+            generated = _generate(inquiry)
+        except Exception as exc:  # 1 件の失敗でチャンク全体を落とさない
+            results.append({"inquiry_id": inquiry_id, "status": "FAILURE", "error": str(exc)})
+            continue
+
+        versions[inquiry_id] = versions.get(inquiry_id, 0) + 1
+        record, body = _build_record(
+            db, inquiry, generated, versions[inquiry_id], previous.get(inquiry_id)
+        )
+        db.add(record)
+        previous[inquiry_id] = (record.ai_response_id, body)
+        results.append(
+            {"inquiry_id": inquiry_id, "status": "SUCCESS", "ai_response_id": record.ai_response_id}
+        )
+
+    db.commit()
+    return results
+
+
+def _list_stmt(
+    inquiry_id: str | None, created_from: datetime | None, created_to: datetime | None
+) -> Select:
+    stmt = select(AiResponse).options(
+        load_only(
+            AiResponse.ai_response_id,
+            AiResponse.inquiry_id,
+            AiResponse.version_no,
+            AiResponse.confidence_score,
+            AiResponse.created_at,
+        )
+    )
+    if inquiry_id:
+        stmt = stmt.where(AiResponse.inquiry_id == inquiry_id)
+    if created_from:
+        stmt = stmt.where(AiResponse.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(AiResponse.created_at < created_to)
+    return stmt
+
+
+def list_ai_responses(
+    db: Session,
+    limit: int = 20,
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[AiResponse], str | None]:
+    stmt = _list_stmt(inquiry_id, created_from, created_to)
+    return paginate(db, stmt, AiResponse.created_at, AiResponse.ai_response_id, cursor, limit)
+
+
+async def alist_ai_responses(
+    db: AsyncSession,
+    limit: int = 20,
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[AiResponse], str | None]:
+    stmt = _list_stmt(inquiry_id, created_from, created_to)
+    return await apaginate(
+        db, stmt, AiResponse.created_at, AiResponse.ai_response_id, cursor, limit
+    )
+
 
 def get_ai_response(db: Session, ai_response_id: str) -> AiResponse | None:
-    return db.query(AiResponse).filter_by(ai_response_id=ai_response_id).first()
+    record = db.query(AiResponse).filter_by(ai_response_id=ai_response_id).first()
+    if record is not None:
+        load_drafts(db, [record])
+    return record
+
+
+async def aget_ai_response(db: AsyncSession, ai_response_id: str) -> AiResponse | None:
+    record = await db.get(AiResponse, ai_response_id)
+    if record is not None:
+        await aload_drafts(db, [record])
+    return record
+
+
+def _rebase_dependents(db: Session, record: AiResponse) -> None:
+    """Store versions kept as deltas against ``record`` as keyframes before it is rewritten."""
+    dependents = (
+        db.query(AiResponse)
+        .filter(
+            AiResponse.inquiry_id == record.inquiry_id,
+            AiResponse.delta_base_id == record.ai_response_id,
+        )
+        .all()
+    )
+    if not dependents:
+        return
+    bodies = _draft_bodies(db, dependents)
+    for dependent in dependents:
+        _store_body(dependent, bodies[dependent.ai_response_id], None)
 
 
 def apply_operator_review(db: Session, ai_response_id: str, updates: dict[str, Any]) -> AiResponse:
-    record: AiResponse | None = db.query(AiResponse).filter_by(ai_response_id=ai_response_id).first()
+    record: AiResponse | None = (
+        db.query(AiResponse).filter_by(ai_response_id=ai_response_id).first()
+    )
     if not record:
         raise ValueError("AI response not found")
+    load_drafts(db, [record])
 
     if "ai_answer_draft" in updates and updates["ai_answer_draft"]:
-        record.ai_answer_draft = updates["ai_answer_draft"]
+        draft = updates["ai_answer_draft"]
+        # 置き換え前の下書きとの距離。判定式がそのまま減点に使うため、打ち切らずに厳密値を保存する
+        record.edit_distance = normalized_edit_distance(record.ai_answer_draft, draft)
+        # 修正後の版はキーフレームとして持つ（この版を基準にした差分は先に平文へ戻す）
+        _rebase_dependents(db, record)
+        prompt_text = (
+            _known_prompts(db.info)[record.prompt_digest]
+            if record.prompt_digest
+            else load_prompt(settings.base_prompt_path)
+        )
+        record.prompt_digest, body = _split_draft(db, draft, prompt_text)
+        _store_body(record, body, None)
+        record.ai_answer_draft = draft
     if "operator_edits" in updates and updates["operator_edits"] is not None:
         record.operator_edits = updates["operator_edits"]
     if "confidence_score" in updates and updates["confidence_score"] is not None:
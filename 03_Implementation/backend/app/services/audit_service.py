@@ -1,7 +1,92 @@
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models import FinalResponseLog
+from ..utils.pagination import apaginate, paginate
+
+
+def _list_stmt(
+    inquiry_id: str | None, sent_from: datetime | None, sent_to: datetime | None
+) -> Select:
+    stmt = select(FinalResponseLog)
+    if inquiry_id:
+        stmt = stmt.where(FinalResponseLog.inquiry_id == inquiry_id)
+    if sent_from:
+        stmt = stmt.where(FinalResponseLog.sent_at >= sent_from)
+    if sent_to:
+        stmt = stmt.where(FinalResponseLog.sent_at < sent_to)
+    return stmt
+
+
+def list_final_logs(
+    db: Session,
+    limit: int = 50,
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+) -> tuple[list[FinalResponseLog], str | None]:
+    stmt = _list_stmt(inquiry_id, sent_from, sent_to)
+    return paginate(
+        db, stmt, FinalResponseLog.sent_at, FinalResponseLog.audit_log_id, cursor, limit
+    )
+
+
+async def alist_final_logs(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+) -> tuple[list[FinalResponseLog], str | None]:
+    stmt = _list_stmt(inquiry_id, sent_from, sent_to)
+    return await apaginate(
+        db, stmt, FinalResponseLog.sent_at, FinalResponseLog.audit_log_id, cursor, limit
+    )
+
+
+EXPORT_COLUMNS = (
+    "audit_log_id",
+    "inquiry_id",
+    "channel",
+    "sent_at",
+    "sender_id",
+    "final_response_text",
+    "bo_response_text",
+    "attachments",
+)
+EXPORT_TYPES = {"sent_at": "timestamp"}
+EXPORT_CHUNK_ROWS = 5000
+
+
+def validate_period(sent_from: datetime | None, sent_to: datetime | None) -> None:
+    if sent_from and sent_to and sent_from >= sent_to:
+        raise ValueError("sent_from must be earlier than sent_to")
+
 
+def iter_final_log_chunks(
+    db: Session,
+    inquiry_id: str | None = None,
+    sent_from: datetime | None = None,
+    sent_to: datetime | None = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[Sequence[Sequence[Any]]]:
+    """Yield ``EXPORT_COLUMNS`` rows in (sent_at, audit_log_id) order, ``chunk_rows`` at a time.
 
-def list_final_logs(db: Session, limit: int = 50) -> list[FinalResponseLog]:
-    return db.query(FinalResponseLog).order_by(FinalResponseLog.sent_at.desc()).limit(limit).all()
+    サーバーサイドカーソル（PostgreSQL では名前付きカーソル）で読み出すため、
+    API プロセスが保持するのは 1 チャンク分のみ。
+    """
+    validate_period(sent_from, sent_to)
+    columns = [getattr(FinalResponseLog, name) for name in EXPORT_COLUMNS]
+    stmt = _list_stmt(inquiry_id, sent_from, sent_to).with_only_columns(*columns)
+    stmt = stmt.order_by(FinalResponseLog.sent_at, FinalResponseLog.audit_log_id)
+    result = (
+        db.connection().execution_options(stream_results=True, yield_per=chunk_rows).execute(stmt)
+    )
+    yield from result.partitions()
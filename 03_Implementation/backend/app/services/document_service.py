@@ -1,21 +1,241 @@
+import json
+import os
+from collections.abc import Iterator
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from ..models import ReportMeta
-from ..schemas.document import DocumentIngestRequest
+from ..config import get_settings
+from ..models import ReportContent, ReportMeta
+from ..schemas.document import DocumentIngestRequest, PdfIngestRequest
+from ..utils.draft_cache import draft_cache
+from ..utils.hashing import JsonListDigest, file_digest, json_digest
+from ..utils.pdf_parser import iter_page_batches, resolve_local_path
+from ..utils.rag import build_section_index, index_sections, iter_section_texts, section_texts
+from ..utils.section_store import section_store_exists, write_section_store
+from ..utils.vector_store import build_vector_index, vector_index_exists
+
+settings = get_settings()
+
+
+def ensure_stores(content: ReportContent) -> None:
+    """Rebuild the section store / vector index files of ``content`` if they are missing.
+
+    ファイルは全ノード共有のボリュームに置くが、マイグレーションで移した行やボリュームを
+    作り直した環境では存在しないため、DB の JSON から作り直す（存在すれば何もしない）。
+    """
+    digest = content.content_digest
+    has_store = section_store_exists(digest)
+    has_vectors = (
+        not settings.enable_vector_store
+        or content.section_count == 0
+        or vector_index_exists(digest)
+    )
+    if has_store and has_vectors:
+        return
+    structured = content.report_structured_json
+    if not has_store:
+        index = content.section_index or build_section_index(structured)
+        write_section_store(digest, structured.get("sections", []), index)
+    if not has_vectors:
+        build_vector_index(digest, section_texts(structured))
+
+
+def rebuild_stores(db: Session, content_digest: str) -> bool:
+    """Worker side of :func:`ensure_stores`; returns ``False`` if the content no longer exists."""
+    content = db.get(ReportContent, content_digest)
+    if content is None:
+        return False
+    ensure_stores(content)
+    return True
+
+
+def _existing_content(db: Session, digest: str, source_digest: str | None) -> ReportContent | None:
+    content = db.get(ReportContent, digest)
+    if content is not None:
+        if source_digest and content.source_digest is None:
+            content.source_digest = source_digest
+        ensure_stores(content)
+    return content
+
+
+def _add_content(db: Session, content: ReportContent) -> ReportContent:
+    """Insert ``content``; 並行取込で同じ内容が競合した場合は既存行を使う。"""
+    try:
+        with db.begin_nested():
+            db.add(content)
+    except IntegrityError:
+        content = db.get(ReportContent, content.content_digest)
+    return content
+
+
+def _store_content(
+    db: Session, structured: dict, source_digest: str | None = None
+) -> ReportContent:
+    """Return the ReportContent for ``structured``, building index/stores only if it is new.
+
+    同一内容の帳票は問い合わせをまたいで 1 件だけ保存し、索引・セクションストア・
+    ベクトル索引の構築も初回のみ行う（ファイルが失われていれば作り直す）。
+    """
+    digest = json_digest(structured)
+    content = _existing_content(db, digest, source_digest)
+    if content is not None:
+        return content
+
+    sections = structured.get("sections", [])
+    index = index_sections(sections)
+    write_section_store(digest, sections, index)
+    build_vector_index(digest, section_texts(structured))
+    return _add_content(
+        db,
+        ReportContent(
+            content_digest=digest,
+            source_digest=source_digest,
+            report_structured_json=structured,
+            section_index=index,
+            section_count=len(sections),
+        ),
+    )
 
 
 def ingest_report(db: Session, payload: DocumentIngestRequest) -> ReportMeta:
+    content = _store_content(db, payload.report_structured_json)
+    report = ReportMeta(
+        inquiry_id=payload.inquiry_id,
+        report_type=payload.report_type,
+        report_file_uri=payload.report_file_uri,
+        content=content,
+    )
+    db.add(report)
+    db.commit()
+    # 同じ帳票 URI を元にした回答案キャッシュは再取込で無効化する
+    draft_cache.invalidate_tag(report.report_file_uri)
+    return report
+
+
+def register_pdf_report(db: Session, payload: PdfIngestRequest) -> ReportMeta:
+    """Create a ReportMeta for a PDF; pending unless the same file was parsed before."""
+    path = resolve_local_path(payload.report_file_uri)
+    source_digest = file_digest(path)
+    content = db.query(ReportContent).filter_by(source_digest=source_digest).first()
     report = ReportMeta(
         inquiry_id=payload.inquiry_id,
         report_type=payload.report_type,
         report_file_uri=payload.report_file_uri,
-        report_structured_json=payload.report_structured_json,
+        content=content,
+        ingest_status="ready" if content is not None else "pending",
     )
     db.add(report)
     db.commit()
-    db.refresh(report)
     return report
 
 
+def _spool_path(report_meta_id: str) -> str:
+    return os.path.join(settings.section_store_path, "staging", f"{report_meta_id}.jsonl")
+
+
+def _iter_spool(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def _store_spooled_content(
+    db: Session, spool: str, page_count: int, source_digest: str
+) -> ReportContent:
+    """Same as :func:`_store_content` for ``{"sections": <spool>, "page_count": ...}``.
+
+    ハッシュと BM25 索引は 1 回の走査で求め、既存の内容なら構築を省く。新規の場合も
+    セクションストア・ベクトル索引はスプールから逐次書き出す。
+    """
+    digest = JsonListDigest({"page_count": page_count}, "sections")
+
+    def hashed_sections() -> Iterator[dict]:
+        for section in _iter_spool(spool):
+            digest.add(section)
+            yield section
+
+    index = index_sections(hashed_sections())
+    content = _existing_content(db, digest.hexdigest(), source_digest)
+    if content is not None:
+        return content
+
+    write_section_store(digest.hexdigest(), _iter_spool(spool), index)
+    build_vector_index(
+        digest.hexdigest(), iter_section_texts(_iter_spool(spool)), count=digest.count
+    )
+    # report_structured_json は 1 列の JSON のため、挿入時だけは全セクションを読み込む
+    structured = {"sections": list(_iter_spool(spool)), "page_count": page_count}
+    return _add_content(
+        db,
+        ReportContent(
+            content_digest=digest.hexdigest(),
+            source_digest=source_digest,
+            report_structured_json=structured,
+            section_index=index,
+            section_count=digest.count,
+        ),
+    )
+
+
+def parse_pdf_report(db: Session, report_meta_id: str) -> ReportMeta:
+    """Parse the PDF page batch by page batch, spooling sections to a per-report file.
+
+    抽出したセクションはバッチごとにスプール（`{section_store_path}/staging/` の JSON Lines）へ
+    追記し、DB には進捗（`parsed_pages` / `section_count`）のみ保存する。書き込み量はページ数に
+    比例する。完了時にスプールから ReportContent を作り、索引類は内容ごとに一度だけ作る
+    （:func:`_store_spooled_content`）。
+    """
+    report = db.get(ReportMeta, report_meta_id)
+    if report is None:
+        raise ValueError("Report not found")
+    if report.ingest_status == "ready":
+        return report
+
+    report.ingest_status = "parsing"
+    report.ingest_error = None
+    db.commit()
+
+    spool = _spool_path(report_meta_id)
+    try:
+        path = resolve_local_path(report.report_file_uri)
+        source_digest = file_digest(path)
+        os.makedirs(os.path.dirname(spool), exist_ok=True)
+        section_count = page_count = 0
+        # 再試行時は先頭から解析し直すため、スプールも作り直す
+        with open(spool, "w", encoding="utf-8") as handle:
+            for pages_done, batch in iter_page_batches(
+                path, settings.worker.pdf_batch_pages, settings.worker.pdf_process_workers
+            ):
+                for section in batch:
+                    handle.write(json.dumps(section, ensure_ascii=False) + "\n")
+                handle.flush()
+                section_count += len(batch)
+                page_count = pages_done
+                report.staging_json = {"parsed_pages": pages_done, "section_count": section_count}
+                db.commit()
+
+        report.content = _store_spooled_content(db, spool, page_count, source_digest)
+        report.staging_json = None
+        report.ingest_status = "ready"
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        report.ingest_status = "failed"
+        report.ingest_error = str(exc)[:1000]
+        db.commit()
+        raise
+    finally:
+        if os.path.exists(spool):
+            os.remove(spool)
+
+    draft_cache.invalidate_tag(report.report_file_uri)
+    return report
+
+
+def get_report(db: Session, report_meta_id: str) -> ReportMeta | None:
+    return db.get(ReportMeta, report_meta_id)
+
+
 def list_reports(db: Session, inquiry_id: str) -> list[ReportMeta]:
     return db.query(ReportMeta).filter_by(inquiry_id=inquiry_id).all()
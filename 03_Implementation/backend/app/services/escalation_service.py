@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models import Escalation
@@ -32,3 +34,11 @@ def update_escalation(db: Session, escalation_id: str, payload: EscalationUpdate
     db.commit()
     db.refresh(escalation)
     return escalation
+
+
+def get_escalation_for_inquiry(db: Session, inquiry_id: str) -> Escalation | None:
+    return db.query(Escalation).filter_by(inquiry_id=inquiry_id).first()
+
+
+async def aget_escalation_for_inquiry(db: AsyncSession, inquiry_id: str) -> Escalation | None:
+    return await db.scalar(select(Escalation).where(Escalation.inquiry_id == inquiry_id))
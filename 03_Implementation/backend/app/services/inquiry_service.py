@@ -1,7 +1,13 @@
-from sqlalchemy.orm import Session
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
 from ..models import Inquiry
 from ..schemas import InquiryCreate
+from ..utils.pagination import apaginate, paginate
 
 
 def create_inquiry(db: Session, payload: InquiryCreate) -> Inquiry:
@@ -19,9 +25,73 @@ def create_inquiry(db: Session, payload: InquiryCreate) -> Inquiry:
     return inquiry
 
 
-def list_inquiries(db: Session) -> list[Inquiry]:
-    return db.query(Inquiry).order_by(Inquiry.created_at.desc()).all()
+def create_inquiries_bulk(db: Session, payloads: list[InquiryCreate]) -> list[str]:
+    """Insert all rows in one transaction via executemany (insertmanyvalues)。"""
+    created_at = datetime.utcnow()
+    rows = [
+        {
+            "inquiry_id": str(uuid.uuid4()),
+            "created_at": created_at,
+            **payload.model_dump(),
+        }
+        for payload in payloads
+    ]
+    db.execute(insert(Inquiry), rows)
+    db.commit()
+    return [row["inquiry_id"] for row in rows]
+
+
+def _list_stmt(
+    category: str | None,
+    customer_id: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> Select:
+    stmt = select(Inquiry).options(
+        load_only(
+            Inquiry.inquiry_id, Inquiry.customer_id, Inquiry.inquiry_category, Inquiry.created_at
+        )
+    )
+    if category:
+        stmt = stmt.where(Inquiry.inquiry_category == category)
+    if customer_id:
+        stmt = stmt.where(Inquiry.customer_id == customer_id)
+    if created_from:
+        stmt = stmt.where(Inquiry.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(Inquiry.created_at < created_to)
+    return stmt
+
+
+def list_inquiries(
+    db: Session,
+    limit: int = 50,
+    cursor: str | None = None,
+    category: str | None = None,
+    customer_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[Inquiry], str | None]:
+    stmt = _list_stmt(category, customer_id, created_from, created_to)
+    return paginate(db, stmt, Inquiry.created_at, Inquiry.inquiry_id, cursor, limit)
+
+
+async def alist_inquiries(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+    category: str | None = None,
+    customer_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[Inquiry], str | None]:
+    stmt = _list_stmt(category, customer_id, created_from, created_to)
+    return await apaginate(db, stmt, Inquiry.created_at, Inquiry.inquiry_id, cursor, limit)
 
 
 def get_inquiry(db: Session, inquiry_id: str) -> Inquiry | None:
     return db.query(Inquiry).filter_by(inquiry_id=inquiry_id).first()
+
+
+async def aget_inquiry(db: AsyncSession, inquiry_id: str) -> Inquiry | None:
+    return await db.get(Inquiry, inquiry_id)
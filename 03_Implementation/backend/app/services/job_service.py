@@ -0,0 +1,135 @@
+"""Celery ジョブの投入と状態照会 (F-003〜F-005 の非同期実行)。"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from types import ModuleType
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Inquiry
+from ..schemas.ai import (
+    AiBatchCreate,
+    AiBatchItem,
+    AiBatchJob,
+    AiGenerationJob,
+    AiResponseCreate,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 同じ帳票への再構築依頼は、この秒数のあいだプロセスごとに 1 回だけ投入する
+STORE_REBUILD_INTERVAL = 300.0
+_store_rebuilds: dict[str, float] = {}
+_store_rebuild_lock = threading.Lock()
+
+
+def _tasks() -> ModuleType:
+    # Celery は初回のジョブ投入・照会時に読み込み、API プロセスの起動を軽くする
+    from ..workers import tasks
+
+    return tasks
+
+
+def dispatch_ai_generation(db: Session, payload: AiResponseCreate) -> AiGenerationJob:
+    exists = db.query(Inquiry.inquiry_id).filter_by(inquiry_id=payload.inquiry_id).first()
+    if exists is None:
+        raise ValueError("Inquiry not found")
+
+    result = _tasks().generate_response.apply_async(
+        args=[payload.model_dump()],
+        queue=settings.worker.default_queue,
+    )
+    return AiGenerationJob(job_id=result.id, status=result.status)
+
+
+def dispatch_pdf_ingest(report_meta_id: str) -> str:
+    # PDF 解析はメモリ・CPU を多く使うため専用キュー（pdf ワーカー）に流す
+    result = _tasks().parse_pdf_task.apply_async(
+        args=[report_meta_id], queue=settings.worker.pdf_queue
+    )
+    return result.id
+
+
+def dispatch_store_rebuild(content_digest: str) -> str | None:
+    """Queue a rebuild of the report's section store / vector index (best effort).
+
+    回答生成のリクエスト内では作り直さず、PDF ワーカーに任せる。投入済みなら ``None``。
+    ブローカーに接続できない場合も生成は続けられるよう、警告のみとする。
+    """
+    now = time.monotonic()
+    with _store_rebuild_lock:
+        for digest, queued_at in list(_store_rebuilds.items()):
+            if now - queued_at >= STORE_REBUILD_INTERVAL:
+                del _store_rebuilds[digest]
+        if content_digest in _store_rebuilds:
+            return None
+        _store_rebuilds[content_digest] = now
+    try:
+        # 生成リクエストを待たせないよう、ブローカー接続は再試行しない
+        result = _tasks().rebuild_stores_task.apply_async(
+            args=[content_digest], queue=settings.worker.pdf_queue, retry=False
+        )
+    except Exception as exc:
+        logger.warning("could not queue store rebuild for %s: %s", content_digest, exc)
+        return None
+    return result.id
+
+
+def get_generation_job(job_id: str) -> AiGenerationJob:
+    from celery.result import AsyncResult
+
+    result = AsyncResult(job_id, app=_tasks().celery_app)
+    job = AiGenerationJob(job_id=job_id, status=result.status)
+    if result.successful():
+        job.ai_response_id = result.result
+    elif result.failed():
+        job.error = str(result.result)
+    return job
+
+
+def dispatch_batch_generation(payload: AiBatchCreate) -> AiBatchJob:
+    inquiry_ids = list(dict.fromkeys(payload.inquiry_ids))
+    chunks = [
+        inquiry_ids[start : start + payload.chunk_size]
+        for start in range(0, len(inquiry_ids), payload.chunk_size)
+    ]
+    from celery import group
+
+    generate_batch_task = _tasks().generate_batch_task
+    result = group(
+        generate_batch_task.s(chunk).set(queue=settings.worker.default_queue) for chunk in chunks
+    ).apply_async()
+    result.save()
+    return AiBatchJob(batch_id=result.id, status="PENDING", total_chunks=len(chunks))
+
+
+def get_batch_job(batch_id: str) -> AiBatchJob | None:
+    from celery.result import GroupResult
+
+    result = GroupResult.restore(batch_id, app=_tasks().celery_app)
+    if result is None:
+        return None
+
+    job = AiBatchJob(batch_id=batch_id, status="PENDING", total_chunks=len(result.results))
+    for child in result.results:
+        if child.successful():
+            job.completed_chunks += 1
+            job.items.extend(AiBatchItem(**item) for item in child.result)
+        elif child.failed():
+            job.completed_chunks += 1
+            inquiry_ids = (child.args or [[]])[0]
+            job.items.extend(
+                AiBatchItem(inquiry_id=inquiry_id, status="FAILURE", error=str(child.result))
+                for inquiry_id in inquiry_ids
+            )
+
+    if job.completed_chunks == job.total_chunks:
+        job.status = "SUCCESS"
+    elif job.completed_chunks or any(child.status == "STARTED" for child in result.results):
+        job.status = "STARTED"
+    return job
@@ -0,0 +1,191 @@
+"""判定サポート (F-007) の一括実行。"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import Float, Select, case, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import AiResponse, Escalation, Inquiry
+from ..schemas.workflow import (
+    TriageBatchRequest,
+    TriageBatchResult,
+    TriageBatchResultItem,
+    TriageSimulationRequest,
+    TriageSimulationResult,
+)
+from ..utils.danger_words import DangerWordMatcher, find_danger_words, load_danger_words
+from ..utils.hashing import text_digest
+from ..workflows.simulation import CHUNK_ROWS, ThresholdSimulator
+from ..workflows.triage import (
+    RATIONALE_ESCALATE,
+    RATIONALE_PASS,
+    TriageRuleConfig,
+    evaluate_batch,
+)
+
+settings = get_settings()
+
+_HIT_CACHE_SIZE = 10000
+_hit_counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+_hit_lock = threading.Lock()
+
+
+def danger_hit_count(question_text: str, dictionary: DangerWordMatcher | None = None) -> int:
+    """Distinct danger words in the question, cached per (辞書, 質問文)."""
+    dictionary = dictionary or load_danger_words(settings.danger_words_path)
+    key = (dictionary.fingerprint, text_digest(question_text))
+    with _hit_lock:
+        cached = _hit_counts.get(key)
+        if cached is not None:
+            _hit_counts.move_to_end(key)
+            return cached
+    count = len({match.word for match in find_danger_words(question_text, dictionary)})
+    with _hit_lock:
+        _hit_counts[key] = count
+        if len(_hit_counts) > _HIT_CACHE_SIZE:
+            _hit_counts.popitem(last=False)
+    return count
+
+
+def triage_batch(db: Session, payload: TriageBatchRequest) -> TriageBatchResult:
+    """Score every item with one query and one vectorised evaluation."""
+    ids = list(dict.fromkeys(item.ai_response_id for item in payload.items))
+    rows = {
+        row.ai_response_id: row
+        for row in db.execute(
+            select(
+                AiResponse.ai_response_id,
+                AiResponse.inquiry_id,
+                AiResponse.confidence_score,
+                AiResponse.edit_distance,
+                Inquiry.question_text,
+            )
+            .join(Inquiry, Inquiry.inquiry_id == AiResponse.inquiry_id)
+            .where(AiResponse.ai_response_id.in_(ids))
+        )
+    }
+    items = [item for item in payload.items if item.ai_response_id in rows]
+    missing = [ai_response_id for ai_response_id in ids if ai_response_id not in rows]
+    if not items:
+        return TriageBatchResult(results=[], missing=missing)
+
+    dictionary = load_danger_words(settings.danger_words_path)
+    hits_by_inquiry: dict[str, int] = {}
+    for row in rows.values():
+        if row.inquiry_id not in hits_by_inquiry:
+            hits_by_inquiry[row.inquiry_id] = danger_hit_count(row.question_text, dictionary)
+
+    matched = [rows[item.ai_response_id] for item in items]
+    hits = np.array([hits_by_inquiry[row.inquiry_id] for row in matched], dtype=np.float64)
+    config = TriageRuleConfig(**payload.rules.model_dump()) if payload.rules else None
+    escalate, scores = evaluate_batch(
+        np.array([float(row.confidence_score) for row in matched], dtype=np.float64),
+        np.array(
+            [
+                item.edit_distance if item.edit_distance is not None else row.edit_distance or 0.0
+                for item, row in zip(items, matched, strict=True)
+            ],
+            dtype=np.float64,
+        ),
+        np.array([item.operator_confidence for item in items], dtype=np.float64),
+        hits,
+        config,
+    )
+
+    # 判定入力を記録（executemany 1 回）。同一 ID が複数あれば後勝ち
+    recorded = {
+        row.ai_response_id: {
+            "ai_response_id": row.ai_response_id,
+            "operator_confidence": item.operator_confidence,
+            "danger_hit_count": int(hit),
+        }
+        for item, row, hit in zip(items, matched, hits, strict=True)
+    }
+    db.execute(update(AiResponse), list(recorded.values()))
+    db.commit()
+
+    results = [
+        TriageBatchResultItem(
+            ai_response_id=row.ai_response_id,
+            inquiry_id=row.inquiry_id,
+            danger_hits=int(hit),
+            should_escalate=bool(flag),
+            rationale=RATIONALE_ESCALATE if flag else RATIONALE_PASS,
+            recommended_channel="backoffice" if flag else "operator",
+            confidence=float(score),
+        )
+        for row, hit, flag, score in zip(matched, hits, escalate, scores, strict=True)
+    ]
+    return TriageBatchResult(results=results, missing=missing)
+
+
+def _simulation_stmt(payload: TriageSimulationRequest) -> Select:
+    stmt = (
+        select(
+            cast(AiResponse.confidence_score, Float),
+            func.coalesce(AiResponse.edit_distance, 0.0),
+            func.coalesce(AiResponse.operator_confidence, payload.default_operator_confidence),
+            AiResponse.danger_hit_count,
+            # ヒット数が未記録（機能追加前の行）の場合のみ質問文を転送して都度数える
+            case((AiResponse.danger_hit_count.is_(None), Inquiry.question_text)),
+            func.coalesce(Escalation.escalation_flag, False),
+        )
+        .join(Inquiry, Inquiry.inquiry_id == AiResponse.inquiry_id)
+        .outerjoin(Escalation, Escalation.inquiry_id == AiResponse.inquiry_id)
+    )
+    if payload.latest_only:
+        latest = (
+            select(AiResponse.inquiry_id, func.max(AiResponse.version_no).label("version_no"))
+            .group_by(AiResponse.inquiry_id)
+            .subquery()
+        )
+        stmt = stmt.join(
+            latest,
+            (latest.c.inquiry_id == AiResponse.inquiry_id)
+            & (latest.c.version_no == AiResponse.version_no),
+        )
+    if payload.created_from:
+        stmt = stmt.where(AiResponse.created_at >= payload.created_from)
+    if payload.created_to:
+        stmt = stmt.where(AiResponse.created_at < payload.created_to)
+    return stmt
+
+
+def simulate_thresholds(db: Session, payload: TriageSimulationRequest) -> TriageSimulationResult:
+    """Replay triage over history for every candidate config.
+
+    行はサーバーサイドカーソル（ORM を介さない Core 実行）でチャンク単位に受け取る。
+    max_edit_distance は判定式に現れないため候補軸に含めない。
+    """
+    simulator = ThresholdSimulator(payload.min_confidence, payload.danger_penalty)
+    dictionary = load_danger_words(settings.danger_words_path)
+    result = (
+        db.connection()
+        .execution_options(stream_results=True, yield_per=CHUNK_ROWS)
+        .execute(_simulation_stmt(payload))
+    )
+    for chunk in result.partitions():
+        confidence, edit_distance, operator_confidence, hit_count, question, escalated = zip(
+            *chunk, strict=True
+        )
+        hits = [
+            count if count is not None else danger_hit_count(text or "", dictionary)
+            for count, text in zip(hit_count, question, strict=True)
+        ]
+        simulator.update(
+            np.array(confidence, dtype=np.float64),
+            np.array(edit_distance, dtype=np.float64),
+            np.array(operator_confidence, dtype=np.float64),
+            np.array(hits, dtype=np.float64),
+            np.array(escalated, dtype=bool),
+        )
+    return TriageSimulationResult(
+        rows=simulator.rows,
+        actual_escalation_rate=simulator.actual / simulator.rows if simulator.rows else 0.0,
+        results=simulator.results(),
+    )
@@ -1,18 +1,149 @@
+"""危険語検知 (F-005)。
+
+辞書は Aho–Corasick オートマトンに一括コンパイルし、本文長に比例する 1 パスで全語を検出する。
+コンパイル結果はファイルの mtime/size 単位でキャッシュし、辞書の差し替えは再起動なしで反映される。
+照合は NFKC + 小文字化した文字列上で行い（全角/半角カナ・英数の揺れを吸収）、
+ヒット位置は元テキスト上のオフセットで返す。
+"""
+
 from __future__ import annotations
 
-from functools import lru_cache
+import unicodedata
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from ..config import get_settings
+from .hashing import text_digest
+from .resource_cache import ResourceCache
+
+_VOICED_MARKS = ("\u3099", "\u309a")
+
+
+@dataclass(frozen=True)
+class DangerWordMatch:
+    word: str
+    start: int
+    end: int
+
+
+def _normalize_with_offsets(text: str) -> tuple[str, list[int], list[int]]:
+    """Normalize per character, keeping the original [start, end) span of each output char."""
+    chars: list[str] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    for index, char in enumerate(text):
+        normalized = unicodedata.normalize("NFKC", char).lower()
+        if normalized in _VOICED_MARKS and chars:
+            # 半角カナの濁点・半濁点（ｶﾞ）は直前の文字と合成する
+            composed = unicodedata.normalize("NFC", chars[-1] + normalized)
+            if len(composed) == 1:
+                chars[-1] = composed
+                ends[-1] = index + 1
+                continue
+        for out in normalized:
+            chars.append(out)
+            starts.append(index)
+            ends.append(index + 1)
+    return "".join(chars), starts, ends
+
+
+def normalize_word(word: str) -> str:
+    return _normalize_with_offsets(word)[0]
+
+
+class DangerWordMatcher:
+    """Multi-pattern matcher over a danger-word dictionary."""
+
+    def __init__(self, words: Iterable[str]):
+        self.words: frozenset[str] = frozenset(word for word in words if word)
+        self.fingerprint = text_digest("\n".join(sorted(self.words)))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self._patterns: list[tuple[str, int]] = []
+        for word in sorted(self.words):
+            key = normalize_word(word)
+            if key:
+                self._add(key, word)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def _add(self, key: str, word: str) -> None:
+        state = 0
+        for char in key:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (len(self._patterns),)
+        self._patterns.append((word, len(key)))
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def finditer(self, text: str) -> list[DangerWordMatch]:
+        if not self._patterns or not text:
+            return []
+        normalized, starts, ends = _normalize_with_offsets(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: list[DangerWordMatch] = []
+        state = 0
+        for position, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in out[state]:
+                word, length = self._patterns[pattern_id]
+                matches.append(DangerWordMatch(word, starts[position - length + 1], ends[position]))
+        return matches
+
+
+def _compile(path: str) -> DangerWordMatcher:
+    with open(path, encoding="utf-8") as handle:
+        return DangerWordMatcher(line.strip() for line in handle if line.strip())
+
+
+_dictionaries: ResourceCache[DangerWordMatcher] = ResourceCache(
+    "danger_words",
+    _compile,
+    missing=lambda _path: DangerWordMatcher(()),
+    check_interval=lambda: get_settings().resource_check_interval,
+)
+
+
+def load_danger_words(path: str) -> DangerWordMatcher:
+    return _dictionaries.get(path)
 
 
-@lru_cache
-def load_danger_words(path: str) -> set[str]:
-    try:
-        with open(path, "r", encoding="utf-8") as handle:
-            return {line.strip() for line in handle if line.strip()}
-    except FileNotFoundError:
-        return set()
+def find_danger_words(
+    text: str, dictionary: DangerWordMatcher | Iterable[str]
+) -> list[DangerWordMatch]:
+    """Return every hit with its offsets in ``text`` (for highlighting)."""
+    matcher = (
+        dictionary if isinstance(dictionary, DangerWordMatcher) else DangerWordMatcher(dictionary)
+    )
+    return matcher.finditer(text)
 
 
-def detect_danger_words(text: str, dictionary: set[str]) -> list[str]:
-    lowered = text.lower()
-    hits = [word for word in dictionary if word.lower() in lowered]
-    return sorted(hits)
+def detect_danger_words(text: str, dictionary: DangerWordMatcher | Iterable[str]) -> list[str]:
+    return sorted({match.word for match in find_danger_words(text, dictionary)})
@@ -0,0 +1,169 @@
+"""Content-addressed cache for generated AI drafts.
+
+同一の質問・帳票内容・プロンプト・モデル設定に対する回答案は再生成せずに再利用する。
+プロセス内 LRU を前段に置き、Redis（`settings.redis_url`）をプロセス間共有の後段とする。
+Redis に接続できない間は一定時間バックオフし、ローカル LRU のみで動作する。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from ..config import get_settings
+from .hashing import json_digest
+from .tokenizer import normalize
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACE = "draftcache"
+_REDIS_RETRY_SECONDS = 30.0
+_CLEAR_BATCH = 500
+
+
+def draft_key(
+    question: str,
+    category: str,
+    report_digests: list[str],
+    base_prompt: str,
+    danger_fingerprint: str,
+    overrides: dict[str, Any] | None = None,
+) -> str:
+    settings = get_settings()
+    return json_digest(
+        {
+            "question": " ".join(normalize(question).split()),
+            "category": category,
+            "reports": sorted(report_digests),
+            "prompt": base_prompt,
+            "danger_words": danger_fingerprint,
+            "model": settings.ai_provider.model_dump(),
+            "retrieval": settings.vector.model_dump() if settings.enable_vector_store else None,
+            "overrides": overrides or {},
+        }
+    )
+
+
+class DraftCache:
+    def __init__(self) -> None:
+        self._local: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # tag -> keys と key -> tags。ローカルから消えたキーは両方から外し、タグ表を肥大させない
+        self._tags: dict[str, set[str]] = {}
+        self._key_tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+
+    # --- Redis -----------------------------------------------------------------
+    def _client(self):
+        settings = get_settings().draft_cache
+        if not settings.redis_enabled or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(
+                str(get_settings().redis_url), socket_timeout=0.2, socket_connect_timeout=0.2
+            )
+        return self._redis
+
+    def _redis_failed(self, method: str, exc: Exception) -> None:
+        logger.warning("draft cache redis %s failed: %s", method, exc)
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+
+    def _redis_call(self, method: str, *args: Any) -> Any:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            return getattr(client, method)(*args)
+        except Exception as exc:  # Redis 障害時は生成処理を止めない
+            self._redis_failed(method, exc)
+            return None
+
+    # --- local LRU (呼び出し側で self._lock を保持する) -------------------------
+    def _drop_local(self, key: str) -> None:
+        self._local.pop(key, None)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    # --- public API ------------------------------------------------------------
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local.move_to_end(key)
+                    return entry[1]
+                self._drop_local(key)
+
+        raw = self._redis_call("get", f"{_NAMESPACE}:{key}")
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self._store_local(key, value)
+        return value
+
+    def set(self, key: str, value: dict[str, Any], tags: list[str]) -> None:
+        ttl = get_settings().draft_cache.ttl_seconds
+        self._store_local(key, value, tags)
+        self._redis_call("set", f"{_NAMESPACE}:{key}", json.dumps(value, ensure_ascii=False), ttl)
+        for tag in tags:
+            self._redis_call("sadd", f"{_NAMESPACE}:tag:{tag}", key)
+            self._redis_call("expire", f"{_NAMESPACE}:tag:{tag}", ttl)
+
+    def _store_local(self, key: str, value: dict[str, Any], tags: Iterable[str] = ()) -> None:
+        settings = get_settings().draft_cache
+        with self._lock:
+            self._local[key] = (time.monotonic() + settings.ttl_seconds, value)
+            self._local.move_to_end(key)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+                self._key_tags.setdefault(key, set()).add(tag)
+            while len(self._local) > settings.local_max_entries:
+                self._drop_local(next(iter(self._local)))
+
+    def invalidate_tag(self, tag: str) -> None:
+        """Drop every draft generated from a report tagged ``tag`` (帳票の再取込時)。"""
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._drop_local(key)
+        keys = self._redis_call("smembers", f"{_NAMESPACE}:tag:{tag}") or set()
+        for key in keys:
+            key = key.decode() if isinstance(key, bytes) else key
+            self._redis_call("delete", f"{_NAMESPACE}:{key}")
+        self._redis_call("delete", f"{_NAMESPACE}:tag:{tag}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+        client = self._client()
+        if client is None:
+            return
+        # KEYS はキー空間全体を走査する間 Redis を止めるため、SCAN で少しずつ削除する
+        try:
+            batch: list[bytes] = []
+            for name in client.scan_iter(match=f"{_NAMESPACE}:*", count=_CLEAR_BATCH):
+                batch.append(name)
+                if len(batch) >= _CLEAR_BATCH:
+                    client.delete(*batch)
+                    batch.clear()
+            if batch:
+                client.delete(*batch)
+        except Exception as exc:
+            self._redis_failed("scan", exc)
+
+
+draft_cache = DraftCache()
@@ -0,0 +1,132 @@
+"""Normalized Levenshtein distance for operator edits (F-007 の判定材料)。
+
+Myers (1999) / Hyyrö (2001, 2003) のビット並列アルゴリズム（ビット列は Python の多倍長整数）。
+
+* 共通の先頭・末尾は先に取り除く（オペレーター修正は局所的なことが多い）。
+* 対角帯 |i - j| <= k のみを計算する帯版を k = 64 から広げながら試し、距離が k 以下なら確定。
+  ビット列の幅は 2k+1 で済むため、修正量が少ない長文ほど速い。
+* `max_distance` を超えることが確定した時点で打ち切り、``max_distance + 1`` 以上の下限値を返す。
+"""
+
+from __future__ import annotations
+
+_MIN_BAND = 64
+
+
+def _trim(a: str, b: str) -> tuple[str, str]:
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    limit -= start
+    while end < limit and a[-1 - end] == b[-1 - end]:
+        end += 1
+    return a[start : len(a) - end], b[start : len(b) - end]
+
+
+def _peq(a: str) -> dict[str, int]:
+    peq: dict[str, int] = {}
+    for index, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << index)
+    return peq
+
+
+def _full(a: str, b: str, peq: dict[str, int], max_distance: int | None) -> int:
+    """Unbanded Myers over all rows of ``a``; exact unless the cut-off fires."""
+    m, n = len(a), len(b)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    remaining = n
+    for char in b:
+        remaining -= 1
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # 残り列で減らせるのは 1 列あたり最大 1 なので、score - remaining が下限
+        if max_distance is not None and score - remaining > max_distance:
+            return score - remaining
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def _banded(a: str, b: str, peq: dict[str, int], k: int) -> tuple[int, int]:
+    """``(distance, columns scanned)``; the distance is exact if ``<= k``, otherwise ``k + 1``.
+
+    列 c のビット r は行 c - k + r に対応する（列ごとに 1 行ずつ下へずらす）。
+    帯の外側は「差分 +1」とみなすため帯内の値は真値以上になり、真値が k 以下のセルでは一致する。
+    行 0 より上は一致しない仮想行（D[i][c] = c + |i|）として扱う。
+    (m, n) を通る対角線 d = n - m 上の値は単調非減少なので、それが k を超えたら打ち切る。
+    """
+    m, n = len(a), len(b)
+    width = 2 * k + 1
+    mask = (1 << width) - 1
+    bottom = 1 << (width - 1)
+    # 列 0: 行 -k..0 は差分 -1、行 1..k は +1
+    mv = (1 << (k + 1)) - 1
+    pv = mask & ~mv
+    diag = k - (n - m)
+    score = n - m
+    for column, char in enumerate(b, start=1):
+        pv = (pv >> 1) | bottom
+        mv >>= 1
+        shift = column - k - 1
+        eq = peq.get(char, 0)
+        eq = (eq >> shift if shift >= 0 else eq << -shift) & mask
+        score += ((pv >> diag) & 1) - ((mv >> diag) & 1)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        score += ((ph >> diag) & 1) - ((mh >> diag) & 1)
+        if score > k:
+            return k + 1, column
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score, n
+
+
+def levenshtein(a: str, b: str, max_distance: int | None = None) -> int:
+    """Edit distance; above ``max_distance`` a lower bound ``> max_distance`` is returned."""
+    a, b = _trim(a, b)
+    if len(a) > len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    if m == 0:
+        return n
+    if max_distance is not None and n - m > max_distance:
+        return n - m
+
+    peq = _peq(a)
+    band = max(n - m, _MIN_BAND)
+    while True:
+        if max_distance is not None:
+            band = min(band, max_distance)
+        if 2 * band + 1 >= m:
+            return _full(a, b, peq, max_distance)
+        distance, scanned = _banded(a, b, peq, band)
+        if distance <= band or (max_distance is not None and band >= max_distance):
+            return distance
+        # 打ち切り位置から最終距離を外挿し、帯幅の倍々による再計算回数を減らす
+        band = max(band * 2, band * n * 5 // (scanned * 4))
+
+
+def normalized_edit_distance(a: str, b: str, max_ratio: float | None = None) -> float:
+    """``levenshtein / max(len)`` in ``[0, 1]``; above ``max_ratio`` the value is a lower bound."""
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 0.0
+    max_distance = None if max_ratio is None else int(max_ratio * longest)
+    return min(levenshtein(a, b, max_distance) / longest, 1.0)
@@ -0,0 +1,106 @@
+"""Streaming CSV / Parquet encoders for bulk exports.
+
+どちらも行のチャンク（`Result.partitions()` の 1 要素）を受け取るたびにエンコード済みの
+バイト列を返すため、出力全体をメモリに載せない。Parquet は pyarrow（任意依存）が必要。
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+EXPORT_FORMATS = ("csv", "parquet")
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _json_cell(value: Any) -> Any:
+    if isinstance(value, dict | list):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return _json_cell(value)
+
+
+def iter_csv(columns: Sequence[str], chunks: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """Yield a header (with BOM so Excel detects UTF-8), then one encoded block per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows([_csv_cell(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def iter_parquet(
+    columns: Sequence[str],
+    types: dict[str, str],
+    chunks: Iterable[Sequence[Sequence[Any]]],
+) -> Iterator[bytes]:
+    """Yield a Parquet file, one row group per chunk.
+
+    ``types`` は列名 → ``"string" | "timestamp"``。dict / list 値は JSON 文字列として保存する。
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {"string": pa.string(), "timestamp": pa.timestamp("us")}
+    schema = pa.schema([(name, arrow_types[types.get(name, "string")]) for name in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            arrays = [
+                pa.array(
+                    values if types.get(name) == "timestamp" else [_json_cell(v) for v in values],
+                    type=schema.field(name).type,
+                )
+                for name, values in zip(columns, zip(*chunk, strict=True), strict=True)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            if data := sink.drain():
+                yield data
+    yield sink.drain()
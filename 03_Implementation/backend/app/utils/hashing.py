@@ -0,0 +1,48 @@
+"""Stable content digests used as cache keys and content addresses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from typing import Any
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _canonical(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def json_digest(payload: Any) -> str:
+    return text_digest(_canonical(payload))
+
+
+class JsonListDigest:
+    """Incremental :func:`json_digest` of ``{**fields, key: [item, ...]}``.
+
+    リストの要素を :meth:`add` で 1 件ずつ渡し、全体を保持せずに同じハッシュを得る。
+    """
+
+    def __init__(self, fields: dict[str, Any], key: str):
+        marker = uuid.uuid4().hex
+        head, tail = _canonical({**fields, key: [marker]}).split(f'["{marker}"]')
+        self._hasher = hashlib.sha256(f"{head}[".encode())
+        self._tail = f"]{tail}".encode()
+        self.count = 0
+
+    def add(self, item: Any) -> None:
+        self._hasher.update(f"{',' if self.count else ''}{_canonical(item)}".encode())
+        self.count += 1
+
+    def hexdigest(self) -> str:
+        hasher = self._hasher.copy()
+        hasher.update(self._tail)
+        return hasher.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
@@ -0,0 +1,322 @@
+"""Lightweight latency metrics in the Prometheus text format (`settings.metrics_enabled`).
+
+`span("stage")` で囲んだ区間の所要時間を `reporting_qa_stage_seconds{stage=...}` に記録する。
+無効時の `span()` は共有の no-op オブジェクトを返すだけ（1 区間あたり数百 ns 以下）。
+HTTP リクエスト（ルート単位）、Celery タスク、リクエストごとの SQL 実行回数もここで集計し、
+`/metrics` で出力する。外部ライブラリ（prometheus_client）には依存しない。
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import event
+
+from ..config import get_settings
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_NAMESPACE = "reporting_qa"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = f"{_NAMESPACE}_{name}"
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1], strict=True):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield (
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(series[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = f"{_NAMESPACE}_{name}_total"
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = dict(self._values)
+        for labels, value in sorted(snapshot.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+stage_seconds = Histogram("stage_seconds", "Duration of instrumented pipeline stages.", ("stage",))
+http_request_seconds = Histogram(
+    "http_request_seconds", "HTTP request duration by route.", ("method", "route", "status")
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    COUNT_BUCKETS,
+)
+celery_task_seconds = Histogram("celery_task_seconds", "Celery task duration.", ("task", "state"))
+db_queries = Counter("db_queries", "SQL statements executed.")
+
+_REGISTRY: list[Histogram | Counter] = [
+    stage_seconds,
+    http_request_seconds,
+    http_request_db_queries,
+    celery_task_seconds,
+    db_queries,
+]
+_collectors: list[Callable[[], Iterable[str]]] = []
+
+_enabled = get_settings().metrics_enabled
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    """Toggle collection at runtime (ベンチマーク・検証用)。"""
+    global _enabled
+    _enabled = value
+
+
+# --- spans -----------------------------------------------------------------------
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+
+class _Span:
+    __slots__ = ("_stage", "_started")
+
+    def __init__(self, stage: str):
+        self._stage = stage
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *_exc: Any) -> None:
+        stage_seconds.observe(time.perf_counter() - self._started, self._stage)
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage: str) -> _Span | _NoopSpan:
+    """``with span("retrieval"):`` — records the block's duration when metrics are enabled."""
+    if not _enabled:
+        return _NOOP
+    return _Span(stage)
+
+
+# --- per-request SQL counting ----------------------------------------------------
+
+# リクエスト単位のカウンタ。sync エンドポイントはスレッドプールで動くが contextvars はコピーされ、
+# 中身のリストは共有されるため、そちらでの実行回数もここに加算される
+_query_count: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "reporting_qa_query_count", default=None
+)
+
+
+def _count_query(*_args: Any, **_kwargs: Any) -> None:
+    if not _enabled:
+        return
+    db_queries.inc()
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def instrument_engine(engine: Any) -> None:
+    """Count statements executed on ``engine`` (sync Engine or ``AsyncEngine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+
+# --- ASGI middleware ---------------------------------------------------------------
+
+
+def _route_template(scope: dict[str, Any]) -> str:
+    """Full path template of the matched route, e.g. ``/api/inquiries/{inquiry_id}``.
+
+    include_router したルートの path_format はルーター相対のことがあるため、
+    実パスから path_params を戻した部分を差し引いてプレフィックスを補う。
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if concrete and path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return path if not concrete else template
+
+
+class MetricsMiddleware:
+    """Records request latency and SQL count per route template (生のパスはラベルにしない)。"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+        counter = [0]
+        token = _query_count.set(counter)
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_count.reset(token)
+            template = _route_template(scope)
+            method = scope.get("method", "")
+            http_request_seconds.observe(
+                time.perf_counter() - started, method, template, str(status[0])
+            )
+            http_request_db_queries.observe(counter[0], method, template)
+
+
+# --- Celery ------------------------------------------------------------------------
+
+_task_started: dict[str, float] = {}
+
+
+def task_started(task_id: str) -> None:
+    if _enabled:
+        _task_started[task_id] = time.perf_counter()
+
+
+def task_finished(task_id: str, task_name: str, state: str) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        celery_task_seconds.observe(time.perf_counter() - started, task_name, state)
+
+
+def start_http_server(port: int) -> None:
+    """Serve ``render()`` on ``port`` from a daemon thread (HTTP を持たない Celery ワーカー用)。"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server の規約
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: Any) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+# --- exposition --------------------------------------------------------------------
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def register_collector(collector: Callable[[], Iterable[str]]) -> None:
+    """Add a callable yielding extra exposition lines (プール統計など、出力時に取得する値)。"""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    for metric in _REGISTRY:
+        metric.clear()
@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination helpers.
+
+カーソルは最終行の (タイムスタンプ, 主キー) を URL セーフ base64 で符号化したもの。
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+
+def encode_cursor(timestamp: datetime, key: str) -> str:
+    raw = f"{timestamp.isoformat()}|{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, key = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), key
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_page(
+    stmt: Select,
+    timestamp_column: InstrumentedAttribute,
+    key_column: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+) -> Select:
+    """Restrict ``stmt`` to the page after ``cursor``, ordered by (timestamp, key) descending."""
+    if cursor:
+        timestamp, key = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(timestamp_column, key_column) < tuple_(timestamp, key))
+    return stmt.order_by(timestamp_column.desc(), key_column.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[Any],
+    timestamp_column: InstrumentedAttribute,
+    key_column: InstrumentedAttribute,
+    limit: int,
+) -> tuple[list[Any], str | None]:
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    last = page[-1]
+    return page, encode_cursor(getattr(last, timestamp_column.key), getattr(last, key_column.key))
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    timestamp_column: InstrumentedAttribute,
+    key_column: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[Any], str | None]:
+    rows = db.scalars(keyset_page(stmt, timestamp_column, key_column, cursor, limit)).all()
+    return split_page(rows, timestamp_column, key_column, limit)
+
+
+async def apaginate(
+    db: AsyncSession,
+    stmt: Select,
+    timestamp_column: InstrumentedAttribute,
+    key_column: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[Any], str | None]:
+    result = await db.scalars(keyset_page(stmt, timestamp_column, key_column, cursor, limit))
+    return split_page(result.all(), timestamp_column, key_column, limit)
@@ -1,12 +1,19 @@
-"""Minimal placeholder for PDF/HTML parsing logic.
+"""PDF/HTML parsing logic for report ingestion.
 
-本 PoC では帳票解析は Celery タスクからこのモジュールを呼び出す。
-実際の PDF 処理はスコープ外のため、構造化済み JSON をそのまま返却する。
+構造化済み JSON はそのまま返却し (`extract_sections`)、PDF はページ単位でテキスト・表を抽出する。
+PDF は一度に全ページを読まず、`batch_pages` ページずつ処理してページキャッシュを都度破棄する。
+CPU 負荷の高いページ解析はプロセスプールへ回し、同時に保持するバッチ数も上限を設ける。
 """
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from typing import Any
+from urllib.parse import unquote, urlparse
 
 
 def extract_sections(payload: dict[str, Any]) -> list[dict[str, Any]]:
@@ -15,3 +22,97 @@ def extract_sections(payload: dict[str, Any]) -> list[dict[str, Any]]:
     if isinstance(sections, list):
         return sections
     return [payload]
+
+
+def resolve_local_path(uri: str) -> str:
+    """Map ``file://`` URIs and plain paths to a local path (S3 等は未対応)。"""
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        path = unquote(parsed.path)
+    elif not parsed.scheme:
+        path = uri
+    else:
+        raise ValueError(f"Unsupported report_file_uri scheme: {parsed.scheme}")
+    if not os.path.isfile(path):
+        raise ValueError(f"Report file not found: {uri}")
+    return path
+
+
+def _open(path: str):
+    try:
+        import pdfplumber
+    except ImportError as exc:  # pragma: no cover - pdf ワーカーのイメージには同梱
+        raise RuntimeError("pdfplumber is required for PDF ingestion") from exc
+    return pdfplumber.open(path)
+
+
+def count_pages(path: str) -> int:
+    with _open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _table_text(rows: list[list[str | None]]) -> str:
+    return "\n".join("\t".join(cell or "" for cell in row) for row in rows)
+
+
+def extract_page_range(path: str, start: int, stop: int) -> list[dict[str, Any]]:
+    """Extract sections for pages ``[start, stop)`` (0-based); page numbers are 1-based."""
+    sections: list[dict[str, Any]] = []
+    with _open(path) as pdf:
+        for page_no in range(start, min(stop, len(pdf.pages))):
+            page = pdf.pages[page_no]
+            label = str(page_no + 1)
+            text = (page.extract_text() or "").strip()
+            if text:
+                sections.append({"title": f"p.{label}", "page": label, "text": text})
+            for table_no, rows in enumerate(page.extract_tables(), start=1):
+                if not rows:
+                    continue
+                sections.append(
+                    {
+                        "title": f"p.{label} 表{table_no}",
+                        "page": label,
+                        "text": _table_text(rows),
+                        "table": rows,
+                    }
+                )
+            # 解析済みページのオブジェクトキャッシュを解放してメモリを一定に保つ
+            page.close()
+    return sections
+
+
+def iter_page_batches(
+    path: str, batch_pages: int = 20, workers: int = 1
+) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    """Yield ``(pages_done, sections)`` per batch, in page order.
+
+    ``workers > 1`` のときはプロセスプールで並列解析する。投入済みバッチは ``workers * 2``
+    までに制限し、結果の取り出しが遅れても未処理結果がメモリに溜まらないようにする。
+    Celery prefork の子プロセス (daemon) からは子プロセスを作れないため、その場合は逐次処理。
+    """
+    total = count_pages(path)
+    ranges = [(start, min(start + batch_pages, total)) for start in range(0, total, batch_pages)]
+
+    if workers <= 1 or len(ranges) <= 1 or multiprocessing.current_process().daemon:
+        for start, stop in ranges:
+            yield stop, extract_page_range(path, start, stop)
+        return
+
+    pending: deque[tuple[int, Future[list[dict[str, Any]]]]] = deque()
+    queued = iter(ranges)
+    # fork だと親の DB 接続・スレッドを引き継ぐため spawn（子は本モジュールのみ import する）
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for start, stop in queued:
+            pending.append((stop, executor.submit(extract_page_range, path, start, stop)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            stop, future = pending.popleft()
+            sections = future.result()
+            next_range = next(queued, None)
+            if next_range is not None:
+                pending.append(
+                    (next_range[1], executor.submit(extract_page_range, path, *next_range))
+                )
+            yield stop, sections
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from functools import lru_cache
+from ..config import get_settings
+from .resource_cache import ResourceCache
 
 
-@lru_cache
-def load_prompt(path: str) -> str:
-    with open(path, "r", encoding="utf-8") as handle:
+def _read_prompt(path: str) -> str:
+    with open(path, encoding="utf-8") as handle:
         return handle.read()
+
+
+_prompts: ResourceCache[str] = ResourceCache(
+    "prompts", _read_prompt, check_interval=lambda: get_settings().resource_check_interval
+)
+
+
+def load_prompt(path: str) -> str:
+    return _prompts.get(path)
@@ -1,24 +1,165 @@
 """Simplified RAG helper.
 
-PoC ではベクトル DB の実装を省略し、帳票メタ JSON から一致するセクションを検索する。
+帳票メタ JSON から質問に関連するセクションを検索する。
+セクションの転置インデックスは取込時に一度だけ構築して `ReportMeta.section_index` に保存し、
+検索時は BM25 でスコアリングする。語彙は `tokenizer` の文字 n-gram（空白のない日本語向け）。
+`vector_store` の索引が渡された場合は、BM25 とコサイン類似度をそれぞれ最大値で正規化して
+重み付き和で順位付けする（ハイブリッド検索）。
 """
 
 from __future__ import annotations
 
+import heapq
+import math
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
+from .tokenizer import ngrams, query_terms
+from .vector_store import VectorIndex, embed_query
 
-def find_relevant_sections(question: str, report_struct: dict[str, Any]) -> list[dict[str, Any]]:
+INDEX_VERSION = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _section_text(value: Any) -> str:
+    if isinstance(value, dict):
+        return " ".join(_section_text(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        return " ".join(_section_text(item) for item in value)
+    if value is None:
+        return ""
+    return str(value)
+
+
+def iter_section_texts(sections: Iterable[dict[str, Any]]) -> Iterator[str]:
+    return (_section_text(section) for section in sections)
+
+
+def section_texts(report_struct: dict[str, Any]) -> list[str]:
+    return list(iter_section_texts(report_struct.get("sections", [])))
+
+
+def build_section_index(report_struct: dict[str, Any]) -> dict[str, Any]:
+    """Build a JSON-serialisable BM25 inverted index over ``report_struct["sections"]``."""
+    return index_sections(report_struct.get("sections", []))
+
+
+def index_sections(sections: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Same as :func:`build_section_index`, consuming ``sections`` one at a time."""
+    postings: dict[str, list[list[int]]] = {}
+    doc_lens: list[int] = []
+    for doc_id, section in enumerate(sections):
+        terms = ngrams(_section_text(section))
+        doc_lens.append(len(terms))
+        for term, freq in Counter(terms).items():
+            postings.setdefault(term, []).append([doc_id, freq])
+
+    return {
+        "version": INDEX_VERSION,
+        "doc_count": len(doc_lens),
+        "avg_len": (sum(doc_lens) / len(doc_lens)) if doc_lens else 0.0,
+        "doc_lens": doc_lens,
+        "postings": postings,
+    }
+
+
+class SectionIndex:
+    """Read-only view over an index produced by :func:`build_section_index`."""
+
+    # df がこの割合を超える n-gram（「の譲」など）は識別力が低いためスコア計算を省く
+    COMMON_TERM_RATIO = 0.5
+
+    def __init__(self, payload: dict[str, Any]):
+        self.doc_count: int = payload["doc_count"]
+        self.avg_len: float = payload["avg_len"] or 1.0
+        self.doc_lens: list[int] = payload["doc_lens"]
+        self.postings: dict[str, list[list[int]]] = payload["postings"]
+
+    @classmethod
+    def load(cls, payload: dict[str, Any] | None, report_struct: dict[str, Any]) -> SectionIndex:
+        if not payload or payload.get("version") != INDEX_VERSION:
+            payload = build_section_index(report_struct)
+        return cls(payload)
+
+    def search(self, terms: set[str], limit: int) -> list[tuple[float, int]]:
+        matched = [(term, self.postings[term]) for term in terms if term in self.postings]
+        selective = [
+            item for item in matched if len(item[1]) <= self.doc_count * self.COMMON_TERM_RATIO
+        ]
+        scale = BM25_K1 * BM25_B / self.avg_len
+        base = BM25_K1 * (1 - BM25_B)
+        doc_lens = self.doc_lens
+        scores: dict[int, float] = {}
+        for _term, posting in selective or matched:
+            df = len(posting)
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+            for doc_id, freq in posting:
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * freq / (
+                    freq + base + scale * doc_lens[doc_id]
+                )
+        return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()))
+
+
+def _hybrid_rank(
+    keyword_hits: list[tuple[float, int]],
+    vector_hits: list[tuple[float, int]],
+    vector_weight: float,
+    limit: int,
+) -> list[tuple[float, int]]:
+    scores: dict[int, float] = {}
+    for hits, weight in ((keyword_hits, 1 - vector_weight), (vector_hits, vector_weight)):
+        top = max((score for score, _ in hits), default=0.0)
+        if top <= 0:
+            continue
+        for score, doc_id in hits:
+            if score > 0:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * score / top
+    return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()))
+
+
+def rank_sections(
+    question: str,
+    doc_count: int,
+    load_index: Callable[[], SectionIndex],
+    limit: int = 3,
+    vectors: VectorIndex | None = None,
+    vector_weight: float = 0.5,
+    nprobe: int = 8,
+) -> list[int]:
+    """Return the ids of the best sections; the index is only loaded if it is needed."""
+    keywords = query_terms(question)
+    if vectors is None or len(vectors) != doc_count:
+        if not keywords:
+            return list(range(min(doc_count, 2)))
+        ranked = load_index().search(keywords, limit)
+    else:
+        # 融合前に各方式から limit の数倍を候補として取り、片方だけに現れる節も拾う
+        candidates = limit * 4
+        keyword_hits = load_index().search(keywords, candidates) if keywords else []
+        vector_hits = vectors.search(embed_query(question), candidates, nprobe)
+        ranked = _hybrid_rank(keyword_hits, vector_hits, vector_weight, limit)
+    return [doc_id for _, doc_id in ranked] or list(range(min(doc_count, 1)))
+
+
+def find_relevant_sections(
+    question: str,
+    report_struct: dict[str, Any],
+    index: dict[str, Any] | None = None,
+    limit: int = 3,
+    vectors: VectorIndex | None = None,
+    vector_weight: float = 0.5,
+    nprobe: int = 8,
+) -> list[dict[str, Any]]:
     sections: list[dict[str, Any]] = report_struct.get("sections", [])
-    keywords = {token.strip().lower() for token in question.split() if len(token) > 2}
-    if not keywords:
-        return sections[:2]
-
-    ranked: list[tuple[int, dict[str, Any]]] = []
-    for section in sections:
-        text = str(section).lower()
-        score = sum(1 for kw in keywords if kw in text)
-        if score:
-            ranked.append((score, section))
-    ranked.sort(key=lambda item: item[0], reverse=True)
-    return [section for _, section in ranked[:3]] or sections[:1]
+    doc_ids = rank_sections(
+        question,
+        len(sections),
+        lambda: SectionIndex.load(index, report_struct),
+        limit,
+        vectors,
+        vector_weight,
+        nprobe,
+    )
+    return [sections[doc_id] for doc_id in doc_ids]
@@ -0,0 +1,102 @@
+"""Hot-reloadable cache for file-backed resources (プロンプト・危険語辞書など)。
+
+キャッシュは (path, mtime, size) をキーに保持し、ファイルの stat 確認は
+`check_interval` 秒に 1 回まで。存在しないファイルは確認間隔ごとに再試行する。
+`max_entries` を指定すると LRU で上限を設ける（mmap などファイル記述子を持つ値向け）。
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_registry: list[ResourceCache] = []
+
+
+@dataclass
+class _Entry(Generic[T]):
+    signature: tuple[int, int] | None
+    value: T
+    checked_at: float
+
+
+class ResourceCache(Generic[T]):
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[str], T],
+        missing: Callable[[str], T] | None = None,
+        check_interval: Callable[[], float] | float = 5.0,
+        max_entries: int | None = None,
+    ):
+        self.name = name
+        self._loader = loader
+        self._missing = missing
+        self._check_interval = check_interval
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _interval(self) -> float:
+        interval = self._check_interval
+        return interval() if callable(interval) else interval
+
+    def get(self, path: str) -> T:
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self._interval():
+            if self._max_entries is not None:
+                self._touch(path)
+            return entry.value
+        return self._refresh(path, entry, now)
+
+    def _refresh(self, path: str, entry: _Entry[T] | None, now: float) -> T:
+        try:
+            stat = os.stat(path)
+            signature: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            return entry.value
+
+        with self._lock:
+            if signature is None:
+                if self._missing is None:
+                    self._entries.pop(path, None)
+                    raise FileNotFoundError(path)
+                value = self._missing(path)
+            else:
+                value = self._loader(path)
+            self._entries[path] = _Entry(signature, value, now)
+            if self._max_entries is not None:
+                self._entries.move_to_end(path)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+            return value
+
+    def _touch(self, path: str) -> None:
+        try:
+            self._entries.move_to_end(path)
+        except KeyError:  # 他スレッドが追い出し済み
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def reload_all() -> list[str]:
+    """Drop every registered cache so the next access re-reads from disk."""
+    for cache in _registry:
+        cache.clear()
+    return [cache.name for cache in _registry]
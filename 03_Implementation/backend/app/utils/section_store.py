@@ -0,0 +1,144 @@
+"""Compact on-disk section store (`settings.section_store_path`).
+
+帳票ごとに `{section_store_path}/{content_digest}.sections` を 1 ファイルで保存する::
+
+    magic(8) | count(u64) | offsets(u64 × (count + 1)) | blob
+
+blob は各セクションを個別に JSON エンコードして連結したもの。読み出しは mmap 経由で
+候補セクションのスライスだけを decode するため、帳票全体の JSON をリクエストごとに
+復元しない。ページキャッシュはワーカープロセス間で共有される。
+BM25 索引は `{content_digest}.index.json` に置き、プロセスごとに初回のみ読み込む。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterable
+from typing import Any
+
+from ..config import get_settings
+from .rag import SectionIndex, rank_sections
+from .resource_cache import ResourceCache
+from .vector_store import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"RQASEC01"
+_HEADER = struct.Struct("<8sQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def _paths(content_digest: str) -> tuple[str, str]:
+    root = get_settings().section_store_path
+    return (
+        os.path.join(root, f"{content_digest}.sections"),
+        os.path.join(root, f"{content_digest}.index.json"),
+    )
+
+
+def write_section_store(
+    content_digest: str, sections: Iterable[dict[str, Any]], index: dict[str, Any]
+) -> str | None:
+    """Write the store atomically; returns the path, or ``None`` if the directory is unusable."""
+    store_path, index_path = _paths(content_digest)
+    root = os.path.dirname(store_path)
+    try:
+        os.makedirs(root, exist_ok=True)
+        blob = tempfile.TemporaryFile(dir=root)
+    except OSError as exc:
+        logger.warning("section store unavailable (%s); skipping", exc)
+        return None
+
+    with blob:
+        offsets = [0]
+        for section in sections:
+            offsets.append(
+                offsets[-1] + blob.write(json.dumps(section, ensure_ascii=False).encode("utf-8"))
+            )
+        blob.seek(0)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{content_digest}.", dir=root)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(_HEADER.pack(_MAGIC, len(offsets) - 1))
+                out.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+                while chunk := blob.read(1 << 20):
+                    out.write(chunk)
+            with open(f"{tmp_path}.index", "w", encoding="utf-8") as handle:
+                json.dump(index, handle, ensure_ascii=False)
+            # 索引 → 本体の順に置き換え、本体の mtime 変化で読み手が両方を読み直す
+            os.replace(f"{tmp_path}.index", index_path)
+            os.replace(tmp_path, store_path)
+        except Exception:
+            for path in (tmp_path, f"{tmp_path}.index"):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+    return store_path
+
+
+class SectionStore:
+    """Read-only, mmap-backed view over a ``.sections`` file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a section store: {path}")
+        self._blob_start = _HEADER.size + _OFFSET.size * (self._count + 1)
+        self._index_path = path.removesuffix(".sections") + ".index.json"
+        self._index: SectionIndex | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, doc_id: int) -> dict[str, Any]:
+        if not 0 <= doc_id < self._count:
+            raise IndexError(doc_id)
+        start, end = struct.unpack_from("<2Q", self._map, _HEADER.size + _OFFSET.size * doc_id)
+        return json.loads(self._map[self._blob_start + start : self._blob_start + end])
+
+    def index(self) -> SectionIndex:
+        if self._index is None:
+            with open(self._index_path, encoding="utf-8") as handle:
+                self._index = SectionIndex(json.load(handle))
+        return self._index
+
+    def search(
+        self,
+        question: str,
+        limit: int = 3,
+        vectors: VectorIndex | None = None,
+        vector_weight: float = 0.5,
+        nprobe: int = 8,
+    ) -> list[dict[str, Any]]:
+        """Same ranking as :func:`rag.find_relevant_sections`, decoding only the hits."""
+        doc_ids = rank_sections(
+            question, self._count, self.index, limit, vectors, vector_weight, nprobe
+        )
+        return [self[doc_id] for doc_id in doc_ids]
+
+
+_stores: ResourceCache[SectionStore | None] = ResourceCache(
+    "section_store",
+    SectionStore,
+    missing=lambda _path: None,
+    check_interval=lambda: get_settings().resource_check_interval,
+    max_entries=256,
+)
+
+
+def section_store_exists(content_digest: str) -> bool:
+    return all(os.path.exists(path) for path in _paths(content_digest))
+
+
+def load_section_store(content_digest: str | None) -> SectionStore | None:
+    if not content_digest:
+        return None
+    return _stores.get(_paths(content_digest)[0])
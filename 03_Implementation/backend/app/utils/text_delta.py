@@ -0,0 +1,31 @@
+"""Line-based text deltas (difflib) compressed with zlib, for storing successive draft versions.
+
+差分は「基準テキストの行範囲のコピー」と「挿入テキスト」の列で表し、JSON にして圧縮する。
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import zlib
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """Return a compressed delta that rebuilds ``target`` from ``base``."""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    ops: list[list[int] | str] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(target_lines[j1:j2]))
+    payload = json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"), 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    ops = json.loads(zlib.decompress(delta).decode("utf-8"))
+    return "".join("".join(base_lines[op[0] : op[1]]) if isinstance(op, list) else op for op in ops)
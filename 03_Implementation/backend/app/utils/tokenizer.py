@@ -0,0 +1,100 @@
+"""Whitespace-free tokenizer for Japanese inquiries and report sections.
+
+問い合わせ文には空白がないため、CJK 文字列は文字 bigram/trigram に分割し、
+英数字は単語単位で扱う。正規化は NFKC + 小文字化（全角英数・半角カナを吸収）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+NGRAM_SIZES = (2, 3)
+_CACHE_SIZE = 4096
+_token_cache: OrderedDict[bytes, tuple[str, ...]] = OrderedDict()
+# スレッドプール上のハンドラから共有されるため、参照順の更新・追い出しはロック内で行う
+_token_lock = threading.Lock()
+
+
+def _is_cjk(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x3040 <= code <= 0x30FF  # ひらがな・カタカナ
+        or 0x3400 <= code <= 0x4DBF  # CJK 拡張 A
+        or 0x4E00 <= code <= 0x9FFF  # CJK 統合漢字
+        or 0xF900 <= code <= 0xFAFF  # CJK 互換漢字
+        or char == "々"
+    )
+
+
+def _is_hiragana(char: str) -> bool:
+    return 0x3040 <= ord(char) <= 0x309F
+
+
+def _runs(text: str) -> list[tuple[bool, str]]:
+    runs: list[tuple[bool, str]] = []
+    buffer: list[str] = []
+    buffer_cjk = False
+    for char in text:
+        if _is_cjk(char):
+            kind = True
+        elif char.isalnum():
+            kind = False
+        else:
+            if buffer:
+                runs.append((buffer_cjk, "".join(buffer)))
+                buffer = []
+            continue
+        if buffer and kind != buffer_cjk:
+            runs.append((buffer_cjk, "".join(buffer)))
+            buffer = []
+        buffer_cjk = kind
+        buffer.append(char)
+    if buffer:
+        runs.append((buffer_cjk, "".join(buffer)))
+    return runs
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def ngrams(text: str) -> list[str]:
+    """Tokenize without caching; used when indexing section bodies."""
+    tokens: list[str] = []
+    for is_cjk, run in _runs(normalize(text)):
+        if not is_cjk:
+            if len(run) > 1:
+                tokens.append(run)
+            continue
+        if len(run) < min(NGRAM_SIZES):
+            tokens.append(run)
+            continue
+        for size in NGRAM_SIZES:
+            tokens.extend(run[i : i + size] for i in range(len(run) - size + 1))
+    return tokens
+
+
+def tokenize(text: str) -> tuple[str, ...]:
+    """Cached variant of :func:`ngrams` keyed by the text digest (for repeated questions)."""
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _token_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            _token_cache.move_to_end(key)
+            return cached
+    tokens = tuple(ngrams(text))
+    with _token_lock:
+        _token_cache[key] = tokens
+        while len(_token_cache) > _CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return tokens
+
+
+def query_terms(text: str) -> set[str]:
+    """Distinct query terms, dropping pure-hiragana grams (助詞など) when better ones exist."""
+    terms = set(tokenize(text))
+    content = {term for term in terms if not all(_is_hiragana(char) for char in term)}
+    return content or terms
@@ -0,0 +1,302 @@
+"""Local on-disk vector index for report sections (`settings.vector_store_path`).
+
+帳票ごとに `{vector_store_path}/{content_digest}/` へ NumPy 配列で保存し、検索時は
+`np.load(mmap_mode="r")` でメモリマップして必要な行だけを読む。
+セクション数が `vector.ivf_min_sections` 以上の帳票は IVF（k-means の粗量子化）で保存し、
+クエリに近い `vector.nprobe` 個のクラスタだけを走査する。行はクラスタ順に並べて保存するため、
+各クラスタの走査は連続領域の読み出しになる。
+
+埋め込みは `Embedder` で差し替え可能。既定の `HashingEmbedder` は文字 n-gram の
+ハッシュトリックで、外部 API なし・決定的に動作する（オフライン / PoC 用）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable, Sequence
+from typing import Any, Protocol
+
+import numpy as np
+
+from ..config import get_settings
+from .resource_cache import ResourceCache
+from .tokenizer import ngrams
+
+logger = logging.getLogger(__name__)
+
+_META_FILE = "meta.json"
+_SCAN_ROWS = 65536
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE_PER_CLUSTER = 64
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an L2-normalised ``float32`` array of shape ``(len(texts), dim)``."""
+        ...
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class HashingEmbedder:
+    """Signed feature hashing over the tokenizer's character n-grams."""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self._buckets: dict[str, tuple[int, float]] = {}
+
+    def _bucket(self, term: str) -> tuple[int, float]:
+        bucket = self._buckets.get(term)
+        if bucket is None:
+            value = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest())
+            bucket = (value % self.dim, 1.0 if value >> 63 else -1.0)
+            if len(self._buckets) < 200_000:
+                self._buckets[term] = bucket
+        return bucket
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in ngrams(text):
+                column, sign = self._bucket(term)
+                matrix[row, column] += sign
+        return _normalize_rows(matrix)
+
+
+class OpenAIEmbedder:
+    """Embeddings via the OpenAI-compatible endpoint in ``settings.ai_provider``."""
+
+    def __init__(self, model: str, dim: int):
+        from openai import OpenAI
+
+        self.dim = dim
+        self.name = f"openai-{model}-{dim}"
+        self._model = model
+        self._client = OpenAI(base_url=get_settings().ai_provider.base_url)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        response = self._client.embeddings.create(
+            model=self._model, input=list(texts), dimensions=self.dim
+        )
+        return _normalize_rows(np.array([item.embedding for item in response.data]))
+
+
+_embedder: Embedder | None = None
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    if _embedder is None:
+        config = get_settings().vector
+        if config.embedder == "openai":
+            _embedder = OpenAIEmbedder(config.openai_model, config.dim)
+        else:
+            _embedder = HashingEmbedder(config.dim)
+    return _embedder
+
+
+def _kmeans(vectors: np.ndarray, clusters: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample; returns normalised centroids."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), clusters * _KMEANS_SAMPLE_PER_CLUSTER)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, clusters, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.bincount(assignment, minlength=clusters) == 0
+        sums[empty] = centroids[empty]
+        centroids = _normalize_rows(sums)
+    return centroids
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _SCAN_ROWS):
+        block = np.asarray(vectors[start : start + _SCAN_ROWS])
+        labels[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k)[:k]
+        scores, ids = scores[keep], ids[keep]
+    return scores, ids
+
+
+class VectorIndex:
+    """Memory-mapped view over one report's vectors."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, _META_FILE), encoding="utf-8") as handle:
+            self.meta: dict[str, Any] = json.load(handle)
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self.ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        self.centroids: np.ndarray | None = None
+        self.offsets: np.ndarray | None = None
+        if self.meta.get("ivf"):
+            self.centroids = np.load(os.path.join(directory, "centroids.npy"))
+            self.offsets = np.load(os.path.join(directory, "offsets.npy"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _row_ranges(self, query: np.ndarray, nprobe: int) -> list[tuple[int, int]]:
+        if self.centroids is None or self.offsets is None:
+            return [(0, len(self.ids))]
+        nearest = np.argsort(-(self.centroids @ query))[:nprobe]
+        return [(int(self.offsets[c]), int(self.offsets[c + 1])) for c in nearest]
+
+    def search(self, query: np.ndarray, limit: int, nprobe: int = 8) -> list[tuple[float, int]]:
+        """Return ``(cosine, section_id)`` pairs, best first."""
+        best_scores = np.empty(0, dtype=np.float32)
+        best_ids = np.empty(0, dtype=np.int64)
+        for start, stop in self._row_ranges(query, nprobe):
+            for block_start in range(start, stop, _SCAN_ROWS):
+                block_stop = min(block_start + _SCAN_ROWS, stop)
+                scores = np.asarray(self.vectors[block_start:block_stop]) @ query
+                ids = np.asarray(self.ids[block_start:block_stop], dtype=np.int64)
+                best_scores, best_ids = _top_k(
+                    np.concatenate([best_scores, scores]), np.concatenate([best_ids, ids]), limit
+                )
+        order = np.argsort(-best_scores)
+        return [(float(best_scores[i]), int(best_ids[i])) for i in order]
+
+
+def _index_dir(content_digest: str) -> str:
+    return os.path.join(get_settings().vector_store_path, content_digest)
+
+
+def vector_index_exists(content_digest: str) -> bool:
+    return os.path.exists(os.path.join(_index_dir(content_digest), _META_FILE))
+
+
+def build_vector_index(
+    content_digest: str,
+    texts: Iterable[str],
+    embedder: Embedder | None = None,
+    count: int | None = None,
+) -> str | None:
+    """Embed section ``texts`` and write the index; returns the directory or ``None`` if skipped.
+
+    埋め込みは `batch_size` 件ずつ `open_memmap` に書き込み、全ベクトルを同時に保持しない。
+    ``texts`` がイテレータの場合は件数を ``count`` で渡す（テキストも一括では読まない）。
+    書き込みは一時ディレクトリで行い、完了後に rename する（検索側が途中状態を読まない）。
+    """
+    settings = get_settings()
+    if count is None:
+        count = len(texts)
+    if not settings.enable_vector_store or not count:
+        return None
+    embedder = embedder or get_embedder()
+    config = settings.vector
+    target = _index_dir(content_digest)
+    meta_path = os.path.join(target, _META_FILE)
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta.get("embedder") == embedder.name and meta.get("count") == count:
+            return target
+
+    try:
+        os.makedirs(settings.vector_store_path, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix=f".{content_digest}.", dir=settings.vector_store_path)
+    except OSError as exc:
+        logger.warning("vector store unavailable (%s); skipping index build", exc)
+        return None
+
+    try:
+        raw_path = os.path.join(workdir, "raw.npy")
+        raw = np.lib.format.open_memmap(
+            raw_path, mode="w+", dtype=np.float32, shape=(count, embedder.dim)
+        )
+        texts = iter(texts)
+        for start in range(0, count, config.batch_size):
+            batch = list(itertools.islice(texts, min(config.batch_size, count - start)))
+            if len(batch) != min(config.batch_size, count - start):
+                raise ValueError(f"expected {count} section texts, got {start + len(batch)}")
+            raw[start : start + len(batch)] = embedder.embed(batch)
+        raw.flush()
+
+        ivf = count >= config.ivf_min_sections
+        if ivf:
+            clusters = max(1, int(math.sqrt(count)))
+            centroids = _kmeans(raw, clusters)
+            labels = _assign(raw, centroids)
+            order = np.argsort(labels, kind="stable").astype(np.int64)
+            offsets = np.zeros(clusters + 1, dtype=np.int64)
+            np.cumsum(np.bincount(labels, minlength=clusters), out=offsets[1:])
+            vectors = np.lib.format.open_memmap(
+                os.path.join(workdir, "vectors.npy"),
+                mode="w+",
+                dtype=np.float32,
+                shape=(count, embedder.dim),
+            )
+            for start in range(0, count, _SCAN_ROWS):
+                rows = order[start : start + _SCAN_ROWS]
+                vectors[start : start + len(rows)] = raw[rows]
+            vectors.flush()
+            del vectors
+            np.save(os.path.join(workdir, "ids.npy"), order)
+            np.save(os.path.join(workdir, "centroids.npy"), centroids)
+            np.save(os.path.join(workdir, "offsets.npy"), offsets)
+            del raw
+            os.remove(raw_path)
+        else:
+            del raw
+            os.replace(raw_path, os.path.join(workdir, "vectors.npy"))
+            np.save(os.path.join(workdir, "ids.npy"), np.arange(count, dtype=np.int64))
+
+        with open(os.path.join(workdir, _META_FILE), "w", encoding="utf-8") as handle:
+            json.dump(
+                {"embedder": embedder.name, "dim": embedder.dim, "count": count, "ivf": ivf},
+                handle,
+            )
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(workdir, target)
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return target
+
+
+def _open(meta_path: str) -> VectorIndex | None:
+    index = VectorIndex(os.path.dirname(meta_path))
+    return index if index.meta.get("embedder") == get_embedder().name else None
+
+
+_indexes: ResourceCache[VectorIndex | None] = ResourceCache(
+    "vector_index",
+    _open,
+    missing=lambda _path: None,
+    check_interval=lambda: get_settings().resource_check_interval,
+    max_entries=256,
+)
+
+
+def load_vector_index(content_digest: str | None) -> VectorIndex | None:
+    """Return the report's index, or ``None`` when disabled / not built / stale embedder."""
+    if not content_digest or not get_settings().enable_vector_store:
+        return None
+    return _indexes.get(os.path.join(_index_dir(content_digest), _META_FILE))
+
+
+def embed_query(text: str) -> np.ndarray:
+    return get_embedder().embed([text])[0]
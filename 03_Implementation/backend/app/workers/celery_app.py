@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_init
 
 from ..config import get_settings
+from ..db.session import dispose_engine
+from ..utils import metrics
 
 settings = get_settings()
 
@@ -13,4 +16,43 @@ celery_app = Celery(
 )
 
 celery_app.conf.task_default_queue = settings.worker.default_queue
+celery_app.conf.task_track_started = True
+celery_app.conf.result_extended = True
+if settings.worker.eager:
+    # 結果はプロセス内メモリに保存し、/ai/jobs・/ai/batches の照会もそのまま動くようにする
+    celery_app.conf.update(
+        task_always_eager=True,
+        task_store_eager_result=True,
+        result_backend="cache+memory://",
+    )
 celery_app.autodiscover_tasks(["app.workers"])
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_kwargs) -> None:
+    # fork 前に親が確立した接続を子プロセス間で共有しないようにする
+    dispose_engine()
+    if metrics.enabled() and settings.worker.metrics_port:
+        from billiard.process import current_process
+
+        index = getattr(current_process(), "index", None) or 0
+        metrics.start_http_server(settings.worker.metrics_port + index)
+
+
+@worker_init.connect
+def _start_metrics_server(sender=None, **_kwargs) -> None:
+    # prefork 以外（threads / solo）はメインプロセスでタスクを実行する
+    pool = getattr(sender, "pool_cls", None)
+    prefork = "prefork" in getattr(pool, "__module__", str(pool))
+    if metrics.enabled() and settings.worker.metrics_port and not prefork:
+        metrics.start_http_server(settings.worker.metrics_port)
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **_kwargs) -> None:
+    metrics.task_started(task_id)
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **_kwargs) -> None:
+    metrics.task_finished(task_id, task.name if task else "unknown", state or "UNKNOWN")
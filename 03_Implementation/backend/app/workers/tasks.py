@@ -4,7 +4,8 @@ from typing import Any
 
 from .celery_app import celery_app
 from ..db.session import SessionLocal
-from ..services.ai_service import enqueue_ai_generation
+from ..services.ai_service import enqueue_ai_generation, generate_batch
+from ..services.document_service import parse_pdf_report, rebuild_stores
 from ..services.response_service import finalize_response
 from ..schemas import AiResponseCreate, FinalResponseCreate
 
@@ -19,6 +20,33 @@ def generate_response(payload: dict[str, Any]) -> str:
         session.close()
 
 
+@celery_app.task(name="ai.generate_batch")
+def generate_batch_task(inquiry_ids: list[str]) -> list[dict[str, Any]]:
+    session = SessionLocal()
+    try:
+        return generate_batch(session, inquiry_ids)
+    finally:
+        session.close()
+
+
+@celery_app.task(name="documents.parse_pdf")
+def parse_pdf_task(report_meta_id: str) -> str:
+    session = SessionLocal()
+    try:
+        return parse_pdf_report(session, report_meta_id).ingest_status
+    finally:
+        session.close()
+
+
+@celery_app.task(name="documents.rebuild_stores", ignore_result=True)
+def rebuild_stores_task(content_digest: str) -> bool:
+    session = SessionLocal()
+    try:
+        return rebuild_stores(session, content_digest)
+    finally:
+        session.close()
+
+
 @celery_app.task(name="response.finalize")
 def finalize_response_task(payload: dict[str, Any]) -> str:
     session = SessionLocal()
@@ -0,0 +1,115 @@
+"""判定ルールの what-if シミュレーション (F-007)。
+
+過去の AiResponse に対して `TriageRuleConfig` の候補 (min_confidence × danger_penalty) を
+一括で当てはめ、エスカレーション率と実際のエスカレーション有無との一致率を集計する。
+行はチャンク単位で受け取って集計値だけを保持するため、履歴件数によらずメモリは一定。
+
+CLI::
+
+    python -m app.workflows.simulation --min-confidence 0.5:0.8:0.05 --danger-penalty 0,0.1,0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+CHUNK_ROWS = 50_000
+
+
+class ThresholdSimulator:
+    """Accumulates confusion counts for every (min_confidence, danger_penalty) pair.
+
+    danger_penalty ごとにスコアを 1 回計算してソートし、全 min_confidence 閾値の
+    「score < 閾値」件数を二分探索で数える。閾値の候補数が増えても計算量はほぼ変わらない。
+    """
+
+    def __init__(self, min_confidence: Sequence[float], danger_penalty: Sequence[float]):
+        self.min_confidence = np.asarray(min_confidence, dtype=np.float64)
+        self.danger_penalty = np.asarray(danger_penalty, dtype=np.float64)
+        shape = (len(self.danger_penalty), len(self.min_confidence))
+        self.rows = 0
+        self.actual = 0
+        self.predicted = np.zeros(shape, dtype=np.int64)
+        self.true_positive = np.zeros(shape, dtype=np.int64)
+
+    def update(
+        self,
+        confidence: np.ndarray,
+        edit_distance: np.ndarray,
+        operator_confidence: np.ndarray,
+        danger_hits: np.ndarray,
+        escalated: np.ndarray,
+    ) -> None:
+        self.rows += len(confidence)
+        self.actual += int(escalated.sum())
+        adjusted = confidence - edit_distance
+        for row, penalty in enumerate(self.danger_penalty):
+            # evaluate と同じ演算順で計算し、単件判定と境界値の扱いを揃える
+            score = (adjusted - penalty * danger_hits + operator_confidence) / 2
+            self.predicted[row] += np.searchsorted(np.sort(score), self.min_confidence, side="left")
+            self.true_positive[row] += np.searchsorted(
+                np.sort(score[escalated]), self.min_confidence, side="left"
+            )
+
+    def results(self) -> list[dict[str, Any]]:
+        rows = max(self.rows, 1)
+        results = []
+        for column, min_confidence in enumerate(self.min_confidence):
+            for row, penalty in enumerate(self.danger_penalty):
+                predicted = int(self.predicted[row, column])
+                true_positive = int(self.true_positive[row, column])
+                false_positive = predicted - true_positive
+                false_negative = self.actual - true_positive
+                results.append(
+                    {
+                        "min_confidence": float(min_confidence),
+                        "danger_penalty": float(penalty),
+                        "escalated": predicted,
+                        "escalation_rate": predicted / rows,
+                        "agreement": (rows - false_positive - false_negative) / rows,
+                        "precision": true_positive / predicted if predicted else None,
+                        "recall": true_positive / self.actual if self.actual else None,
+                        "true_positive": true_positive,
+                        "false_positive": false_positive,
+                        "false_negative": false_negative,
+                    }
+                )
+        return results
+
+
+def _values(spec: str) -> list[float]:
+    """``"0.5,0.6"`` or ``"start:stop:step"`` (stop inclusive)."""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        return [round(value, 6) for value in np.arange(start, stop + step / 2, step)]
+    return [float(part) for part in spec.split(",") if part]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from ..db.session import session_scope
+    from ..schemas.workflow import TriageSimulationRequest
+    from ..services.triage_service import simulate_thresholds
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-confidence", default="0.5:0.8:0.05")
+    parser.add_argument("--danger-penalty", default="0.1")
+    parser.add_argument("--default-operator-confidence", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    payload = TriageSimulationRequest(
+        min_confidence=_values(args.min_confidence),
+        danger_penalty=_values(args.danger_penalty),
+        default_operator_confidence=args.default_operator_confidence,
+    )
+    with session_scope() as db:
+        result = simulate_thresholds(db, payload)
+    print(json.dumps(result.model_dump(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
-"""判定サポートロジック (F-007)。"""
+"""判定サポートロジック (F-007)。
+
+`evaluate` は 1 件、`evaluate_batch` は同じ式を NumPy 配列でまとめて計算する（再トリアージ用）。
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from ..models import AiResponse
 
+RATIONALE_ESCALATE = "自信度が閾値を下回っています"
+RATIONALE_PASS = "自動判定基準を満たしています"
+
 
 @dataclass
 class TriageRuleConfig:
@@ -22,11 +30,24 @@ def evaluate(
     config: TriageRuleConfig | None = None,
 ) -> tuple[bool, float, str]:
     cfg = config or TriageRuleConfig()
-    score = ai_response.confidence_score - edit_distance - cfg.danger_penalty * danger_hits
+    # confidence_score は Numeric 列のため Decimal で返る
+    score = float(ai_response.confidence_score) - edit_distance - cfg.danger_penalty * danger_hits
     score = (score + operator_confidence) / 2
     should_escalate = score < cfg.min_confidence
 
-    rationale = (
-        "自信度が閾値を下回っています" if should_escalate else "自動判定基準を満たしています"
-    )
+    rationale = RATIONALE_ESCALATE if should_escalate else RATIONALE_PASS
     return should_escalate, max(min(score, 1.0), 0.0), rationale
+
+
+def evaluate_batch(
+    confidence: np.ndarray,
+    edit_distance: np.ndarray,
+    operator_confidence: np.ndarray,
+    danger_hits: np.ndarray,
+    config: TriageRuleConfig | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised :func:`evaluate`; returns ``(should_escalate, clipped_score)`` arrays."""
+    cfg = config or TriageRuleConfig()
+    score = confidence - edit_distance - cfg.danger_penalty * danger_hits
+    score = (score + operator_confidence) / 2
+    return score < cfg.min_confidence, np.clip(score, 0.0, 1.0)
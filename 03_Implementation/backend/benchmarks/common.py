@@ -0,0 +1,22 @@
+"""Helpers shared by the benchmark scripts (app をインポートしない)。"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def git_commit() -> str | None:
+    """Short hash of the checked-out commit, recorded with each result for comparison."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
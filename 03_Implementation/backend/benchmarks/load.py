@@ -0,0 +1,409 @@
+"""End-to-end load test for the API (問い合わせ登録 → 帳票取込 → 回答生成 → トリアージ → 確定送信)。
+
+仮想オペレーター ``--users`` 人が業務フローを繰り返し、エンドポイントごとのスループットと
+p50 / p95 / p99 レイテンシを JSON で出力する。接続先は次のいずれか::
+
+    # プロセス内で API を起動（既定: 一時 SQLite + Celery eager、外部サービス不要）
+    python -m benchmarks.load --users 8 --duration 60
+    # ローカル PostgreSQL / Redis を使い、Celery ワーカーを子プロセスで起動して非同期生成を含める
+    python -m benchmarks.load --database-url postgresql+psycopg://... \\
+        --redis-url redis://localhost:6379/0 --generate async
+    # 起動済みの環境（docker compose など）に対して実行
+    python -m benchmarks.load --base-url http://localhost:8000 --generate async
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import AsyncExitStack, ExitStack
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from . import synthetic
+from .common import BACKEND_DIR, git_commit
+
+JOB_POLL_INTERVAL = 0.05
+JOB_TIMEOUT = 60.0
+
+
+class FlowError(Exception):
+    """Raised when a step fails; the rest of that flow is skipped."""
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.flows = 0
+        self.failed_flows = 0
+
+    def record(self, endpoint: str, seconds: float, status: str | None = None) -> None:
+        self.latencies[endpoint].append(seconds)
+        if status is not None:
+            self.errors[endpoint][status] += 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            errors = dict(self.errors.get(endpoint, {}))
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": sum(errors.values()),
+                "error_statuses": errors,
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "mean_ms": round(statistics.fmean(values) * 1000, 2),
+                "p50_ms": _percentile(values, 50),
+                "p95_ms": _percentile(values, 95),
+                "p99_ms": _percentile(values, 99),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "flows": self.flows,
+            "failed_flows": self.failed_flows,
+            "flows_per_second": round(self.flows / elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    # nearest-rank（サンプル数が少なくても実測値のいずれかを返す）
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return round(sorted_values[int(rank) - 1] * 1000, 2)
+
+
+class Operator:
+    """One virtual operator running the business flow against ``client``."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, options: argparse.Namespace):
+        self.client = client
+        self.recorder = recorder
+        self.options = options
+
+    async def call(self, endpoint: str, method: str, url: str, **kwargs: Any) -> Any:
+        """Send one request; ``endpoint`` is the route template used as the report key."""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.record(endpoint, time.perf_counter() - started, type(exc).__name__)
+            raise FlowError(f"{endpoint}: {exc!r}") from exc
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            self.recorder.record(endpoint, elapsed, str(response.status_code))
+            raise FlowError(f"{endpoint}: {response.status_code} {response.text[:200]}")
+        self.recorder.record(endpoint, elapsed)
+        return response.json()
+
+    async def generate(self, inquiry_id: str) -> dict[str, Any]:
+        payload = {"inquiry_id": inquiry_id}
+        if self.options.generate == "sync":
+            return await self.call(
+                "POST /api/ai/responses", "POST", "/api/ai/responses", json=payload
+            )
+
+        job = await self.call(
+            "POST /api/ai/responses?mode=async",
+            "POST",
+            "/api/ai/responses",
+            params={"mode": "async"},
+            json=payload,
+        )
+        # 投入時の応答には ai_response_id が含まれないため、完了済み（eager）でも 1 回は照会する
+        deadline = time.monotonic() + JOB_TIMEOUT
+        while True:
+            job = await self.call(
+                "GET /api/ai/jobs/{job_id}", "GET", f"/api/ai/jobs/{job['job_id']}"
+            )
+            if job["status"] in ("SUCCESS", "FAILURE"):
+                break
+            if time.monotonic() > deadline:
+                raise FlowError(f"job {job['job_id']} did not finish")
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+        if job["status"] == "FAILURE" or not job.get("ai_response_id"):
+            raise FlowError(f"job {job['job_id']} failed: {job.get('error')}")
+        return await self.call(
+            "GET /api/ai/responses/{ai_response_id}",
+            "GET",
+            f"/api/ai/responses/{job['ai_response_id']}",
+        )
+
+    async def run_flow(self, rng: random.Random, report: dict[str, Any]) -> None:
+        options = self.options
+        (payload,) = synthetic.inquiries(1, rng.randrange(2**31), options.dictionary)
+        inquiry = await self.call("POST /api/inquiries", "POST", "/api/inquiries", json=payload)
+        inquiry_id = inquiry["inquiry_id"]
+        await self.call(
+            "POST /api/documents",
+            "POST",
+            "/api/documents",
+            json={
+                "inquiry_id": inquiry_id,
+                "report_type": "annual_trade_report",
+                "report_file_uri": f"file:///load/{inquiry_id}.pdf",
+                "report_structured_json": report,
+            },
+        )
+
+        draft = await self.generate(inquiry_id)
+        ai_response_id = draft["ai_response_id"]
+        if rng.random() < options.review_ratio:
+            # オペレーターによる一部修正（編集距離はサーバー側で算出される）
+            await self.call(
+                "PATCH /api/ai/responses/{ai_response_id}",
+                "PATCH",
+                f"/api/ai/responses/{ai_response_id}",
+                json={
+                    "ai_answer_draft": draft["ai_answer_draft"] + "\n担当者より補足いたします。",
+                    "operator_edits": {"note": "load test"},
+                },
+            )
+        for _ in range(options.reads):
+            await self.call(
+                "GET /api/inquiries/{inquiry_id}", "GET", f"/api/inquiries/{inquiry_id}"
+            )
+            await self.call(
+                "GET /api/ai/responses",
+                "GET",
+                "/api/ai/responses",
+                params={"inquiry_id": inquiry_id},
+            )
+
+        triage = await self.call(
+            "POST /api/workflows/triage",
+            "POST",
+            "/api/workflows/triage",
+            json={
+                "inquiry_id": inquiry_id,
+                "ai_response_id": ai_response_id,
+                "operator_confidence": round(rng.uniform(0.4, 1.0), 2),
+            },
+        )
+        if triage["should_escalate"]:
+            await self.call(
+                "POST /api/escalations/{inquiry_id}",
+                "POST",
+                f"/api/escalations/{inquiry_id}",
+                json={"inquiry_id": inquiry_id, "escalation_reason": triage["rationale"]},
+            )
+        await self.call(
+            "POST /api/responses/finalize",
+            "POST",
+            "/api/responses/finalize",
+            json={
+                "inquiry_id": inquiry_id,
+                "final_response_text": draft["ai_answer_draft"],
+                "channel": triage["recommended_channel"],
+                "sender_id": payload["created_by"],
+            },
+        )
+
+    async def loop(self, index: int, deadline: float, remaining: list[int]) -> None:
+        rng = random.Random(self.options.seed * 1000 + index)
+        reports = self.options.reports
+        while time.monotonic() < deadline:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+            try:
+                await self.run_flow(rng, rng.choice(reports))
+            except FlowError as exc:
+                self.recorder.failed_flows += 1
+                if self.options.verbose:
+                    print(f"flow failed: {exc}", file=sys.stderr)
+            else:
+                self.recorder.flows += 1
+
+
+async def drive(client: httpx.AsyncClient, options: argparse.Namespace) -> dict[str, Any]:
+    recorder = Recorder()
+    if options.warmup:
+        # 初回のインポート・キャッシュ構築を計測から外す
+        await Operator(client, Recorder(), options).loop(-1, float("inf"), [options.warmup])
+
+    remaining = [options.flows or sys.maxsize]
+    started = time.monotonic()
+    deadline = started + options.duration
+    operators = [Operator(client, recorder, options) for _ in range(options.users)]
+    await asyncio.gather(
+        *(operator.loop(index, deadline, remaining) for index, operator in enumerate(operators))
+    )
+    return recorder.summary(time.monotonic() - started)
+
+
+def _in_process_env(options: argparse.Namespace, workdir: str) -> dict[str, str]:
+    env = {
+        "DATABASE_URL": options.database_url or f"sqlite:///{workdir}/load.db",
+        "VECTOR_STORE_PATH": f"{workdir}/vectorstore",
+        "SECTION_STORE_PATH": f"{workdir}/sections",
+        "BASE_PROMPT_PATH": str(BACKEND_DIR.parent / "prompts" / "base_prompt.md"),
+        "DANGER_WORDS_PATH": str(BACKEND_DIR.parent / "prompts" / "danger_words.txt"),
+    }
+    if options.redis_url:
+        env.update(REDIS_URL=options.redis_url, WORKER__EAGER="false")
+    else:
+        env.update(WORKER__EAGER="true", DRAFT_CACHE__REDIS_ENABLED="false")
+    return env
+
+
+def _start_worker(env: dict[str, str], concurrency: int) -> subprocess.Popen:
+    from app.config import get_settings
+
+    worker = get_settings().worker
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "celery",
+            "-A",
+            "app.workers.celery_app",
+            "worker",
+            "-Q",
+            f"{worker.default_queue},{worker.pdf_queue}",
+            "--pool",
+            "threads",
+            "--concurrency",
+            str(concurrency),
+            "--loglevel",
+            "WARNING",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env, "PYTHONPATH": str(BACKEND_DIR)},
+    )
+
+
+async def run(options: argparse.Namespace) -> dict[str, Any]:
+    options.dictionary = synthetic.danger_words(50)
+    options.reports = [
+        synthetic.report(options.sections, seed=seed) for seed in range(options.report_variants)
+    ]
+    target: dict[str, Any] = {"base_url": options.base_url}
+
+    async with AsyncExitStack() as stack:
+        if options.base_url:
+            client = httpx.AsyncClient(base_url=options.base_url, timeout=JOB_TIMEOUT)
+        else:
+            sync_stack = stack.enter_context(ExitStack())
+            workdir = sync_stack.enter_context(tempfile.TemporaryDirectory())
+            env = _in_process_env(options, workdir)
+            # app.config はインポート時に環境変数を読むため、ここで設定してから読み込む
+            os.environ.update(env)
+            from app.bootstrap import create_schema
+            from app.main import app
+
+            create_schema()
+            if options.redis_url:
+                worker = _start_worker(env, options.worker_concurrency)
+                sync_stack.callback(worker.wait, 30)
+                sync_stack.callback(worker.terminate)
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(
+                transport=transport, base_url="http://load-test", timeout=JOB_TIMEOUT
+            )
+            target.update(
+                database=env["DATABASE_URL"].split("://", 1)[0],
+                worker="redis" if options.redis_url else "eager",
+            )
+        await stack.enter_async_context(client)
+        if options.base_url is None and options.redis_url:
+            await _wait_for_worker(client)
+        result = await drive(client, options)
+
+    return {
+        "benchmark": "load",
+        "meta": {
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "target": target,
+            "users": options.users,
+            "generate": options.generate,
+            "sections": options.sections,
+        },
+        **result,
+    }
+
+
+async def _wait_for_worker(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    from app.workers.celery_app import celery_app
+
+    deadline = time.monotonic() + timeout
+    while not await asyncio.to_thread(celery_app.control.ping, timeout=1.0):
+        if time.monotonic() > deadline:
+            raise RuntimeError("Celery worker did not start")
+    response = await client.get("/ready")
+    response.raise_for_status()
+
+
+def _print_table(result: dict[str, Any]) -> None:
+    print(
+        f"{'endpoint':48s} {'reqs':>7s} {'err':>5s} {'rps':>8s} "
+        f"{'p50':>8s} {'p95':>8s} {'p99':>8s}",
+        file=sys.stderr,
+    )
+    for endpoint, stats in result["endpoints"].items():
+        print(
+            f"{endpoint:48s} {stats['requests']:7d} {stats['errors']:5d} "
+            f"{stats['throughput_rps']:8.1f} {stats['p50_ms']:8.1f} "
+            f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}",
+            file=sys.stderr,
+        )
+    print(
+        f"flows: {result['flows']} ok / {result['failed_flows']} failed, "
+        f"{result['flows_per_second']} flows/s, {result['throughput_rps']} req/s",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run an end-to-end API load test.")
+    parser.add_argument("--base-url", help="target an already running API instead of in-process")
+    parser.add_argument("--database-url", help="in-process: database (default: temporary SQLite)")
+    parser.add_argument(
+        "--redis-url", help="in-process: use Redis and a worker subprocess instead of eager Celery"
+    )
+    parser.add_argument("--worker-concurrency", type=int, default=4)
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual operators")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--flows", type=int, help="stop after this many flows")
+    parser.add_argument("--warmup", type=int, default=3, help="flows run before measuring")
+    parser.add_argument("--generate", choices=("sync", "async"), default="sync")
+    parser.add_argument("--sections", type=int, default=200, help="sections per report")
+    parser.add_argument("--report-variants", type=int, default=4)
+    parser.add_argument("--review-ratio", type=float, default=0.5)
+    parser.add_argument("--reads", type=int, default=1, help="read requests per flow")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--verbose", action="store_true", help="print failed flows")
+    options = parser.parse_args(argv)
+
+    result = asyncio.run(run(options))
+    _print_table(result)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if options.output:
+        Path(options.output).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
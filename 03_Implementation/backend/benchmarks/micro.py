@@ -0,0 +1,254 @@
+"""Micro-benchmarks for the hot paths of the generation / triage pipeline.
+
+合成データ（`benchmarks.synthetic`）を複数の規模で生成し、各関数の 1 呼び出しあたりの時間を
+計測して JSON で出力する。``--compare`` に以前の結果を渡すと、ケースごとの比（新 / 旧）を表示する。
+
+    python -m benchmarks.micro --scale standard --output bench.json
+    python -m benchmarks.micro --compare bench.json --filter rag.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .common import BACKEND_DIR, git_commit
+
+# 計測対象はインポート時に DB へ接続しないが、設定の既定値（PostgreSQL ドライバ）を避ける
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("BASE_PROMPT_PATH", str(BACKEND_DIR.parent / "prompts" / "base_prompt.md"))
+
+import numpy as np  # noqa: E402
+
+from app.models import AiResponse, Inquiry  # noqa: E402
+from app.schemas import AiResponseRead  # noqa: E402
+from app.services.ai_service import _compose_answer, _evidence_refs  # noqa: E402
+from app.utils.danger_words import DangerWordMatcher, detect_danger_words  # noqa: E402
+from app.utils.rag import build_section_index, find_relevant_sections  # noqa: E402
+from app.workflows.triage import evaluate, evaluate_batch  # noqa: E402
+
+from . import synthetic  # noqa: E402
+
+SCALES: dict[str, dict[str, Sequence[int]]] = {
+    "quick": {
+        "sections": (100, 1000),
+        "dictionary": (10, 1000),
+        "text_chars": (200,),
+        "batch": (1000,),
+        "evidence": (3,),
+    },
+    "standard": {
+        "sections": (100, 1000, 10000),
+        "dictionary": (10, 1000, 10000),
+        "text_chars": (200, 5000),
+        "batch": (1000, 100000),
+        "evidence": (3, 20),
+    },
+    "large": {
+        "sections": (1000, 10000, 50000),
+        "dictionary": (1000, 10000, 50000),
+        "text_chars": (200, 5000, 50000),
+        "batch": (100000, 1000000),
+        "evidence": (3, 20, 100),
+    },
+}
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> dict[str, float]:
+    """Time ``fn`` like ``timeit.autorange``; returns per-call seconds."""
+    fn()  # 初回のキャッシュ構築などを計測から外す
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    median = statistics.median(samples)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(samples),
+        "ops_per_s": 1 / median if median else float("inf"),
+    }
+
+
+def _inquiry(question_text: str) -> Inquiry:
+    return Inquiry(
+        inquiry_id=str(uuid.uuid4()),
+        customer_id="C00001",
+        inquiry_category="tax",
+        question_text=question_text,
+        created_by="op01",
+    )
+
+
+def _cases(scale: dict[str, Sequence[int]]) -> Iterator[tuple[str, dict[str, Any], Callable]]:
+    """Yield ``(name, params, fn)``; data is built before the case is yielded."""
+    dictionary = synthetic.danger_words(max(scale["dictionary"]))
+    questions = [item["question_text"] for item in synthetic.inquiries(50, 1, dictionary)]
+
+    for sections in scale["sections"]:
+        report = synthetic.report(sections, seed=sections)
+        index = json.loads(json.dumps(build_section_index(report), ensure_ascii=False))
+        cycle = itertools.cycle(questions)
+        params = {"sections": sections}
+        yield (
+            "rag.find_relevant_sections[indexed]",
+            params,
+            lambda r=report, i=index, c=cycle: find_relevant_sections(next(c), r, i),
+        )
+        if sections <= 1000:
+            # 索引なし（初回）は索引構築が支配的で、大規模では 1 回が数秒かかる
+            yield (
+                "rag.find_relevant_sections[build_index]",
+                params,
+                lambda r=report, c=cycle: find_relevant_sections(next(c), r),
+            )
+
+    for size in scale["dictionary"]:
+        matcher = DangerWordMatcher(dictionary[:size])
+        for chars in scale["text_chars"]:
+            text = synthetic.long_text(chars, seed=chars, dictionary=dictionary[:size])
+            yield (
+                "danger_words.detect",
+                {"dictionary": size, "text_chars": chars},
+                lambda t=text, m=matcher: detect_danger_words(t, m),
+            )
+        yield (
+            "danger_words.compile",
+            {"dictionary": size},
+            lambda words=dictionary[:size]: DangerWordMatcher(words),
+        )
+
+    report = synthetic.report(20, seed=7)
+    for sections in (0, 3, 10):
+        inquiry = _inquiry(questions[0])
+        chosen = report["sections"][:sections]
+        yield (
+            "ai_service._compose_answer",
+            {"sections": sections},
+            lambda q=inquiry, s=chosen: _compose_answer(q, s, ["保証"]),
+        )
+
+    record = AiResponse(confidence_score=0.72)
+    yield "triage.evaluate", {}, lambda: evaluate(record, 0.1, 0.8, 1)
+    rng = np.random.default_rng(0)
+    for size in scale["batch"]:
+        arrays = (
+            rng.random(size),
+            rng.random(size) * 0.4,
+            rng.random(size),
+            rng.integers(0, 3, size).astype(np.float64),
+        )
+        yield "triage.evaluate_batch", {"rows": size}, lambda a=arrays: evaluate_batch(*a)
+
+    for evidence in scale["evidence"]:
+        sections = synthetic.report(evidence, seed=evidence)["sections"]
+        generated = _compose_answer(_inquiry(questions[1]), sections, [])
+        response = AiResponse(
+            ai_response_id=str(uuid.uuid4()),
+            inquiry_id=str(uuid.uuid4()),
+            ai_answer_draft=generated.answer_text,
+            evidence_refs=_evidence_refs(sections),
+            operator_edits={"memo": generated.operator_memo},
+            confidence_score=generated.confidence,
+            version_no=3,
+            edit_distance=0.12,
+            created_at=datetime(2025, 3, 31, 12, 0, 0),
+        )
+        yield (
+            "schemas.AiResponseRead.dump_json",
+            {"evidence": evidence},
+            lambda r=response: AiResponseRead.model_validate(r).model_dump_json(),
+        )
+
+
+def _case_key(result: dict[str, Any]) -> str:
+    params = ",".join(f"{key}={value}" for key, value in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
+
+
+def run(scale_name: str, name_filter: str | None, min_time: float) -> dict[str, Any]:
+    results = []
+    for name, params, fn in _cases(SCALES[scale_name]):
+        if name_filter and name_filter not in name:
+            continue
+        result = {"name": name, "params": params, **measure(fn, min_time)}
+        results.append(result)
+        print(
+            f"{_case_key(result):70s} {result['median_s'] * 1e6:12.2f} us",
+            file=sys.stderr,
+        )
+    return {
+        "benchmark": "micro",
+        "meta": {
+            "commit": git_commit(),
+            "scale": scale_name,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[dict[str, Any]]:
+    before = {_case_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = _case_key(result)
+        if key in before:
+            ratio = result["median_s"] / before[key]["median_s"]
+            rows.append({"case": key, "ratio": round(ratio, 3)})
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run pipeline micro-benchmarks.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="standard")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing sample")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    result = run(args.scale, args.filter, args.min_time)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        result["comparison"] = {
+            "baseline_commit": baseline.get("meta", {}).get("commit"),
+            "cases": compare(result, baseline),
+        }
+        for row in result["comparison"]["cases"]:
+            print(f"{row['case']:70s} x{row['ratio']:.3f}", file=sys.stderr)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
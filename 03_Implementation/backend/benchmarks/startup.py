@@ -0,0 +1,110 @@
+"""Cold-start benchmark for the API process.
+
+新しいプロセスで `app.main` をインポートし、最初の `/ready` 応答が 200 になるまでの時間を計測する
+（スキーマ作成は計測前に `app.bootstrap` で済ませる）。結果は JSON で出力し、
+``--max-seconds`` を超えた場合は終了コード 1 を返すため CI の回帰検知に使える。
+
+    python -m benchmarks.startup --runs 5 --max-seconds 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# 子プロセスで実行する計測本体（インポート完了と最初の /ready 応答までの経過秒を出力する）
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+response = TestClient(app.main.app).get("/ready")
+ready = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - started,
+    "first_ready_seconds": ready - started,
+    "ready_status": response.status_code,
+}))
+"""
+
+
+def _run(code: str, env: dict[str, str]) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def run(runs: int, database_url: str | None) -> dict[str, object]:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+        if database_url is None:
+            # 既定はローカル SQLite + Redis 不使用（外部サービスなしでインポートコストだけを測る）
+            env.update(
+                DATABASE_URL=f"sqlite:///{workdir}/startup.db",
+                WORKER__ENABLED="false",
+                DRAFT_CACHE__REDIS_ENABLED="false",
+            )
+        else:
+            env["DATABASE_URL"] = database_url
+        _run("from app.bootstrap import main; main(['--wait', '10'])", env)
+
+        samples = [json.loads(_run(_PROBE, env)) for _ in range(runs)]
+
+    return {
+        "benchmark": "startup",
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "import_seconds": _summary([sample["import_seconds"] for sample in samples]),
+        "first_ready_seconds": _summary([sample["first_ready_seconds"] for sample in samples]),
+        "ready_statuses": sorted({sample["ready_status"] for sample in samples}),
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure API cold-start time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", help="benchmark against this database instead of SQLite")
+    parser.add_argument(
+        "--max-seconds", type=float, help="fail if median time to ready exceeds this"
+    )
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args.runs, args.database_url)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+    failed = result["ready_statuses"] != [200]
+    if args.max_seconds is not None:
+        failed |= result["first_ready_seconds"]["median"] > args.max_seconds
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Deterministic synthetic data for benchmarks (帳票 JSON・問い合わせ・危険語辞書)。
+
+同じ ``seed`` からは常に同じデータを生成するため、コミット間で結果を比較できる。
+文面は証券会社の年間取引報告書・配当通知・問い合わせを模した日本語。
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+SECTION_KINDS = (
+    "譲渡益",
+    "譲渡損失",
+    "配当金",
+    "分配金",
+    "源泉徴収税額",
+    "特定口座年間取引報告書",
+    "外国税額控除",
+    "損益通算",
+    "繰越控除",
+    "償還金",
+    "NISA口座",
+    "信用取引",
+    "手数料",
+    "利子",
+    "取得価額",
+)
+SECURITIES = (
+    "東証プライム上場株式",
+    "米国株式インデックスファンド",
+    "国内債券ファンド",
+    "先進国株式ETF",
+    "個人向け国債",
+    "J-REIT",
+    "外国債券",
+    "バランス型投資信託",
+    "新興国株式ファンド",
+    "社債",
+)
+ACTIONS = ("計上", "支払", "受領", "控除", "通算", "繰越", "精算", "還付")
+SENTENCES = (
+    "{year}年{month}月{day}日に{security}の{kind}として{amount:,}円を{action}しました。",
+    "{security}の{kind}は前年比{rate}%の{direction}となり、累計{amount:,}円です。",
+    "当該期間の{kind}に係る{tax}は{tax_amount:,}円で、{action}済みです。",
+    "{kind}の明細は{page}ページの表{table}をご確認ください。",
+    "{security}（銘柄コード{code}）の取得価額は{amount:,}円、売却価額は{sale:,}円です。",
+)
+QUESTIONS = (
+    "{kind}の金額が昨年と違うのはなぜですか。",
+    "{security}の{kind}はいつ{action}されますか。",
+    "{year}年分の{kind}について、確定申告は必要でしょうか。",
+    "{kind}と{kind2}の損益通算はできますか。",
+    "報告書の{page}ページにある{kind}の{amount:,}円は何の金額ですか。",
+)
+DANGER_BASE = ("保証", "断定", "確約", "必ずもうかる", "脱税", "内密", "リーク", "社外秘")
+DANGER_PREFIXES = ("絶対", "必ず", "確実に", "元本", "内部", "特別")
+DANGER_SUFFIXES = ("儲かる", "保証", "上がる", "勝てる", "情報", "利回り", "返金", "秘密")
+
+
+def _fill(rng: random.Random, template: str) -> str:
+    kind, kind2 = rng.sample(SECTION_KINDS, 2)
+    return template.format(
+        year=rng.randint(2019, 2025),
+        month=rng.randint(1, 12),
+        day=rng.randint(1, 28),
+        security=rng.choice(SECURITIES),
+        kind=kind,
+        kind2=kind2,
+        action=rng.choice(ACTIONS),
+        amount=rng.randint(1, 50_000) * 100,
+        sale=rng.randint(1, 50_000) * 100,
+        rate=rng.randint(1, 80),
+        direction=rng.choice(("増加", "減少")),
+        tax=rng.choice(("所得税", "住民税", "復興特別所得税")),
+        tax_amount=rng.randint(1, 20_000) * 10,
+        page=rng.randint(1, 40),
+        table=rng.randint(1, 5),
+        code=rng.randint(1300, 9999),
+    )
+
+
+def report(sections: int, seed: int = 0, sentences: tuple[int, int] = (2, 6)) -> dict[str, Any]:
+    """Return a ``report_structured_json`` with ``sections`` sections (約 1 割は表付き)。"""
+    rng = random.Random(seed)
+    items: list[dict[str, Any]] = []
+    for index in range(sections):
+        page = str(index // 4 + 1)
+        kind = rng.choice(SECTION_KINDS)
+        text = "".join(_fill(rng, rng.choice(SENTENCES)) for _ in range(rng.randint(*sentences)))
+        section: dict[str, Any] = {"title": f"{kind} {index + 1}", "page": page, "text": text}
+        if rng.random() < 0.1:
+            section["table"] = [["銘柄", "数量", "金額"]] + [
+                [rng.choice(SECURITIES), str(rng.randint(1, 1000)), str(rng.randint(1, 10**6))]
+                for _ in range(rng.randint(2, 8))
+            ]
+        items.append(section)
+    return {"sections": items, "page_count": sections // 4 + 1}
+
+
+def danger_words(size: int, seed: int = 0) -> list[str]:
+    """Return ``size`` distinct danger words, starting with the shipped dictionary."""
+    rng = random.Random(seed)
+    words = list(DANGER_BASE[:size])
+    seen = set(words)
+    while len(words) < size:
+        word = rng.choice(DANGER_PREFIXES) + rng.choice(DANGER_SUFFIXES)
+        if word in seen:
+            word += str(len(words))
+        seen.add(word)
+        words.append(word)
+    return words
+
+
+def question(
+    rng: random.Random, dictionary: list[str] | None = None, danger_ratio: float = 0.2
+) -> str:
+    text = _fill(rng, rng.choice(QUESTIONS))
+    if dictionary and rng.random() < danger_ratio:
+        text += f"{rng.choice(dictionary)}してもらえますか。"
+    return text
+
+
+def inquiries(
+    count: int, seed: int = 0, dictionary: list[str] | None = None, danger_ratio: float = 0.2
+) -> list[dict[str, str]]:
+    """Return ``InquiryCreate`` payloads; ``danger_ratio`` of them contain a danger word."""
+    rng = random.Random(seed)
+    return [
+        {
+            "customer_id": f"C{rng.randint(1, 99999):05d}",
+            "inquiry_category": rng.choice(("tax", "dividend", "transfer", "nisa")),
+            "question_text": question(rng, dictionary, danger_ratio),
+            "created_by": f"op{rng.randint(1, 20):02d}",
+        }
+        for _ in range(count)
+    ]
+
+
+def long_text(chars: int, seed: int = 0, dictionary: list[str] | None = None) -> str:
+    """Free text of about ``chars`` characters (危険語判定の長文ケース用)。"""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    length = 0
+    while length < chars:
+        part = _fill(rng, rng.choice(SENTENCES))
+        if dictionary and rng.random() < 0.05:
+            part += rng.choice(dictionary)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:chars]
@@ -0,0 +1,95 @@
+"""Test settings: a temporary SQLite database and local stores, no Redis / Celery broker."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
+_workdir = tempfile.mkdtemp(prefix="reporting-qa-tests-")
+
+# app.config はインポート時に環境変数を読むため、app のインポートより前に設定する
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_workdir}/test.db",
+    BASE_PROMPT_PATH=str(PROMPTS_DIR / "base_prompt.md"),
+    DANGER_WORDS_PATH=str(PROMPTS_DIR / "danger_words.txt"),
+    VECTOR_STORE_PATH=f"{_workdir}/vectorstore",
+    SECTION_STORE_PATH=f"{_workdir}/sections",
+    DRAFT_CACHE__REDIS_ENABLED="false",
+    WORKER__EAGER="true",
+)
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.bootstrap import create_schema  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models import Inquiry  # noqa: E402
+from app.schemas.document import DocumentIngestRequest  # noqa: E402
+from app.services import document_service  # noqa: E402
+
+create_schema(engine)
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def inquiry(db: Session) -> Inquiry:
+    """An inquiry with one ingested report."""
+    record = Inquiry(
+        customer_id="C00001",
+        inquiry_category="tax",
+        question_text="配当金の金額が昨年と違うのはなぜですか。",
+        created_by="op01",
+    )
+    db.add(record)
+    db.commit()
+    document_service.ingest_report(
+        db,
+        DocumentIngestRequest(
+            inquiry_id=record.inquiry_id,
+            report_type="annual_trade_report",
+            report_file_uri=f"file:///reports/{record.inquiry_id}.pdf",
+            report_structured_json={
+                "sections": [
+                    {"title": "配当金", "page": "2", "text": "配当金の年間合計は 12,000 円です。"},
+                    {"title": "譲渡益", "page": "3", "text": "譲渡益は 50,000 円です。"},
+                ]
+            },
+        ),
+    )
+    return record
+
+
+class StatementCounter:
+    """Records statements executed on the engine (before_cursor_execute)。"""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, _conn, _cursor, statement: str, *_args) -> None:
+        self.statements.append(statement.split(None, 1)[0].upper())
+
+    def clear(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def count_statements() -> Iterator[StatementCounter]:
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models import AiResponse, PromptVersion
+from app.schemas.ai import AiResponseCreate
+from app.services import ai_service
+from app.utils.prompting import load_prompt
+
+
+def _generate(inquiry_id: str, attempt: int):
+    # 新しいセッション（API リクエストと同じ条件）。overrides を変えて下書きキャッシュを外す
+    with SessionLocal() as session:
+        return ai_service.enqueue_ai_generation(
+            session, AiResponseCreate(inquiry_id=inquiry_id, prompt_overrides={"n": attempt})
+        )
+
+
+def test_enqueue_ai_generation_round_trips(inquiry, count_statements):
+    _generate(inquiry.inquiry_id, 0)  # プロンプトの初回登録を除く
+
+    # 差分保存・定期キーフレームをまたいでも、問い合わせ + 帳票の 2 回の読み取りと INSERT のみ
+    for attempt in range(1, 12):
+        count_statements.clear()
+        record = _generate(inquiry.inquiry_id, attempt)
+        assert record.version_no == attempt + 1
+        assert count_statements.statements == ["SELECT", "SELECT", "INSERT"]
+
+
+def test_drafts_are_reconstructed(db, inquiry):
+    prompt = load_prompt(get_settings().base_prompt_path)
+    generated = [_generate(inquiry.inquiry_id, attempt) for attempt in range(10)]
+
+    assert any(record.delta_base_id is not None for record in generated)
+    for record in generated:
+        assert record.draft_body is None or not record.draft_body.startswith(prompt)
+        loaded = ai_service.get_ai_response(db, record.ai_response_id)
+        assert loaded.ai_answer_draft == record.ai_answer_draft
+        assert loaded.ai_answer_draft.startswith(prompt)
+
+
+def test_prompt_cache_waits_for_commit(db):
+    rolled_back = ai_service._prompt_version(db, "ロールバックされるプロンプト")
+    db.rollback()
+    # 取り消された INSERT をキャッシュに残さない（次回は DB を確認し直す）
+    assert rolled_back not in ai_service._prompt_texts
+
+    prompt = "コミットされるプロンプト"
+    digest = ai_service._prompt_version(db, prompt)
+    with db.begin_nested():  # SAVEPOINT の解放ではまだ反映しない
+        pass
+    # 同じセッション内の読み出しは未コミットのプロンプトで復元するが、キャッシュには入れない
+    draft = AiResponse(ai_response_id="uncommitted", prompt_digest=digest, draft_body="本文")
+    assert ai_service.load_drafts(db, [draft])[0].ai_answer_draft.startswith(prompt)
+    assert digest not in ai_service._prompt_texts
+    db.commit()
+    assert ai_service._prompt_texts[digest] == prompt
+    with SessionLocal() as other:
+        assert other.get(PromptVersion, digest).prompt_text == prompt
+
+
+def test_unloaded_draft_is_reported(db, inquiry):
+    record_id = _generate(inquiry.inquiry_id, 0).ai_response_id
+    record = db.get(AiResponse, record_id)
+    with pytest.raises(RuntimeError, match="load_drafts"):
+        _ = record.ai_answer_draft
+    assert ai_service.load_drafts(db, [record])[0].ai_answer_draft
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+from app.db.session import SessionLocal
+from app.models import ReportMeta
+from app.schemas.ai import AiResponseCreate
+from app.schemas.document import DocumentIngestRequest, PdfIngestRequest
+from app.services import ai_service, document_service, job_service
+from app.utils import resource_cache, section_store, vector_store
+from app.utils.hashing import json_digest
+
+
+def _remove_stores(content_digest: str) -> None:
+    """Simulate a node whose volume does not have the report's files."""
+    for path in section_store._paths(content_digest):
+        os.remove(path)
+    shutil.rmtree(vector_store._index_dir(content_digest))
+    resource_cache.reload_all()
+
+
+def _stores_exist(content_digest: str) -> bool:
+    return section_store.section_store_exists(content_digest) and vector_store.vector_index_exists(
+        content_digest
+    )
+
+
+def test_ingest_rebuilds_missing_stores(db, inquiry):
+    report = db.query(ReportMeta).filter_by(inquiry_id=inquiry.inquiry_id).one()
+    digest = report.content_digest
+    assert _stores_exist(digest)
+    _remove_stores(digest)
+
+    again = document_service.ingest_report(
+        db,
+        DocumentIngestRequest(
+            inquiry_id=inquiry.inquiry_id,
+            report_type=report.report_type,
+            report_file_uri=report.report_file_uri,
+            report_structured_json=report.report_structured_json,
+        ),
+    )
+    assert again.content_digest == digest
+    assert _stores_exist(digest)
+
+
+def test_generation_queues_store_rebuild(db, inquiry, monkeypatch):
+    digest = db.query(ReportMeta).filter_by(inquiry_id=inquiry.inquiry_id).one().content_digest
+    _remove_stores(digest)
+    queued: list[tuple[list, str]] = []
+    tasks = job_service._tasks()
+    monkeypatch.setattr(job_service, "_store_rebuilds", {})
+
+    def apply_async(args, queue, retry):
+        queued.append((args, queue))
+        return tasks.rebuild_stores_task.AsyncResult("queued")
+
+    monkeypatch.setattr(tasks.rebuild_stores_task, "apply_async", apply_async)
+
+    # リクエスト内では作り直さず JSON 列で検索し、再構築はワーカーへ 1 回だけ投入する
+    for _ in range(2):
+        record = ai_service.enqueue_ai_generation(
+            db, AiResponseCreate(inquiry_id=inquiry.inquiry_id)
+        )
+        assert record.evidence_refs
+    assert not _stores_exist(digest)
+    assert queued == [([digest], job_service.settings.worker.pdf_queue)]
+
+    assert tasks.rebuild_stores_task(digest) is True
+    assert _stores_exist(digest)
+
+
+def test_pdf_sections_are_spooled(db, inquiry, tmp_path, monkeypatch):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4 spool test")
+    batches = [
+        [{"title": f"p.{page}", "page": str(page), "text": f"{page} ページ目の明細"}]
+        for page in range(1, 6)
+    ]
+    progress: list[tuple[dict | None, int]] = []
+
+    def page_batches(_path, _batch_pages, _workers):
+        for pages_done, batch in enumerate(batches, start=1):
+            if pages_done > 1:
+                # 直前のバッチまでの進捗を別セッションから確認する
+                with SessionLocal() as other, open(spool, encoding="utf-8") as handle:
+                    staging = other.get(ReportMeta, report.report_meta_id).staging_json
+                    progress.append((staging, len(handle.readlines())))
+            yield pages_done, batch
+
+    monkeypatch.setattr(document_service, "iter_page_batches", page_batches)
+    report = document_service.register_pdf_report(
+        db,
+        PdfIngestRequest(
+            inquiry_id=inquiry.inquiry_id, report_type="annual", report_file_uri=str(pdf)
+        ),
+    )
+    spool = document_service._spool_path(report.report_meta_id)
+    parsed = document_service.parse_pdf_report(db, report.report_meta_id)
+
+    # DB には進捗のみを保存し、セクションはスプールへ追記する
+    assert progress == [
+        ({"parsed_pages": done, "section_count": done}, done) for done in range(1, 5)
+    ]
+    assert parsed.ingest_status == "ready"
+    assert parsed.staging_json is None
+    structured = {"sections": [section for batch in batches for section in batch], "page_count": 5}
+    assert parsed.report_structured_json == structured
+    # スプールから逐次求めたハッシュ・索引は JSON 全体から求めたものと一致する
+    assert parsed.content_digest == json_digest(structured)
+    assert _stores_exist(parsed.content_digest)
+    assert section_store.load_section_store(parsed.content_digest)[4] == batches[4][0]
+    assert not os.path.exists(spool)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import get_settings
+from app.utils.draft_cache import DraftCache
+
+
+@pytest.fixture
+def cache_settings(monkeypatch):
+    settings = get_settings().draft_cache
+    monkeypatch.setattr(settings, "local_max_entries", 2)
+    return settings
+
+
+def test_evicted_and_expired_keys_leave_the_tag_map(cache_settings, monkeypatch):
+    cache = DraftCache()
+    for index in range(5):
+        cache.set(f"key-{index}", {"n": index}, [f"report-{index % 2}", "shared"])
+    # LRU で追い出されたキーはタグ表からも外れる
+    assert set(cache._local) == {"key-3", "key-4"}
+    assert cache._tags == {
+        "report-0": {"key-4"},
+        "report-1": {"key-3"},
+        "shared": {"key-3", "key-4"},
+    }
+
+    cache.invalidate_tag("report-1")
+    assert set(cache._local) == {"key-4"}
+    assert cache._tags == {"report-0": {"key-4"}, "shared": {"key-4"}}
+
+    monkeypatch.setattr(cache_settings, "ttl_seconds", 0)
+    cache.set("key-5", {"n": 5}, ["report-5"])
+    assert cache.get("key-5") is None  # 期限切れ
+    assert "report-5" not in cache._tags and "key-5" not in cache._key_tags
+
+
+class _RecordingRedis:
+    def __init__(self, names: list[bytes]) -> None:
+        self.names = names
+        self.calls: list[tuple] = []
+
+    def scan_iter(self, match: str, count: int):
+        self.calls.append(("scan_iter", match))
+        yield from self.names
+
+    def delete(self, *names: bytes) -> None:
+        self.calls.append(("delete", len(names)))
+
+
+def test_clear_scans_and_deletes_in_batches(monkeypatch):
+    monkeypatch.setattr(get_settings().draft_cache, "redis_enabled", True)
+    cache = DraftCache()
+    cache._redis = _RecordingRedis([f"draftcache:{index}".encode() for index in range(1200)])
+    cache.clear()
+    assert cache._redis.calls == [
+        ("scan_iter", "draftcache:*"),
+        ("delete", 500),
+        ("delete", 500),
+        ("delete", 200),
+    ]
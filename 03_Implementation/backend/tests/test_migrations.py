@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy.orm import Session
+
+from app.bootstrap import alembic_config
+from app.db.base import Base
+from app.models import AiResponse, Escalation, FinalResponseLog, Inquiry, ReportMeta
+from app.services import ai_service
+from app.utils.hashing import json_digest
+
+REPORT = {"sections": [{"title": "配当金", "page": "2", "text": "配当金は 12,000 円です。"}]}
+OTHER_REPORT = {"sections": [{"title": "譲渡益", "page": "3", "text": "譲渡益は 50,000 円です。"}]}
+PROMPT = "あなたは証券会社のサポート担当です。"
+BODY = "".join(f"{line}. 配当金の年間合計は 12,000 円です。\n" for line in range(20))
+DRAFTS = [
+    f"{PROMPT}\n\n# 顧客向け回答案\n{BODY}",
+    f"{PROMPT}\n\n# 顧客向け回答案\n{BODY}追記です。",
+    "見出しのない手入力の回答です。",
+]
+
+
+def _legacy_metadata() -> sa.MetaData:
+    """Tables as created by app.bootstrap before the Alembic revisions."""
+    metadata = sa.MetaData()
+    # 列が変わっていないテーブルは現行定義から複製し、後から追加したインデックスだけ外す
+    for model in (Inquiry, Escalation, FinalResponseLog):
+        model.__table__.to_metadata(metadata).indexes.clear()
+    sa.Table(
+        "report_meta",
+        metadata,
+        sa.Column("report_meta_id", sa.String(36), primary_key=True),
+        sa.Column(
+            "inquiry_id", sa.ForeignKey("inquiry.inquiry_id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("report_type", sa.String(50), nullable=False),
+        sa.Column("report_file_uri", sa.String(255), nullable=False),
+        sa.Column("report_structured_json", sa.JSON, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    sa.Table(
+        "ai_response",
+        metadata,
+        sa.Column("ai_response_id", sa.String(36), primary_key=True),
+        sa.Column(
+            "inquiry_id", sa.ForeignKey("inquiry.inquiry_id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("ai_answer_draft", sa.Text, nullable=False),
+        sa.Column("evidence_refs", sa.JSON, nullable=False),
+        sa.Column("operator_edits", sa.JSON, nullable=True),
+        sa.Column("confidence_score", sa.Numeric(3, 2), nullable=False),
+        sa.Column("version_no", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    return metadata
+
+
+@pytest.fixture
+def legacy_engine(tmp_path) -> Iterator[sa.Engine]:
+    engine = sa.create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    metadata = _legacy_metadata()
+    metadata.create_all(engine)
+    now = datetime(2025, 3, 31, 12, 0, 0)
+    with engine.begin() as conn:
+        conn.execute(
+            metadata.tables["inquiry"].insert(),
+            [
+                {
+                    "inquiry_id": "inq-1",
+                    "customer_id": "C00001",
+                    "inquiry_category": "tax",
+                    "question_text": "配当金について",
+                    "created_by": "op01",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            ],
+        )
+        conn.execute(
+            metadata.tables["report_meta"].insert(),
+            [
+                {
+                    "report_meta_id": f"rm-{index}",
+                    "inquiry_id": "inq-1",
+                    "report_type": "annual_trade_report",
+                    "report_file_uri": f"file:///reports/{index}.pdf",
+                    "report_structured_json": structured,
+                    "created_at": now,
+                }
+                for index, structured in enumerate((REPORT, REPORT, OTHER_REPORT))
+            ],
+        )
+        conn.execute(
+            metadata.tables["ai_response"].insert(),
+            [
+                {
+                    "ai_response_id": f"ar-{index}",
+                    "inquiry_id": "inq-1",
+                    "ai_answer_draft": draft,
+                    "evidence_refs": [],
+                    "confidence_score": 0.5,
+                    "version_no": index + 1,
+                    "created_at": now,
+                }
+                for index, draft in enumerate(DRAFTS)
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def _migrate(engine: sa.Engine, revision: str, downgrade: bool = False) -> None:
+    with engine.begin() as conn:
+        (command.downgrade if downgrade else command.upgrade)(alembic_config(conn), revision)
+
+
+def test_report_content_migration(legacy_engine):
+    _migrate(legacy_engine, "0001")
+
+    with Session(legacy_engine) as db:
+        assert db.scalar(sa.text("SELECT count(*) FROM report_content")) == 2
+        reports = {report.report_meta_id: report for report in db.query(ReportMeta)}
+        assert reports["rm-0"].content_digest == json_digest(REPORT)
+        assert reports["rm-1"].content_digest == reports["rm-0"].content_digest
+        assert reports["rm-2"].report_structured_json == OTHER_REPORT
+        assert reports["rm-0"].section_index is not None
+        assert reports["rm-0"].ingest_status == "ready"
+
+    _migrate(legacy_engine, "base", downgrade=True)
+    report_meta = _legacy_metadata().tables["report_meta"]
+    with legacy_engine.connect() as conn:
+        restored = conn.execute(
+            sa.select(report_meta.c.report_structured_json).order_by(report_meta.c.report_meta_id)
+        ).scalars()
+        assert list(restored) == [REPORT, REPORT, OTHER_REPORT]
+
+
+def test_draft_storage_migration(legacy_engine):
+    _migrate(legacy_engine, "head")
+
+    with legacy_engine.connect() as conn:
+        context = MigrationContext.configure(conn)
+        assert [
+            diff for diff in compare_metadata(context, Base.metadata) if diff[0] != "remove_table"
+        ] == []
+
+    with Session(legacy_engine) as db:
+        assert db.scalar(sa.text("SELECT count(*) FROM prompt_version")) == 1
+        records = db.query(AiResponse).order_by(AiResponse.version_no).all()
+        assert [record.prompt_digest is not None for record in records] == [True, True, False]
+        assert records[0].draft_body == BODY
+        ai_service.load_drafts(db, records)
+        assert [record.ai_answer_draft for record in records] == DRAFTS
+
+        # 移行後に差分で保存された版も downgrade で全文に戻る
+        latest = AiResponse(
+            ai_response_id="ar-3",
+            inquiry_id="inq-1",
+            prompt_digest=records[0].prompt_digest,
+            evidence_refs=[],
+            version_no=4,
+        )
+        ai_service._store_body(latest, f"{BODY}再追記です。", ("ar-1", f"{BODY}追記です。"))
+        assert latest.draft_delta is not None
+        db.add(latest)
+        db.commit()
+
+    _migrate(legacy_engine, "0001", downgrade=True)
+    ai_response = _legacy_metadata().tables["ai_response"]
+    with legacy_engine.connect() as conn:
+        restored = conn.execute(
+            sa.select(ai_response.c.ai_answer_draft).order_by(ai_response.c.version_no)
+        ).scalars()
+        assert list(restored) == [*DRAFTS, f"{PROMPT}\n\n# 顧客向け回答案\n{BODY}再追記です。"]
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.ai import AiResponseCreate
+from app.services import ai_service
+from app.utils.edit_distance import normalized_edit_distance
+from app.workflows.triage import TriageRuleConfig
+
+client = TestClient(app)
+
+
+def test_rewritten_draft_escalates(db, inquiry):
+    record = ai_service.enqueue_ai_generation(db, AiResponseCreate(inquiry_id=inquiry.inquiry_id))
+    original = record.ai_answer_draft
+    # 全面的な書き直し（距離は判定の上限 max_edit_distance を大きく超える）
+    rewritten = "ご依頼の件につき別途ご連絡差し上げます。" * (len(original) // 20 + 1)
+
+    reviewed = ai_service.apply_operator_review(
+        db, record.ai_response_id, {"ai_answer_draft": rewritten}
+    )
+    exact = normalized_edit_distance(original, rewritten)
+    assert exact > TriageRuleConfig().max_edit_distance
+    assert reviewed.edit_distance == exact
+
+    response = client.post(
+        "/api/workflows/triage",
+        json={
+            "inquiry_id": inquiry.inquiry_id,
+            "ai_response_id": record.ai_response_id,
+            "operator_confidence": 1.0,
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["should_escalate"] is True